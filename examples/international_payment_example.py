@@ -192,7 +192,7 @@ def paypal_example():
         },
         "note_to_payer": "Refund for order"
     }
-    result = client.refund_payment(refund_data)
+    result = client.refund_payment("SALE_ID", refund_data)
     print(f"退款结果: {result}")
 
     print("\nPayPal示例完成!")
@@ -151,21 +151,3 @@ class AlipayAdvancedMixin:
         """
         biz_content = params.to_dict()
         return self._do_request("alipay.data.bill.subscribe.query", biz_content)
-
-
-# 将 Mixin 的方法添加到 AlipayClient 类
-def inject_advanced_methods():
-    """动态注入高级API方法到 AlipayClient"""
-    from gopay.alipay.client import AlipayClient
-
-    # 遍历 Mixin 的所有方法
-    for method_name in dir(AlipayAdvancedMixin):
-        if not method_name.startswith("_"):
-            method = getattr(AlipayAdvancedMixin, method_name)
-            if callable(method):
-                # 动态添加到 AlipayClient
-                setattr(AlipayClient, method_name, method)
-
-
-# 自动注入
-inject_advanced_methods()
@@ -9,6 +9,12 @@ from urllib.parse import urlencode
 
 from gopay.client import PaymentClient
 from gopay.config import AlipayConfig
+from gopay.alipay.advanced_api import AlipayAdvancedMixin
+from gopay.alipay.marketing_api import AlipayMarketingMixin
+from gopay.alipay.user_api import AlipayUserMixin
+from gopay.alipay.member_card_api import AlipayMarketingAndCardMixin
+from gopay.alipay.zhima_api import AlipayZhimaMixin
+from gopay.alipay.merchant_api import AlipayMerchantMixin
 from gopay.http import HttpClient
 from gopay.utils.datastructure import BodyMap, ResponseData
 from gopay.utils.signer import SignerFactory
@@ -18,10 +24,19 @@ from gopay.exceptions import PaymentError, SignError
 logger = logging.getLogger(__name__)
 
 
-class AlipayClient(PaymentClient):
+class AlipayClient(
+    AlipayAdvancedMixin,
+    AlipayMarketingMixin,
+    AlipayUserMixin,
+    AlipayMarketingAndCardMixin,
+    AlipayZhimaMixin,
+    AlipayMerchantMixin,
+    PaymentClient,
+):
     """
     支付宝支付客户端
     支持支付宝网页支付、手机网站支付、APP支付等多种支付方式
+    扩展API(高级支付、营销、用户授权、会员卡、芝麻信用、商户管理)由各Mixin提供
     """
 
     def __init__(self, config: AlipayConfig):
@@ -175,7 +190,7 @@ class AlipayClient(PaymentClient):
             )
 
         except Exception as e:
-            logger.error(f"请求失败: {e}")
+            logger.error("请求失败: %s", e)
             return ResponseData.error_response(
                 error=str(e),
                 raw_response=None,
@@ -353,19 +353,3 @@ class AlipayMarketingMixin:
         """
         biz_content = params.to_dict()
         return self._do_request("alipay.eco.mycar.parking.enterinfo.push", biz_content)
-
-
-# 将 Mixin 的方法添加到 AlipayClient 类
-def inject_marketing_methods():
-    """动态注入营销API方法到 AlipayClient"""
-    from gopay.alipay.client import AlipayClient
-
-    for method_name in dir(AlipayMarketingMixin):
-        if not method_name.startswith("_"):
-            method = getattr(AlipayMarketingMixin, method_name)
-            if callable(method):
-                setattr(AlipayClient, method_name, method)
-
-
-# 自动注入
-inject_marketing_methods()
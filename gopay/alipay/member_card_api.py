@@ -208,15 +208,3 @@ class AlipayMarketingAndCardMixin:
         """
         biz_content = params.to_dict()
         return self._do_request("alipay.hzm.aft.lifecycle.template.add", biz_content)
-
-
-def inject_marketing_card_methods():
-    from gopay.alipay.client import AlipayClient
-    for method_name in dir(AlipayMarketingAndCardMixin):
-        if not method_name.startswith("_"):
-            method = getattr(AlipayMarketingAndCardMixin, method_name)
-            if callable(method):
-                setattr(AlipayClient, method_name, method)
-
-
-inject_marketing_card_methods()
@@ -111,15 +111,3 @@ class AlipayMerchantMixin:
         """代售充值接口"""
         biz_content = params.to_dict()
         return self._do_request("ant.merchant.order.onsell.settle", biz_content)
-
-
-def inject_merchant_methods():
-    from gopay.alipay.client import AlipayClient
-    for method_name in dir(AlipayMerchantMixin):
-        if not method_name.startswith("_"):
-            method = getattr(AlipayMerchantMixin, method_name)
-            if callable(method):
-                setattr(AlipayClient, method_name, method)
-
-
-inject_merchant_methods()
@@ -191,15 +191,3 @@ class AlipayUserMixin:
         """
         biz_content = params.to_dict()
         return self._do_request("alipay.monitor.heartbeat.syn", biz_content)
-
-
-def inject_user_methods():
-    from gopay.alipay.client import AlipayClient
-    for method_name in dir(AlipayUserMixin):
-        if not method_name.startswith("_"):
-            method = getattr(AlipayUserMixin, method_name)
-            if callable(method):
-                setattr(AlipayClient, method_name, method)
-
-
-inject_user_methods()
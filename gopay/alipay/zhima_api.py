@@ -71,15 +71,3 @@ class AlipayZhimaMixin:
         """信用服务快速开通"""
         biz_content = params.to_dict()
         return self._do_request("zhima.credit.credit.facade.brief.create", biz_content)
-
-
-def inject_zhima_methods():
-    from gopay.alipay.client import AlipayClient
-    for method_name in dir(AlipayZhimaMixin):
-        if not method_name.startswith("_"):
-            method = getattr(AlipayZhimaMixin, method_name)
-            if callable(method):
-                setattr(AlipayClient, method_name, method)
-
-
-inject_zhima_methods()
@@ -12,12 +12,15 @@ from gopay.client import PaymentClient
 from gopay.config import PaymentConfig
 from gopay.http import HttpClient
 from gopay.utils.datastructure import BodyMap, XmlMap, ResponseData
-from gopay.utils.signer import SignerFactory
+from gopay.utils.signer import SignerFactory, compare_signature
 from gopay.exceptions import PaymentError, SignError
 
 
 logger = logging.getLogger(__name__)
 
+# 随机字符串字符集
+_NONCE_ALPHABET = string.ascii_letters + string.digits
+
 
 class AllinPayConfig(PaymentConfig):
     """
@@ -74,7 +77,7 @@ class AllinPayClient(PaymentClient):
 
     def _generate_nonce_str(self) -> str:
         """生成随机字符串"""
-        return "".join(random.choice(string.ascii_letters + string.digits) for _ in range(32))
+        return "".join(random.choices(_NONCE_ALPHABET, k=32))
 
     def _sign_params(self, params: Dict[str, Any]) -> str:
         """
@@ -108,6 +111,10 @@ class AllinPayClient(PaymentClient):
             logger.warning("API密钥未配置,跳过验签")
             return True
 
+        # 长度不符的签名无需计算即可判定失败
+        if not self.signer.has_valid_length(sign):
+            return False
+
         # 过滤空值和sign字段
         filtered_params = {k: v for k, v in params.items() if v not in [None, ""] and k != "sign"}
         # 按key排序
@@ -118,7 +125,7 @@ class AllinPayClient(PaymentClient):
         sign_str = f"{param_str}&key={self.config.api_key}"
 
         calculated_sign = self.signer.sign(sign_str, self.config.api_key)
-        return calculated_sign == sign
+        return compare_signature(calculated_sign, sign)
 
     def _build_common_params(self) -> Dict[str, Any]:
         """构建公共参数"""
@@ -180,7 +187,7 @@ class AllinPayClient(PaymentClient):
             )
 
         except Exception as e:
-            logger.error(f"请求失败: {e}")
+            logger.error("请求失败: %s", e)
             return ResponseData.error_response(
                 error=str(e),
                 raw_response=None,
@@ -11,7 +11,8 @@
 """
 
 import logging
-from typing import Dict, Any, Optional, Type
+from types import MappingProxyType
+from typing import Dict, Any, Optional, Tuple, Type
 from enum import Enum
 
 from gopay.api.handlers.base import BaseApiHandler
@@ -43,6 +44,8 @@ class AggregatedPayHandler:
     def __init__(self):
         """初始化聚合支付处理器"""
         self._handlers: Dict[str, BaseApiHandler] = {}
+        self._channels: Optional[Tuple[str, ...]] = None
+        self._frozen = False
 
     def register_handler(
         self,
@@ -55,9 +58,31 @@ class AggregatedPayHandler:
         Args:
             channel: 支付渠道标识
             handler: API处理器实例
+
+        Raises:
+            RuntimeError: 注册表已冻结
         """
+        if self._frozen:
+            raise RuntimeError(f"支付渠道注册表已冻结,无法注册: {channel}")
         self._handlers[channel] = handler
-        logger.info(f"注册支付渠道: {channel}")
+        logger.info("注册支付渠道: %s", channel)
+
+    def freeze(self):
+        """
+        冻结支付渠道注册表
+
+        服务启动后渠道不再变化, 注册表转为只读映射并缓存渠道列表
+        """
+        if self._frozen:
+            return
+        self._handlers = MappingProxyType(dict(self._handlers))  # type: ignore[assignment]
+        self._channels = tuple(self._handlers)
+        self._frozen = True
+
+    @property
+    def frozen(self) -> bool:
+        """注册表是否已冻结"""
+        return self._frozen
 
     def get_handler(self, channel: str) -> Optional[BaseApiHandler]:
         """
@@ -86,8 +111,8 @@ class AggregatedPayHandler:
         Returns:
             ApiResponse: API响应
         """
-        handler = self.get_handler(channel)
-        if not handler:
+        handler = self._handlers.get(channel)
+        if handler is None:
             return ApiResponse.error(f"不支持的支付渠道: {channel}")
 
         return handler.create_order(params)
@@ -107,8 +132,8 @@ class AggregatedPayHandler:
         Returns:
             ApiResponse: API响应
         """
-        handler = self.get_handler(channel)
-        if not handler:
+        handler = self._handlers.get(channel)
+        if handler is None:
             return ApiResponse.error(f"不支持的支付渠道: {channel}")
 
         return handler.query_order(params)
@@ -128,8 +153,8 @@ class AggregatedPayHandler:
         Returns:
             ApiResponse: API响应
         """
-        handler = self.get_handler(channel)
-        if not handler:
+        handler = self._handlers.get(channel)
+        if handler is None:
             return ApiResponse.error(f"不支持的支付渠道: {channel}")
 
         return handler.close_order(params)
@@ -149,8 +174,8 @@ class AggregatedPayHandler:
         Returns:
             ApiResponse: API响应
         """
-        handler = self.get_handler(channel)
-        if not handler:
+        handler = self._handlers.get(channel)
+        if handler is None:
             return ApiResponse.error(f"不支持的支付渠道: {channel}")
 
         return handler.refund(params)
@@ -170,8 +195,8 @@ class AggregatedPayHandler:
         Returns:
             ApiResponse: API响应
         """
-        handler = self.get_handler(channel)
-        if not handler:
+        handler = self._handlers.get(channel)
+        if handler is None:
             return ApiResponse.error(f"不支持的支付渠道: {channel}")
 
         return handler.query_refund(params)
@@ -191,8 +216,8 @@ class AggregatedPayHandler:
         Returns:
             ApiResponse: API响应
         """
-        handler = self.get_handler(channel)
-        if not handler:
+        handler = self._handlers.get(channel)
+        if handler is None:
             return ApiResponse.error(f"不支持的支付渠道: {channel}")
 
         return handler.cancel_order(params)
@@ -204,6 +229,8 @@ class AggregatedPayHandler:
         Returns:
             list: 支付渠道标识列表
         """
+        if self._channels is not None:
+            return list(self._channels)
         return list(self._handlers.keys())
 
     def is_supported(self, channel: str) -> bool:
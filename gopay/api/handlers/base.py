@@ -12,6 +12,7 @@ API处理器基类
 
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional, Callable
+from collections import defaultdict
 import logging
 import uuid
 from datetime import datetime
@@ -38,7 +39,7 @@ class BaseApiHandler(ABC):
             client: 支付客户端实例
         """
         self.client = client
-        self._hooks: Dict[str, list] = {}
+        self._hooks: Dict[str, list] = defaultdict(list)
 
     def _generate_trace_id(self) -> str:
         """
@@ -79,16 +80,20 @@ class BaseApiHandler(ABC):
         """
         trace_id = self._generate_trace_id()
         timestamp = self._get_timestamp()
+        # 未注册任何钩子时跳过钩子分发(常见路径)
+        has_hooks = bool(self._hooks)
 
         # 执行前置钩子
-        self._execute_hooks(f"before_{operation}", trace_id, *args, **kwargs)
+        if has_hooks:
+            self._execute_hooks(f"before_{operation}", trace_id, *args, **kwargs)
 
         try:
             # 执行主操作
             result = func(*args, **kwargs)
 
             # 执行成功钩子
-            self._execute_hooks(f"after_{operation}", trace_id, result, True)
+            if has_hooks:
+                self._execute_hooks(f"after_{operation}", trace_id, result, True)
 
             # 添加追踪信息
             if isinstance(result, ApiResponse):
@@ -98,13 +103,16 @@ class BaseApiHandler(ABC):
             return result
 
         except Exception as e:
-            logger.error(f"操作失败: {operation}, 错误: {str(e)}", exc_info=True)
+            error_msg = str(e)
+            # 延迟格式化: 日志级别被屏蔽时不拼接消息、不格式化堆栈
+            logger.error("操作失败: %s, 错误: %s", operation, error_msg, exc_info=e)
 
             # 执行失败钩子
-            self._execute_hooks(f"after_{operation}", trace_id, str(e), False)
+            if has_hooks:
+                self._execute_hooks(f"after_{operation}", trace_id, error_msg, False)
 
             # 返回错误响应
-            return ApiResponse.server_error(str(e))
+            return ApiResponse.server_error(error_msg)
 
     def _execute_hooks(self, hook_name: str, *args, **kwargs):
         """
@@ -115,12 +123,15 @@ class BaseApiHandler(ABC):
             *args: 位置参数
             **kwargs: 关键字参数
         """
-        if hook_name in self._hooks:
-            for hook in self._hooks[hook_name]:
-                try:
-                    hook(*args, **kwargs)
-                except Exception as e:
-                    logger.error(f"钩子执行失败: {hook_name}, 错误: {str(e)}")
+        # 使用get避免defaultdict为未注册的事件创建空列表
+        hooks = self._hooks.get(hook_name)
+        if not hooks:
+            return
+        for hook in hooks:
+            try:
+                hook(*args, **kwargs)
+            except Exception as e:
+                logger.error("钩子执行失败: %s, 错误: %s", hook_name, e)
 
     def register_hook(self, event: str, hook: Callable):
         """
@@ -130,8 +141,6 @@ class BaseApiHandler(ABC):
             event: 事件名称 (如: before_create_order, after_create_order)
             hook: 钩子函数
         """
-        if event not in self._hooks:
-            self._hooks[event] = []
         self._hooks[event].append(hook)
 
     @abstractmethod
@@ -106,6 +106,7 @@ class PayPalApiHandler(BaseApiHandler):
 
         Args:
             params: 退款参数
+                - sale_id: 交易ID
                 - amount: 金额
                 - currency_code: 货币代码
 
@@ -113,6 +114,10 @@ class PayPalApiHandler(BaseApiHandler):
             ApiResponse: API响应
         """
         def _refund():
+            sale_id = params.get("sale_id")
+            if not sale_id:
+                return ApiResponse.invalid_params("缺少交易ID")
+
             amount = params.get("amount")
             currency_code = params.get("currency_code", "USD")
 
@@ -126,7 +131,7 @@ class PayPalApiHandler(BaseApiHandler):
                 }
             }
 
-            result = self.client.refund_payment(refund_data)
+            result = self.client.refund_payment(sale_id, refund_data)
 
             if result.code == "0" or result.code == "201":
                 return ApiResponse.success(result.data, "退款申请成功")
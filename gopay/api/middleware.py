@@ -43,7 +43,7 @@ class ErrorHandler:
             try:
                 return func(*args, **kwargs)
             except Exception as e:
-                logger.error(f"错误: {str(e)}", exc_info=True)
+                logger.error("错误: %s", e, exc_info=e)
                 from gopay.api.response import ApiResponse
                 return ApiResponse.server_error(str(e))
 
@@ -125,6 +125,26 @@ class AuthMiddleware:
 
         return wrapper
 
+    def before_request(self, api_key: Optional[str]):
+        """
+        请求前认证检查(ASGI中间件调用)
+
+        Args:
+            api_key: 请求头中的API密钥
+
+        Returns:
+            Optional[ApiResponse]: 认证失败时返回错误响应, 通过返回None
+        """
+        from gopay.api.response import ApiResponse
+
+        if not api_key:
+            return ApiResponse.unauthorized("缺少API密钥")
+
+        if not self.verify(api_key):
+            return ApiResponse.unauthorized("无效的API密钥")
+
+        return None
+
 
 class LoggingMiddleware:
     """
@@ -150,7 +170,7 @@ class LoggingMiddleware:
             operation: 操作名称
             params: 请求参数
         """
-        logger.log(self.log_level, f"请求: {operation}, 参数: {params}")
+        logger.log(self.log_level, "请求: %s, 参数: %s", operation, params)
 
     def log_response(self, operation: str, response, duration: float):
         """
@@ -166,9 +186,20 @@ class LoggingMiddleware:
         if isinstance(response, ApiResponse):
             logger.log(
                 self.log_level,
-                f"响应: {operation}, 状态码: {response.code}, 耗时: {duration:.3f}s"
+                "响应: %s, 状态码: %s, 耗时: %.3fs", operation, response.code, duration
             )
 
+    def after_request(self, operation: str, status_code: int, duration: float):
+        """
+        请求完成后记录日志(ASGI中间件调用)
+
+        Args:
+            operation: 请求路径
+            status_code: HTTP状态码
+            duration: 耗时(秒)
+        """
+        logger.log(self.log_level, "响应: %s, HTTP状态码: %s, 耗时: %.3fs", operation, status_code, duration)
+
     def log(self, func: Callable) -> Callable:
         """
         日志装饰器
@@ -180,9 +211,12 @@ class LoggingMiddleware:
             Callable: 装饰后的函数
         """
 
+        # 操作名在装饰时确定,避免每次请求重复读取属性
+        operation = func.__name__
+
+        # 保留wraps: Flask依赖__name__注册endpoint, FastAPI依赖__wrapped__解析参数签名
         @wraps(func)
         def wrapper(*args, **kwargs):
-            operation = func.__name__
             params = kwargs
 
             self.log_request(operation, params)
@@ -253,6 +287,21 @@ class RateLimiter:
         self._requests[key].append(time.time())
         return True
 
+    def before_request(self, api_key: Optional[str]):
+        """
+        请求前限流检查(ASGI中间件调用)
+
+        Args:
+            api_key: 请求头中的API密钥, 作为限流标识
+
+        Returns:
+            Optional[ApiResponse]: 超出限制时返回错误响应, 否则返回None
+        """
+        if not self.is_allowed(api_key or "default"):
+            from gopay.api.response import ApiResponse
+            return ApiResponse.error("请求过于频繁,请稍后再试", "429")
+        return None
+
     def check_rate_limit(self, func: Callable) -> Callable:
         """
         限流装饰器
@@ -324,3 +373,111 @@ class MiddlewareChain:
                 func = middleware.check_rate_limit(func)
 
         return func
+
+    def __iter__(self):
+        return iter(self._middlewares)
+
+    def __len__(self) -> int:
+        return len(self._middlewares)
+
+
+class ASGIMiddleware:
+    """
+    ASGI中间件
+
+    在ASGI层执行MiddlewareChain, 替代逐路由的装饰器:
+    - AuthMiddleware/RateLimiter: 请求前检查, API密钥从请求头读取
+    - LoggingMiddleware: 请求完成后记录路径、状态码和耗时, 含请求前被拒绝的请求
+    - ErrorHandler: 捕获下游异常并返回统一错误响应
+
+    中间件链在每次请求时读取, 启动后通过add_middleware添加的中间件同样生效
+    """
+
+    def __init__(
+        self,
+        app,
+        chain: MiddlewareChain,
+        path_prefix: str = "/api/v1/pay/",
+        api_key_header: str = "x-api-key",
+    ):
+        """
+        初始化ASGI中间件
+
+        Args:
+            app: 下游ASGI应用
+            chain: 中间件链
+            path_prefix: 需要执行中间件的路径前缀(健康检查等接口不受影响)
+            api_key_header: 携带API密钥的请求头名称
+        """
+        self.app = app
+        self.chain = chain
+        self.path_prefix = path_prefix
+        self.api_key_header = api_key_header.lower().encode("latin-1")
+
+    def _get_api_key(self, scope) -> Optional[str]:
+        """从请求头读取API密钥"""
+        for name, value in scope.get("headers", ()):
+            if name == self.api_key_header:
+                return value.decode("latin-1")
+        return None
+
+    @staticmethod
+    async def _send_api_response(send, response) -> None:
+        """发送ApiResponse"""
+        body = response.to_json_bytes()
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or not len(self.chain)
+            or not scope.get("path", "").startswith(self.path_prefix)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        middlewares = list(self.chain)
+        status = {"code": 500, "started": False}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                status["started"] = True
+            await send(message)
+
+        start_time = time.perf_counter()
+        try:
+            # 请求前检查被拒绝的请求同样经过finally记录日志和耗时
+            rejection = None
+            api_key = self._get_api_key(scope)
+            for middleware in middlewares:
+                before_request = getattr(middleware, "before_request", None)
+                if before_request is not None:
+                    rejection = before_request(api_key)
+                    if rejection is not None:
+                        break
+            if rejection is not None:
+                await self._send_api_response(send_wrapper, rejection)
+            else:
+                await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            if status["started"] or not any(isinstance(m, ErrorHandler) for m in middlewares):
+                raise
+            logger.error("错误: %s", e, exc_info=e)
+            from gopay.api.response import ApiResponse
+            await self._send_api_response(send, ApiResponse.server_error(str(e)))
+            status["code"] = 200
+        finally:
+            duration = time.perf_counter() - start_time
+            for middleware in middlewares:
+                after_request = getattr(middleware, "after_request", None)
+                if after_request is not None:
+                    after_request(scope.get("path", ""), status["code"], duration)
@@ -3,22 +3,38 @@ API响应模块
 定义统一的API响应格式
 """
 
-from typing import Any, Optional, Dict
+from typing import Any, Optional, Dict, Final
 from dataclasses import dataclass
 from enum import Enum
+import sys
+
+from gopay.utils import json_codec
+
+
+# Python 3.10+ 支持slots数据类,属性访问走槽位且实例不再携带__dict__
+_DATACLASS_OPTIONS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+# 响应状态码常量, 热路径直接使用字符串常量, 避免枚举属性查找
+CODE_SUCCESS: Final[str] = "0"
+CODE_ERROR: Final[str] = "-1"
+CODE_INVALID_PARAMS: Final[str] = "400"
+CODE_UNAUTHORIZED: Final[str] = "401"
+CODE_NOT_FOUND: Final[str] = "404"
+CODE_SERVER_ERROR: Final[str] = "500"
 
 
 class ResponseCode(str, Enum):
     """响应状态码"""
-    SUCCESS = "0"
-    ERROR = "-1"
-    INVALID_PARAMS = "400"
-    UNAUTHORIZED = "401"
-    NOT_FOUND = "404"
-    SERVER_ERROR = "500"
+    SUCCESS = CODE_SUCCESS
+    ERROR = CODE_ERROR
+    INVALID_PARAMS = CODE_INVALID_PARAMS
+    UNAUTHORIZED = CODE_UNAUTHORIZED
+    NOT_FOUND = CODE_NOT_FOUND
+    SERVER_ERROR = CODE_SERVER_ERROR
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class ApiResponse:
     """
     统一API响应格式
@@ -55,6 +71,15 @@ class ApiResponse:
 
         return result
 
+    def to_json_bytes(self) -> bytes:
+        """
+        转换为JSON字节串
+
+        Returns:
+            bytes: UTF-8编码的JSON响应体
+        """
+        return json_codec.dumps(self.to_dict())
+
     @classmethod
     def success(cls, data: Any = None, msg: str = "Success") -> "ApiResponse":
         """
@@ -68,13 +93,13 @@ class ApiResponse:
             ApiResponse: 成功响应对象
         """
         return cls(
-            code=ResponseCode.SUCCESS.value,
+            code=CODE_SUCCESS,
             msg=msg,
             data=data
         )
 
     @classmethod
-    def error(cls, msg: str, code: str = ResponseCode.ERROR.value) -> "ApiResponse":
+    def error(cls, msg: str, code: str = CODE_ERROR) -> "ApiResponse":
         """
         创建错误响应
 
@@ -93,22 +118,26 @@ class ApiResponse:
     @classmethod
     def invalid_params(cls, msg: str = "Invalid parameters") -> "ApiResponse":
         """创建参数错误响应"""
-        return cls.error(msg, ResponseCode.INVALID_PARAMS.value)
+        return cls.error(msg, CODE_INVALID_PARAMS)
 
     @classmethod
     def unauthorized(cls, msg: str = "Unauthorized") -> "ApiResponse":
         """创建未授权响应"""
-        return cls.error(msg, ResponseCode.UNAUTHORIZED.value)
+        return cls.error(msg, CODE_UNAUTHORIZED)
 
     @classmethod
     def not_found(cls, msg: str = "Resource not found") -> "ApiResponse":
         """创建未找到响应"""
-        return cls.error(msg, ResponseCode.NOT_FOUND.value)
+        return cls.error(msg, CODE_NOT_FOUND)
 
     @classmethod
     def server_error(cls, msg: str = "Internal server error") -> "ApiResponse":
         """创建服务器错误响应"""
-        return cls.error(msg, ResponseCode.SERVER_ERROR.value)
+        return cls.error(msg, CODE_SERVER_ERROR)
+
+
+# 健康检查响应体固定不变,导入时预先编码
+HEALTH_OK_BODY: bytes = ApiResponse.success({"status": "ok"}).to_json_bytes()
 
 
 class ApiError(Exception):
@@ -118,7 +147,7 @@ class ApiError(Exception):
     遵循开闭原则(OCP): 可扩展的错误类型
     """
 
-    def __init__(self, msg: str, code: str = ResponseCode.ERROR.value):
+    def __init__(self, msg: str, code: str = CODE_ERROR):
         """
         初始化API错误
 
@@ -144,18 +173,18 @@ class ValidationError(ApiError):
     """参数验证错误"""
 
     def __init__(self, msg: str = "Validation failed"):
-        super().__init__(msg, ResponseCode.INVALID_PARAMS.value)
+        super().__init__(msg, CODE_INVALID_PARAMS)
 
 
 class AuthenticationError(ApiError):
     """认证错误"""
 
     def __init__(self, msg: str = "Authentication failed"):
-        super().__init__(msg, ResponseCode.UNAUTHORIZED.value)
+        super().__init__(msg, CODE_UNAUTHORIZED)
 
 
 class NotFoundError(ApiError):
     """资源未找到错误"""
 
     def __init__(self, msg: str = "Resource not found"):
-        super().__init__(msg, ResponseCode.NOT_FOUND.value)
+        super().__init__(msg, CODE_NOT_FOUND)
@@ -10,19 +10,159 @@
 - 依赖倒置(DIP): 依赖抽象的处理器
 """
 
+import asyncio
+import atexit
+import importlib.util
 import logging
-from typing import Dict, Any, Optional, List
+import logging.handlers
+import queue
+from typing import Dict, Any, Optional, List, Callable, Tuple
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - 可选依赖
+    msgpack = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - 可选依赖
+    msgspec = None
 
 from gopay.api.handlers.aggregated import AggregatedPayHandler
 from gopay.api.handlers.base import BaseApiHandler
-from gopay.api.middleware import MiddlewareChain
-from gopay.api.response import ApiResponse
+from gopay.api.middleware import MiddlewareChain, ASGIMiddleware
+from gopay.api.response import ApiResponse, HEALTH_OK_BODY
+from gopay.utils import json_codec
 
 
 logger = logging.getLogger(__name__)
 
 
+# 对外开放的支付操作, 对应路由 /api/v1/pay/<operation>
+PAY_OPERATIONS = (
+    "create_order",
+    "query_order",
+    "close_order",
+    "refund",
+    "query_refund",
+    "cancel_order",
+)
+
+
+JSON_MIMETYPE = "application/json"
+# 响应体小于该字节数时不压缩
+COMPRESS_MIN_SIZE = 1024
+MSGPACK_MIMETYPE = "application/msgpack"
+# 按Accept协商编码的响应需声明Vary, 避免共享缓存/代理把MessagePack响应返回给JSON客户端
+VARY_ACCEPT_HEADERS = {"Vary": "Accept"}
+
+
+def install_queue_logging(target: Optional[logging.Logger] = None) -> Optional[logging.handlers.QueueListener]:
+    """
+    将日志输出切换为队列模式
+
+    把目标logger上已有的处理器移到后台QueueListener线程执行,
+    请求路径中的日志调用只需入队, 不再阻塞在磁盘/网络写入上
+
+    Args:
+        target: 目标logger, 默认为root logger
+
+    Returns:
+        Optional[QueueListener]: 后台监听器, 没有可迁移的处理器时返回None
+    """
+    target = target or logging.getLogger()
+
+    # 已安装时直接返回, 避免重复包装
+    for handler in target.handlers:
+        if isinstance(handler, logging.handlers.QueueHandler):
+            return getattr(handler, "listener", None)
+
+    handlers = list(target.handlers)
+    if not handlers:
+        return None
+
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    queue_handler.listener = listener
+
+    for handler in handlers:
+        target.removeHandler(handler)
+    target.addHandler(queue_handler)
+
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+
+def _encode_result(result: ApiResponse, accept: Optional[str] = None) -> Tuple[bytes, str]:
+    """
+    按Accept头编码响应
+
+    客户端声明接受application/msgpack且已安装msgpack时返回MessagePack,
+    否则返回JSON
+
+    Args:
+        result: API响应
+        accept: 请求的Accept头
+
+    Returns:
+        Tuple[bytes, str]: (响应体, 媒体类型)
+    """
+    if msgpack is not None and accept and MSGPACK_MIMETYPE in accept:
+        return msgpack.packb(result.to_dict(), use_bin_type=True), MSGPACK_MIMETYPE
+    return result.to_json_bytes(), JSON_MIMETYPE
+
+
+if msgspec is not None:
+    class PaymentRequest(msgspec.Struct):
+        """支付请求体, 由msgspec在解析JSON的同时完成校验"""
+
+        channel: Optional[str] = None
+        params: dict = {}
+
+    _payment_request_decoder = msgspec.json.Decoder(PaymentRequest)
+else:
+    PaymentRequest = None
+    _payment_request_decoder = None
+
+
+def _parse_pay_request(body: bytes) -> Optional[Dict[str, Any]]:
+    """
+    解析支付请求体
+
+    已安装msgspec时一次完成解析与校验, 否则回退到json_codec
+
+    Args:
+        body: 原始请求体
+
+    Returns:
+        Optional[Dict]: 请求数据, 请求体不是JSON对象或字段类型不符时返回None
+    """
+    if not body:
+        return {}
+    if _payment_request_decoder is not None:
+        try:
+            req = _payment_request_decoder.decode(body)
+        except msgspec.DecodeError:
+            return None
+        return {"channel": req.channel, "params": req.params}
+    try:
+        data = json_codec.loads(body)
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    # 与PaymentRequest的校验一致: channel为字符串或null, params为对象(缺省时为空对象)
+    channel = data.get("channel")
+    params = data.get("params", {})
+    if (channel is not None and not isinstance(channel, str)) or not isinstance(params, dict):
+        return None
+    return {"channel": channel, "params": params}
+
+
 class ApiServerBase(ABC):
     """
     API服务器基类
@@ -68,19 +208,31 @@ class PayApiServer(ApiServerBase):
     支付API服务器
 
     提供HTTP REST API接口,支持多种Web框架
+
+    默认使用FastAPI(ASGI,配合uvicorn+uvloop+httptools运行);
+    Flask(WSGI)作为兼容模式保留
     """
 
-    def __init__(self, framework: str = "flask"):
+    def __init__(self, framework: str = "fastapi", max_workers: int = 64):
         """
         初始化支付API服务器
 
         Args:
-            framework: Web框架类型 (flask, fastapi等)
+            framework: Web框架类型 (fastapi, flask), flask为兼容模式
+            max_workers: FastAPI模式下执行同步处理器的线程池大小
         """
         super().__init__()
         self.framework = framework.lower()
         self.app = None
         self._server = None
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        # 操作名 -> 聚合处理器方法, 所有支付路由共用一个分发函数
+        self._pay_operations: Dict[str, Callable[[str, Dict[str, Any]], ApiResponse]] = {
+            operation: getattr(self.aggregated_handler, operation)
+            for operation in PAY_OPERATIONS
+        }
 
         if self.framework == "flask":
             self._init_flask()
@@ -90,74 +242,56 @@ class PayApiServer(ApiServerBase):
             raise ValueError(f"不支持的Web框架: {framework}")
 
     def _init_flask(self):
-        """初始化Flask应用"""
+        """初始化Flask应用(兼容模式)"""
         try:
-            from flask import Flask, request, jsonify
+            from flask import Flask, Response, request
 
             self.app = Flask(__name__)
-
-            @self.app.route("/api/v1/pay/create_order", methods=["POST"])
+            try:
+                from flask_compress import Compress
+
+                self.app.config.setdefault("COMPRESS_MIN_SIZE", COMPRESS_MIN_SIZE)
+                Compress(self.app)
+            except ImportError:
+                logger.debug("flask-compress未安装,Flask响应不压缩")
+
+            def _make_response(
+                result: ApiResponse, accept: Optional[str] = None, negotiate: bool = False
+            ) -> Response:
+                # 使用json_codec(orjson优先)代替jsonify的纯Python编码
+                body, mimetype = _encode_result(result, accept)
+                return Response(
+                    body,
+                    mimetype=mimetype,
+                    headers=VARY_ACCEPT_HEADERS if negotiate else None,
+                )
+
+            @self.app.route("/api/v1/pay/<operation>", methods=["POST"])
             @self.middleware_chain.apply
-            def create_order():
-                data = request.get_json()
+            def pay_operation(operation: str):
+                accept = request.headers.get("Accept")
+                handler_method = self._pay_operations.get(operation)
+                if handler_method is None:
+                    return _make_response(
+                        ApiResponse.not_found(f"不支持的操作: {operation}"), accept, negotiate=True
+                    )
+                data = _parse_pay_request(request.get_data(cache=False))
+                if data is None:
+                    return _make_response(
+                        ApiResponse.invalid_params("请求体不是有效的JSON对象"), accept, negotiate=True
+                    )
                 channel = data.get("channel")
                 params = data.get("params", {})
-                result = self.aggregated_handler.create_order(channel, params)
-                return jsonify(result.to_dict())
-
-            @self.app.route("/api/v1/pay/query_order", methods=["POST"])
-            @self.middleware_chain.apply
-            def query_order():
-                data = request.get_json()
-                channel = data.get("channel")
-                params = data.get("params", {})
-                result = self.aggregated_handler.query_order(channel, params)
-                return jsonify(result.to_dict())
-
-            @self.app.route("/api/v1/pay/close_order", methods=["POST"])
-            @self.middleware_chain.apply
-            def close_order():
-                data = request.get_json()
-                channel = data.get("channel")
-                params = data.get("params", {})
-                result = self.aggregated_handler.close_order(channel, params)
-                return jsonify(result.to_dict())
-
-            @self.app.route("/api/v1/pay/refund", methods=["POST"])
-            @self.middleware_chain.apply
-            def refund():
-                data = request.get_json()
-                channel = data.get("channel")
-                params = data.get("params", {})
-                result = self.aggregated_handler.refund(channel, params)
-                return jsonify(result.to_dict())
-
-            @self.app.route("/api/v1/pay/query_refund", methods=["POST"])
-            @self.middleware_chain.apply
-            def query_refund():
-                data = request.get_json()
-                channel = data.get("channel")
-                params = data.get("params", {})
-                result = self.aggregated_handler.query_refund(channel, params)
-                return jsonify(result.to_dict())
-
-            @self.app.route("/api/v1/pay/cancel_order", methods=["POST"])
-            @self.middleware_chain.apply
-            def cancel_order():
-                data = request.get_json()
-                channel = data.get("channel")
-                params = data.get("params", {})
-                result = self.aggregated_handler.cancel_order(channel, params)
-                return jsonify(result.to_dict())
+                return _make_response(handler_method(channel, params), accept, negotiate=True)
 
             @self.app.route("/api/v1/health", methods=["GET"])
             def health():
-                return jsonify(ApiResponse.success({"status": "ok"}).to_dict())
+                return Response(HEALTH_OK_BODY, mimetype=JSON_MIMETYPE)
 
             @self.app.route("/api/v1/channels", methods=["GET"])
             def channels():
                 channels = self.aggregated_handler.supported_channels()
-                return jsonify(ApiResponse.success(channels).to_dict())
+                return _make_response(ApiResponse.success(channels))
 
             logger.info("Flask应用初始化成功")
 
@@ -167,62 +301,72 @@ class PayApiServer(ApiServerBase):
     def _init_fastapi(self):
         """初始化FastAPI应用"""
         try:
-            from fastapi import FastAPI
-            from fastapi.responses import JSONResponse
-            from pydantic import BaseModel
-
-            self.app = FastAPI(title="GoPay Payment API", version="1.0.0")
-
-            class PaymentRequest(BaseModel):
-                channel: str
-                params: Dict[str, Any]
-
-            @self.app.post("/api/v1/pay/create_order")
-            @self.middleware_chain.apply
-            async def create_order(request: PaymentRequest):
-                result = self.aggregated_handler.create_order(request.channel, request.params)
-                return JSONResponse(content=result.to_dict())
-
-            @self.app.post("/api/v1/pay/query_order")
-            @self.middleware_chain.apply
-            async def query_order(request: PaymentRequest):
-                result = self.aggregated_handler.query_order(request.channel, request.params)
-                return JSONResponse(content=result.to_dict())
-
-            @self.app.post("/api/v1/pay/close_order")
-            @self.middleware_chain.apply
-            async def close_order(request: PaymentRequest):
-                result = self.aggregated_handler.close_order(request.channel, request.params)
-                return JSONResponse(content=result.to_dict())
-
-            @self.app.post("/api/v1/pay/refund")
-            @self.middleware_chain.apply
-            async def refund(request: PaymentRequest):
-                result = self.aggregated_handler.refund(request.channel, request.params)
-                return JSONResponse(content=result.to_dict())
-
-            @self.app.post("/api/v1/pay/query_refund")
-            @self.middleware_chain.apply
-            async def query_refund(request: PaymentRequest):
-                result = self.aggregated_handler.query_refund(request.channel, request.params)
-                return JSONResponse(content=result.to_dict())
-
-            @self.app.post("/api/v1/pay/cancel_order")
-            @self.middleware_chain.apply
-            async def cancel_order(request: PaymentRequest):
-                result = self.aggregated_handler.cancel_order(request.channel, request.params)
-                return JSONResponse(content=result.to_dict())
+            from fastapi import FastAPI, Request
+            from fastapi.middleware.gzip import GZipMiddleware
+            from fastapi.responses import Response, JSONResponse as _BaseJSONResponse
+
+            class JSONResponse(_BaseJSONResponse):
+                """使用json_codec(orjson优先)编码的JSON响应"""
+
+                def render(self, content: Any) -> bytes:
+                    return json_codec.dumps(content)
+
+            self.app = FastAPI(
+                title="GoPay Payment API",
+                version="1.0.0",
+                default_response_class=JSONResponse,
+            )
+            # 中间件链在ASGI层执行, 不再逐路由包装
+            self.app.add_middleware(ASGIMiddleware, chain=self.middleware_chain)
+            # 渠道列表、历史记录等大响应启用gzip
+            self.app.add_middleware(GZipMiddleware, minimum_size=COMPRESS_MIN_SIZE)
+
+            # 支付处理器内部是同步HTTP调用, 放到线程池执行以免阻塞事件循环
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="gopay-api",
+            )
+
+            def _make_response(
+                result: ApiResponse, accept: Optional[str] = None, negotiate: bool = False
+            ) -> Response:
+                # 直接输出已编码的字节串,避免再经过一次render
+                body, media_type = _encode_result(result, accept)
+                return Response(
+                    content=body,
+                    media_type=media_type,
+                    headers=VARY_ACCEPT_HEADERS if negotiate else None,
+                )
+
+            # params是任意结构的字典, 直接解析请求体, 不经过Pydantic模型逐层校验
+            @self.app.post("/api/v1/pay/{operation}")
+            async def pay_operation(operation: str, request: Request):
+                accept = request.headers.get("accept")
+                handler_method = self._pay_operations.get(operation)
+                if handler_method is None:
+                    return _make_response(
+                        ApiResponse.not_found(f"不支持的操作: {operation}"), accept, negotiate=True
+                    )
+                data = _parse_pay_request(await request.body())
+                if data is None:
+                    return _make_response(
+                        ApiResponse.invalid_params("请求体不是有效的JSON对象"), accept, negotiate=True
+                    )
+                channel = data.get("channel")
+                params = data.get("params", {})
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(self._executor, handler_method, channel, params)
+                return _make_response(result, accept, negotiate=True)
 
             @self.app.get("/api/v1/health")
             async def health():
-                result = ApiResponse.success({"status": "ok"})
-                return JSONResponse(content=result.to_dict())
+                return Response(content=HEALTH_OK_BODY, media_type=JSON_MIMETYPE)
 
             @self.app.get("/api/v1/channels")
             async def channels():
                 channels = self.aggregated_handler.supported_channels()
                 result = ApiResponse.success(channels)
-                return JSONResponse(content=result.to_dict())
+                return _make_response(result)
 
             logger.info("FastAPI应用初始化成功")
 
@@ -238,7 +382,7 @@ class PayApiServer(ApiServerBase):
             handler: API处理器实例
         """
         self.aggregated_handler.register_handler(channel, handler)
-        logger.info(f"注册支付渠道: {channel}")
+        logger.info("注册支付渠道: %s", channel)
 
     def add_middleware(self, middleware) -> "PayApiServer":
         """
@@ -261,7 +405,14 @@ class PayApiServer(ApiServerBase):
             host: 监听地址
             port: 监听端口
             **kwargs: 其他参数
+                - queue_logging: 是否将root logger的处理器切换为队列模式(默认False,
+                  会替换宿主进程的日志处理器, 需显式开启)
         """
+        if kwargs.pop("queue_logging", False):
+            install_queue_logging()
+        # 启动后不再注册渠道, 冻结注册表
+        self.aggregated_handler.freeze()
+
         if self.framework == "flask":
             self._start_flask(host, port, **kwargs)
         elif self.framework == "fastapi":
@@ -275,13 +426,49 @@ class PayApiServer(ApiServerBase):
     def _start_fastapi(self, host: str, port: int, **kwargs):
         """启动FastAPI服务器"""
         import uvicorn
-        uvicorn.run(self.app, host=host, port=port, **kwargs)
+
+        options: Dict[str, Any] = {
+            "limit_concurrency": 1000,
+            "timeout_keep_alive": 30,
+        }
+        options.update(self._fastapi_runtime_options())
+        # 调用方传入的参数优先
+        options.update(kwargs)
+        uvicorn.run(self.app, host=host, port=port, **options)
+
+    @staticmethod
+    def _fastapi_runtime_options() -> Dict[str, str]:
+        """
+        选择uvicorn事件循环和HTTP解析器实现
+
+        已安装uvloop/httptools时使用,否则回退到uvicorn默认实现并给出警告
+
+        Returns:
+            Dict: uvicorn的loop/http参数
+        """
+        options: Dict[str, str] = {}
+        missing = []
+        if importlib.util.find_spec("uvloop") is not None:
+            options["loop"] = "uvloop"
+        else:
+            missing.append("uvloop")
+        if importlib.util.find_spec("httptools") is not None:
+            options["http"] = "httptools"
+        else:
+            missing.append("httptools")
+        if missing:
+            logger.warning("未安装%s,使用uvicorn默认实现,建议运行: pip install %s",
+                           ",".join(missing), " ".join(missing))
+        return options
 
     def stop(self):
         """停止服务器"""
         if self._server:
             self._server.shutdown()
             logger.info("服务器已停止")
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
 
     def get_app(self):
         """
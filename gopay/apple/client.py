@@ -3,18 +3,47 @@ Apple Pay客户端
 支持App Store收据验证和订阅管理
 """
 
+import asyncio
 import logging
 import json
-from typing import Optional, Dict, Any
-from urllib.parse import urljoin
+from typing import Optional, Dict, Any, List, Tuple
+from functools import lru_cache
 
 from gopay.config import PaymentConfig
 from gopay.utils.datastructure import ResponseData
-from gopay.http import HttpClient
+from gopay.http import HttpClient, AsyncHttpClient
 
 
 logger = logging.getLogger(__name__)
 
+# 带路径参数的API端点前缀
+_LOOKUP_PATH = "/inApps/v1/lookup/"
+_SUBSCRIPTIONS_PATH = "/inApps/v1/subscriptions/"
+
+
+@lru_cache(maxsize=8)
+def _get_http_client(gateway_url: str, timeout: int) -> HttpClient:
+    """
+    获取共享的HTTP客户端
+
+    同一网关和超时配置的ApplePayClient复用同一个连接池,
+    避免每次创建客户端都重新建立TCP+TLS连接
+
+    Args:
+        gateway_url: 网关地址
+        timeout: 请求超时时间(秒)
+
+    Returns:
+        HttpClient: HTTP客户端
+    """
+    return HttpClient(
+        timeout=timeout,
+        max_retries=3,
+        retry_interval=1,
+        pool_connections=16,
+        pool_maxsize=64,
+    )
+
 
 class ApplePayConfig(PaymentConfig):
     """Apple Pay配置"""
@@ -64,10 +93,45 @@ class ApplePayClient:
         """
         self.config = config
         self.config.validate()
-        self.http_client = HttpClient(
-            timeout=config.timeout,
-            max_retries=3,
-            retry_interval=1
+        self.http_client = _get_http_client(config.gateway_url, config.timeout)
+        # 端点均为绝对路径, 直接拼接网关地址即可, 无需每次urljoin解析
+        self._base_url = config.gateway_url.rstrip("/")
+        # 异步客户端按需创建(依赖httpx)
+        self._async_http_client: Optional[AsyncHttpClient] = None
+
+    def _get_async_http_client(self) -> AsyncHttpClient:
+        """
+        获取异步HTTP客户端,首次调用时创建
+
+        Returns:
+            AsyncHttpClient: 异步HTTP客户端
+        """
+        if self._async_http_client is None:
+            self._async_http_client = AsyncHttpClient(
+                timeout=self.config.timeout,
+                max_retries=3,
+            )
+        return self._async_http_client
+
+    def _parse_response(self, response) -> ResponseData:
+        """
+        解析Apple响应
+
+        Args:
+            response: HTTP响应对象(requests或httpx)
+
+        Returns:
+            ResponseData: 响应数据
+        """
+        result = response.json()
+        status = str(result.get("status", 0))
+
+        return ResponseData(
+            success=status == "0",
+            data=result,
+            error=result.get("error"),
+            code=status,
+            raw_response=response.text,
         )
 
     def _do_request(
@@ -85,7 +149,7 @@ class ApplePayClient:
         Returns:
             ResponseData: 响应数据
         """
-        url = urljoin(self.config.gateway_url, endpoint)
+        url = self._base_url + endpoint
 
         try:
             response = self.http_client.post(
@@ -94,20 +158,48 @@ class ApplePayClient:
                 headers={"Content-Type": "application/json"}
             )
 
-            return ResponseData(
-                code=str(response.get("status", 0)),
-                msg=response.get("error", "Success"),
-                data=response
-            )
+            return self._parse_response(response)
 
         except Exception as e:
-            logger.error(f"Apple Pay请求失败: {str(e)}")
-            return ResponseData(
-                code="-1",
-                msg=str(e),
-                data={}
+            logger.error("Apple Pay请求失败: %s", e)
+            return ResponseData.error_response(error=str(e), code="-1")
+
+    async def _do_request_async(
+        self,
+        endpoint: str,
+        data: Optional[Dict[str, Any]] = None
+    ) -> ResponseData:
+        """
+        执行异步HTTP请求
+
+        Args:
+            endpoint: API端点
+            data: 请求数据
+
+        Returns:
+            ResponseData: 响应数据
+        """
+        url = self._base_url + endpoint
+
+        try:
+            response = await self._get_async_http_client().post(
+                url=url,
+                json=data or {},
+                headers={"Content-Type": "application/json"}
             )
 
+            return self._parse_response(response)
+
+        except Exception as e:
+            logger.error("Apple Pay请求失败: %s", e)
+            return ResponseData.error_response(error=str(e), code="-1")
+
+    async def aclose(self):
+        """关闭异步HTTP客户端"""
+        if self._async_http_client is not None:
+            await self._async_http_client.close()
+            self._async_http_client = None
+
     def look_up_order_id(self, order_id: str) -> ResponseData:
         """
         查询订单信息
@@ -118,8 +210,7 @@ class ApplePayClient:
         Returns:
             ResponseData: 订单信息
         """
-        endpoint = f"/inApps/v1/lookup/{order_id}"
-        return self._do_request(endpoint)
+        return self._do_request(_LOOKUP_PATH + order_id)
 
     def get_all_subscription_statuses(
         self,
@@ -136,7 +227,7 @@ class ApplePayClient:
         Returns:
             ResponseData: 订阅状态列表
         """
-        endpoint = f"/inApps/v1/subscriptions/{order_id}"
+        endpoint = _SUBSCRIPTIONS_PATH + order_id
         params = {}
         if status:
             params["status"] = status
@@ -216,8 +307,26 @@ class ApplePayClient:
         Returns:
             ResponseData: 验证结果
         """
-        endpoint = "/verifyReceipt"
+        request_data = self._build_receipt_request(receipt_data, password, exclude_old_transactions)
+        return self._do_request("/verifyReceipt", request_data)
 
+    def _build_receipt_request(
+        self,
+        receipt_data: str,
+        password: Optional[str],
+        exclude_old_transactions: bool
+    ) -> Dict[str, Any]:
+        """
+        构建收据验证请求数据
+
+        Args:
+            receipt_data: 收据数据(Base64编码)
+            password: App共享密钥
+            exclude_old_transactions: 是否排除旧交易
+
+        Returns:
+            Dict: 请求数据
+        """
         receipt_password = password or self.config.app_shared_secret
 
         request_data = {
@@ -228,7 +337,7 @@ class ApplePayClient:
         if receipt_password:
             request_data["password"] = receipt_password
 
-        return self._do_request(endpoint, request_data)
+        return request_data
 
     def decode_signed_payload(self, signed_payload: str) -> ResponseData:
         """
@@ -332,5 +441,74 @@ class ApplePayClient:
         Returns:
             ResponseData: 订阅状态
         """
-        endpoint = f"/inApps/v1/subscriptions/{transaction_id}"
-        return self._do_request(endpoint)
+        return self._do_request(_SUBSCRIPTIONS_PATH + transaction_id)
+
+    # ==================== 异步 API ====================
+
+    async def look_up_order_id_async(self, order_id: str) -> ResponseData:
+        """查询订单信息(异步版本,参数同look_up_order_id)"""
+        return await self._do_request_async(_LOOKUP_PATH + order_id)
+
+    async def get_all_subscription_statuses_async(
+        self,
+        order_id: str,
+        status: Optional[str] = None
+    ) -> ResponseData:
+        """获取所有订阅状态(异步版本,参数同get_all_subscription_statuses)"""
+        params = {"status": status} if status else None
+        return await self._do_request_async(_SUBSCRIPTIONS_PATH + order_id, params)
+
+    async def get_transaction_history_v2_async(
+        self,
+        query_params: Optional[Dict[str, Any]] = None
+    ) -> ResponseData:
+        """获取交易历史(异步版本,参数同get_transaction_history_v2)"""
+        return await self._do_request_async("/inApps/v2/history", query_params)
+
+    async def get_notification_history_async(
+        self,
+        query_params: Optional[Dict[str, Any]] = None
+    ) -> ResponseData:
+        """获取通知历史(异步版本,参数同get_notification_history)"""
+        return await self._do_request_async("/inApps/v1/notifications/history", query_params)
+
+    async def get_refund_history_async(
+        self,
+        query_params: Optional[Dict[str, Any]] = None
+    ) -> ResponseData:
+        """获取退款历史(异步版本,参数同get_refund_history)"""
+        return await self._do_request_async("/inApps/v2/refund/lookup", query_params)
+
+    async def verify_receipt_async(
+        self,
+        receipt_data: str,
+        password: Optional[str] = None,
+        exclude_old_transactions: bool = False
+    ) -> ResponseData:
+        """验证收据(异步版本,参数同verify_receipt)"""
+        request_data = self._build_receipt_request(receipt_data, password, exclude_old_transactions)
+        return await self._do_request_async("/verifyReceipt", request_data)
+
+    async def get_subscription_status_async(self, transaction_id: str) -> ResponseData:
+        """获取订阅状态(异步版本,参数同get_subscription_status)"""
+        return await self._do_request_async(_SUBSCRIPTIONS_PATH + transaction_id)
+
+    async def batch_async(
+        self,
+        calls: List[Tuple[str, Optional[Dict[str, Any]]]]
+    ) -> List[ResponseData]:
+        """
+        并发执行多个请求,适用于对账等需要连续查询多个接口的场景
+
+        所有请求共用同一个异步连接池同时发出,总耗时约为一次往返而非N次
+
+        Args:
+            calls: (API端点, 请求数据)列表,如:
+                [("/inApps/v2/history", {...}), ("/inApps/v2/refund/lookup", {...})]
+
+        Returns:
+            List[ResponseData]: 与calls顺序一致的响应列表
+        """
+        return list(await asyncio.gather(
+            *(self._do_request_async(endpoint, data) for endpoint, data in calls)
+        ))
@@ -6,10 +6,31 @@
 from typing import Optional, Dict, Any, Union
 from pathlib import Path
 from dataclasses import dataclass, field
-import json
+from functools import lru_cache
+from types import MappingProxyType
 import logging
+import os
 
 from gopay.exceptions import ConfigError
+from gopay.utils import json_codec
+
+
+@lru_cache(maxsize=128)
+def _read_text_cached(path: str, mtime_ns: int) -> str:
+    """按(路径, 修改时间)缓存文件内容,文件被修改后自动重新读取"""
+    return Path(path).read_text(encoding="utf-8")
+
+
+def _read_file_content(path: str) -> Optional[str]:
+    """
+    读取证书/密钥文件内容
+    每次只做一次stat,内容未变化时直接命中缓存
+    """
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    return _read_text_cached(path, mtime_ns)
 
 
 @dataclass
@@ -59,6 +80,8 @@ class PaymentConfig:
     # HTTP配置
     http_max_retries: int = 3
     http_retry_interval: float = 1.0
+    # 创建客户端时在后台预先建立到网关的连接, 首次请求无需等待TLS握手
+    http_prewarm: bool = False
 
     def __post_init__(self):
         """配置验证"""
@@ -97,13 +120,13 @@ class PaymentConfig:
         if not config_path.exists():
             raise ConfigError(f"配置文件不存在: {config_file}")
 
+        if config_path.suffix != ".json":
+            raise ConfigError(f"不支持的配置文件格式: {config_path.suffix}")
+
         try:
-            with open(config_path, "r", encoding="utf-8") as f:
-                if config_path.suffix == ".json":
-                    data = json.load(f)
-                else:
-                    raise ConfigError(f"不支持的配置文件格式: {config_path.suffix}")
-        except json.JSONDecodeError as e:
+            # 直接解析字节串,省去文本解码步骤
+            data = json_codec.loads(config_path.read_bytes())
+        except ValueError as e:
             raise ConfigError(f"配置文件解析失败: {e}")
 
         return cls.from_dict(data)
@@ -113,9 +136,7 @@ class PaymentConfig:
         if self.cert_pem:
             return self.cert_pem
         if self.cert_path:
-            cert_path = Path(self.cert_path)
-            if cert_path.exists():
-                return cert_path.read_text(encoding="utf-8")
+            return _read_file_content(self.cert_path)
         return None
 
     def get_key_content(self) -> Optional[str]:
@@ -123,9 +144,7 @@ class PaymentConfig:
         if self.key_pem:
             return self.key_pem
         if self.key_path:
-            key_path = Path(self.key_path)
-            if key_path.exists():
-                return key_path.read_text(encoding="utf-8")
+            return _read_file_content(self.key_path)
         return None
 
 
@@ -181,9 +200,7 @@ class AlipayConfig(PaymentConfig):
         if self.app_private_key:
             return self.app_private_key
         if self.app_private_key_path:
-            key_path = Path(self.app_private_key_path)
-            if key_path.exists():
-                return key_path.read_text(encoding="utf-8")
+            return _read_file_content(self.app_private_key_path)
         return None
 
     def get_alipay_public_key(self) -> Optional[str]:
@@ -191,9 +208,7 @@ class AlipayConfig(PaymentConfig):
         if self.alipay_public_key:
             return self.alipay_public_key
         if self.alipay_public_key_path:
-            key_path = Path(self.alipay_public_key_path)
-            if key_path.exists():
-                return key_path.read_text(encoding="utf-8")
+            return _read_file_content(self.alipay_public_key_path)
         return None
 
 
@@ -251,22 +266,43 @@ class ConfigManager:
 
     def __init__(self):
         self._configs: Dict[str, PaymentConfig] = {}
+        self._sealed = False
+
+    def _check_not_sealed(self) -> None:
+        if self._sealed:
+            raise ConfigError("配置管理器已封存,不能再修改配置")
 
     def register(self, name: str, config: PaymentConfig) -> None:
         """注册配置"""
+        self._check_not_sealed()
         config.validate()
         self._configs[name] = config
 
     def get(self, name: str) -> PaymentConfig:
         """获取配置"""
-        if name not in self._configs:
-            raise ConfigError(f"配置不存在: {name}")
-        return self._configs[name]
+        try:
+            return self._configs[name]
+        except KeyError:
+            raise ConfigError(f"配置不存在: {name}") from None
 
     def remove(self, name: str) -> None:
         """移除配置"""
-        if name in self._configs:
-            del self._configs[name]
+        self._check_not_sealed()
+        self._configs.pop(name, None)
+
+    def seal(self) -> None:
+        """
+        封存配置
+        应用启动完成后调用,之后配置只读,多线程/多worker共享时无需担心被修改
+        """
+        if not self._sealed:
+            self._configs = MappingProxyType(dict(self._configs))  # type: ignore[assignment]
+            self._sealed = True
+
+    @property
+    def sealed(self) -> bool:
+        """是否已封存"""
+        return self._sealed
 
     def list_configs(self) -> list[str]:
         """列出所有配置名称"""
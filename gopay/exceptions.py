@@ -7,12 +7,18 @@ from typing import Optional, Dict, Any
 
 
 class GoPayError(Exception):
-    """GoPay基础异常类"""
+    """
+    GoPay基础异常类
+    各级异常均声明__slots__, 属性存放在槽位中, 减少异常创建时的开销
+    """
+
+    __slots__ = ("message", "code", "extra")
 
     def __init__(self, message: str, code: Optional[str] = None, extra: Optional[Dict[str, Any]] = None):
         self.message = message
         self.code = code
-        self.extra = extra or {}
+        # 调用方会直接写入e.extra[...], 不能用共享的只读空映射代替, 未传入时仍需新建字典
+        self.extra: Dict[str, Any] = extra if extra is not None else {}
         super().__init__(self.message)
 
     def __str__(self) -> str:
@@ -20,6 +26,17 @@ class GoPayError(Exception):
             return f"[{self.code}] {self.message}"
         return self.message
 
+    def __reduce__(self):
+        # 槽位属性不在__dict__中, 需显式带上才能正确pickle
+        state = {
+            name: getattr(self, name)
+            for klass in type(self).__mro__
+            for name in klass.__dict__.get("__slots__", ())
+            if hasattr(self, name)
+        }
+        state.update(self.__dict__)
+        return self.__class__, self.args, state
+
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典格式"""
         return {
@@ -33,6 +50,8 @@ class GoPayError(Exception):
 class ConfigError(GoPayError):
     """配置错误"""
 
+    __slots__ = ("config_key",)
+
     def __init__(self, message: str, config_key: Optional[str] = None):
         super().__init__(message, code="CONFIG_ERROR")
         self.config_key = config_key
@@ -41,6 +60,8 @@ class ConfigError(GoPayError):
 class SignError(GoPayError):
     """签名验签错误"""
 
+    __slots__ = ("sign_type",)
+
     def __init__(self, message: str, sign_type: Optional[str] = None):
         super().__init__(message, code="SIGN_ERROR")
         self.sign_type = sign_type
@@ -49,6 +70,8 @@ class SignError(GoPayError):
 class PaymentError(GoPayError):
     """支付业务错误"""
 
+    __slots__ = ("error_sub_code",)
+
     def __init__(
         self,
         message: str,
@@ -63,6 +86,8 @@ class PaymentError(GoPayError):
 class NetworkError(GoPayError):
     """网络请求错误"""
 
+    __slots__ = ("status_code", "response_text")
+
     def __init__(
         self,
         message: str,
@@ -77,6 +102,8 @@ class NetworkError(GoPayError):
 class CertificateError(GoPayError):
     """证书处理错误"""
 
+    __slots__ = ("cert_type",)
+
     def __init__(self, message: str, cert_type: Optional[str] = None):
         super().__init__(message, code="CERTIFICATE_ERROR")
         self.cert_type = cert_type
@@ -85,6 +112,8 @@ class CertificateError(GoPayError):
 class ValidationError(GoPayError):
     """参数验证错误"""
 
+    __slots__ = ("field_name", "field_value")
+
     def __init__(self, message: str, field_name: Optional[str] = None, field_value: Optional[Any] = None):
         super().__init__(message, code="VALIDATION_ERROR")
         self.field_name = field_name
@@ -94,6 +123,8 @@ class ValidationError(GoPayError):
 class NotifyError(GoPayError):
     """通知处理错误"""
 
+    __slots__ = ("notify_type",)
+
     def __init__(self, message: str, notify_type: Optional[str] = None):
         super().__init__(message, code="NOTIFY_ERROR")
         self.notify_type = notify_type
@@ -102,6 +133,8 @@ class NotifyError(GoPayError):
 class APIError(GoPayError):
     """API调用错误"""
 
+    __slots__ = ("endpoint", "response_data")
+
     def __init__(
         self,
         message: str,
@@ -3,18 +3,151 @@ HTTP客户端模块
 遵循单一职责原则 - 专门负责HTTP请求
 """
 
-from typing import Optional, Dict, Any, Union
-import time
+from typing import Optional, Dict, Any, FrozenSet, Iterable, List, Sequence, Tuple, Union
+import asyncio
+from contextvars import ContextVar
+from functools import lru_cache
+import importlib.util
+import inspect
 import logging
+import threading
+import time
 import requests
 from requests.adapters import HTTPAdapter
+from urllib3 import PoolManager
 from urllib3.util.retry import Retry
 
 from gopay.exceptions import NetworkError
+from gopay.utils import json_codec
 
 
 logger = logging.getLogger(__name__)
 
+# 进程内共享的urllib3连接池, 按(缓存主机数, 每主机最大连接数)区分
+# 只共享连接, 每个HttpClient的session(cookie、请求头、证书等)相互独立
+_SHARED_POOLS: Dict[Tuple[int, int], PoolManager] = {}
+_SHARED_POOLS_LOCK = threading.Lock()
+
+
+_RETRY_STATUS_CODES = frozenset((429, 500, 502, 503, 504))
+# 默认只对幂等方法的响应状态/读取失败重试, POST/PATCH需调用方提供幂等键后显式开启
+# (连接失败时请求尚未发出, urllib3对任何方法都会重试)
+IDEMPOTENT_METHODS = frozenset(("GET", "HEAD", "OPTIONS", "PUT", "DELETE"))
+
+# urllib3 2.x起支持退避抖动, 避免大量请求在同一时刻集中重试
+_RETRY_SUPPORTS_JITTER = "backoff_jitter" in inspect.signature(Retry.__init__).parameters
+
+# httpx的HTTP/2支持依赖h2(pip install httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+def _encode_json_body(json: Any, headers: Optional[Dict[str, str]]) -> Tuple[bytes, Dict[str, str]]:
+    """
+    使用orjson预先序列化JSON请求体, 绕过requests/httpx内置的标准库序列化
+    不修改调用方传入的headers
+    """
+    body = json_codec.dumps(json)
+    if headers and any(k.lower() == "content-type" for k in headers):
+        return body, headers
+    headers = dict(headers) if headers else {}
+    headers["Content-Type"] = "application/json"
+    return body, headers
+
+
+@lru_cache(maxsize=32)
+def _make_retry(max_retries: int, retry_interval: float, retry_methods: FrozenSet[str]) -> Retry:
+    """
+    创建重试策略
+    Retry对象不可变(重试计数通过new()生成新对象), 相同参数的session共用同一个实例
+    """
+    # 重试完全交给urllib3: 带抖动的指数退避、遵循Retry-After, 重试耗尽后返回最后一次响应
+    options: Dict[str, Any] = {}
+    if _RETRY_SUPPORTS_JITTER:
+        options["backoff_jitter"] = retry_interval
+    return Retry(
+        total=max_retries,
+        connect=max_retries,
+        read=max_retries,
+        status=max_retries,
+        backoff_factor=retry_interval,
+        status_forcelist=_RETRY_STATUS_CODES,
+        allowed_methods=retry_methods,
+        raise_on_status=False,
+        respect_retry_after_header=True,
+        **options,
+    )
+
+
+# 单次请求内覆盖adapter的重试策略(按线程/上下文隔离), 带截止时间的请求设为_NO_RETRY
+_RETRY_OVERRIDE: ContextVar[Optional[Retry]] = ContextVar("gopay_retry_override", default=None)
+
+# 与requests默认一致: 不重试
+_NO_RETRY = Retry(0, read=False)
+
+
+class _PoolAdapter(HTTPAdapter):
+    """
+    可与其他客户端共用urllib3连接池的HTTPAdapter
+    重试策略可在单次请求内通过_RETRY_OVERRIDE覆盖
+    """
+
+    def __init__(self, poolmanager: Optional[PoolManager] = None, **kwargs):
+        super().__init__(**kwargs)
+        if poolmanager is not None:
+            self.poolmanager = poolmanager
+
+    @property
+    def max_retries(self) -> Retry:
+        override = _RETRY_OVERRIDE.get()
+        return self._max_retries if override is None else override
+
+    @max_retries.setter
+    def max_retries(self, value: Retry):
+        self._max_retries = value
+
+
+def _get_shared_pool(pool_connections: int, pool_maxsize: int) -> PoolManager:
+    """
+    获取共享连接池
+    同一进程内连接池参数相同的HttpClient复用已建立的连接, 避免重复TLS握手
+    """
+    key = (pool_connections, pool_maxsize)
+    pool = _SHARED_POOLS.get(key)
+    if pool is None:
+        with _SHARED_POOLS_LOCK:
+            pool = _SHARED_POOLS.get(key)
+            if pool is None:
+                # 由HTTPAdapter按当前requests版本的方式创建PoolManager
+                pool = HTTPAdapter(
+                    pool_connections=pool_connections,
+                    pool_maxsize=pool_maxsize,
+                    pool_block=False,
+                ).poolmanager
+                _SHARED_POOLS[key] = pool
+    return pool
+
+
+def _create_session(
+    max_retries: int,
+    retry_interval: float,
+    pool_connections: int,
+    pool_maxsize: int,
+    retry_methods: FrozenSet[str] = IDEMPOTENT_METHODS,
+    poolmanager: Optional[PoolManager] = None,
+) -> requests.Session:
+    """创建挂载了重试策略和连接池的session, 传入poolmanager时使用该(共享)连接池"""
+    session = requests.Session()
+    adapter = _PoolAdapter(
+        poolmanager=poolmanager,
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=False,
+        max_retries=_make_retry(max_retries, retry_interval, retry_methods),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
 
 class HttpClient:
     """
@@ -28,32 +161,33 @@ class HttpClient:
         max_retries: int = 3,
         retry_interval: float = 1.0,
         enable_log: bool = True,
+        pool_connections: int = 32,
+        pool_maxsize: int = 32,
+        shared_session: bool = True,
+        retry_methods: Optional[Iterable[str]] = None,
     ):
         """
         初始化HTTP客户端
         :param timeout: 超时时间(秒)
         :param max_retries: 最大重试次数
-        :param retry_interval: 重试间隔(秒)
+        :param retry_interval: 重试退避系数(秒), 第n次重试前等待约 retry_interval * 2^(n-1) 秒
         :param enable_log: 是否启用日志
+        :param pool_connections: 连接池缓存的主机数
+        :param pool_maxsize: 每个主机的最大保活连接数
+        :param shared_session: 是否与进程内连接池参数相同的客户端共享连接池
+                               (只共享连接; session的cookie、请求头、证书等各客户端独立)
+        :param retry_methods: 遇到可重试状态码或读取失败时允许重试的方法, 默认仅幂等方法
         """
         self.timeout = timeout
         self.max_retries = max_retries
         self.retry_interval = retry_interval
         self.enable_log = enable_log
+        self.shared_session = shared_session
 
-        # 创建session
-        self.session = requests.Session()
-
-        # 配置重试策略
-        retry_strategy = Retry(
-            total=max_retries,
-            backoff_factor=retry_interval,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["GET", "POST", "PUT", "DELETE", "PATCH"],
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
+        retry_methods = IDEMPOTENT_METHODS if retry_methods is None else frozenset(retry_methods)
+        session_args = (max_retries, retry_interval, pool_connections, pool_maxsize, retry_methods)
+        poolmanager = _get_shared_pool(pool_connections, pool_maxsize) if shared_session else None
+        self.session = _create_session(*session_args, poolmanager=poolmanager)
 
     def request(
         self,
@@ -63,7 +197,8 @@ class HttpClient:
         data: Optional[Union[Dict[str, Any], str, bytes]] = None,
         json: Optional[Dict[str, Any]] = None,
         headers: Optional[Dict[str, str]] = None,
-        timeout: Optional[int] = None,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None,
         **kwargs,
     ) -> requests.Response:
         """
@@ -75,58 +210,57 @@ class HttpClient:
         :param json: JSON请求体
         :param headers: 请求头
         :param timeout: 超时时间
+        :param deadline: 截止时间(time.monotonic()时间点), 多次调用共享同一时间预算时使用;
+                         指定时本次请求不重试, 总耗时不超过剩余时间
         :return: 响应对象
         """
         timeout = timeout or self.timeout
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise NetworkError(f"HTTP请求已超过截止时间: {method} {url}")
+            timeout = min(timeout, remaining)
 
-        if self.enable_log:
-            logger.info(f"发送HTTP请求: {method} {url}")
+        # 先判断日志级别, 关闭日志时不产生任何格式化开销
+        log_info = self.enable_log and logger.isEnabledFor(logging.INFO)
+        if log_info:
+            logger.info("发送HTTP请求: %s %s", method, url)
+        if self.enable_log and logger.isEnabledFor(logging.DEBUG):
             if headers:
-                logger.debug(f"请求头: {headers}")
+                logger.debug("请求头: %s", headers)
             if data:
-                logger.debug(f"请求数据: {data}")
+                logger.debug("请求数据: %s", data)
 
-        last_error = None
-        for attempt in range(self.max_retries + 1):
-            try:
-                response = self.session.request(
-                    method=method,
-                    url=url,
-                    params=params,
-                    data=data,
-                    json=json,
-                    headers=headers,
-                    timeout=timeout,
-                    **kwargs,
-                )
-
-                if self.enable_log:
-                    logger.info(f"HTTP响应: status={response.status_code}")
-
-                return response
-
-            except requests.exceptions.Timeout as e:
-                last_error = e
-                if self.enable_log:
-                    logger.warning(f"请求超时(尝试 {attempt + 1}/{self.max_retries + 1}): {e}")
-                if attempt < self.max_retries:
-                    time.sleep(self.retry_interval)
-
-            except requests.exceptions.ConnectionError as e:
-                last_error = e
-                if self.enable_log:
-                    logger.warning(f"连接错误(尝试 {attempt + 1}/{self.max_retries + 1}): {e}")
-                if attempt < self.max_retries:
-                    time.sleep(self.retry_interval)
+        if json is not None and data is None and json_codec.HAS_ORJSON:
+            data, headers = _encode_json_body(json, headers)
+            json = None
 
-            except requests.exceptions.RequestException as e:
-                raise NetworkError(
-                    f"HTTP请求失败: {e}",
-                    status_code=getattr(e.response, "status_code", None) if hasattr(e, "response") else None,
-                )
+        # 有截止时间时不重试: urllib3每次重试都重新获得完整的timeout并带退避等待, 会超出时间预算
+        retry_token = _RETRY_OVERRIDE.set(_NO_RETRY) if deadline is not None else None
+        try:
+            response = self.session.request(
+                method=method,
+                url=url,
+                params=params,
+                data=data,
+                json=json,
+                headers=headers,
+                timeout=timeout,
+                **kwargs,
+            )
+        except requests.exceptions.RequestException as e:
+            raise NetworkError(
+                f"HTTP请求失败: {e}",
+                status_code=getattr(e.response, "status_code", None) if hasattr(e, "response") else None,
+            )
+        finally:
+            if retry_token is not None:
+                _RETRY_OVERRIDE.reset(retry_token)
+
+        if log_info:
+            logger.info("HTTP响应: status=%s", response.status_code)
 
-        # 所有重试都失败
-        raise NetworkError(f"HTTP请求失败,已重试{self.max_retries}次: {last_error}")
+        return response
 
     def get(self, url: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> requests.Response:
         """GET请求"""
@@ -150,12 +284,214 @@ class HttpClient:
         """DELETE请求"""
         return self.request("DELETE", url, **kwargs)
 
+    def patch(
+        self,
+        url: str,
+        data: Optional[Union[Dict[str, Any], str, bytes]] = None,
+        json: Optional[Any] = None,
+        **kwargs,
+    ) -> requests.Response:
+        """PATCH请求"""
+        return self.request("PATCH", url, data=data, json=json, **kwargs)
+
+    def prewarm(self, url: str, timeout: float = 2) -> threading.Thread:
+        """
+        在后台线程中预先建立到url所在主机的连接(TCP+TLS握手)并放回连接池,
+        首次真实请求可直接复用, 适合冷启动频繁的短生命周期进程
+        预热失败只记录日志, 不影响后续请求
+        :param url: 目标地址, 只发送HEAD请求
+        :param timeout: 超时时间(秒)
+        :return: 预热线程
+        """
+        def warm():
+            try:
+                # 读取(空)响应体后连接才会归还连接池; Response.close()会直接关闭连接
+                self.session.head(url, timeout=timeout, allow_redirects=False).content
+            except requests.exceptions.RequestException as e:
+                logger.debug("连接预热失败: %s %s", url, e)
+
+        thread = threading.Thread(target=warm, name="gopay-http-prewarm", daemon=True)
+        thread.start()
+        return thread
+
     def close(self):
-        """关闭session"""
-        self.session.close()
+        """关闭session, 共享连接池由进程内所有客户端复用, 不关闭"""
+        if not self.shared_session:
+            self.session.close()
 
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.close()
+
+
+class AsyncHttpClient:
+    """
+    异步HTTP客户端
+    封装httpx.AsyncClient(可选依赖),复用连接池,适合并发请求场景
+    """
+
+    def __init__(
+        self,
+        timeout: int = 30,
+        max_retries: int = 3,
+        enable_log: bool = True,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        base_url: str = "",
+        http2: bool = False,
+    ):
+        """
+        初始化异步HTTP客户端
+        :param timeout: 超时时间(秒)
+        :param max_retries: 连接失败时的最大重试次数
+        :param enable_log: 是否启用日志
+        :param max_connections: 连接池最大连接数
+        :param max_keepalive_connections: 最大保活连接数
+        :param base_url: 基础URL,请求时可只传路径
+        :param http2: 是否启用HTTP/2, 并发请求复用同一TLS连接的多路复用流(需安装h2)
+        """
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError("httpx未安装,请运行: pip install httpx")
+        if http2 and not HTTP2_AVAILABLE:
+            raise ImportError("h2未安装,请运行: pip install httpx[http2]")
+
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.enable_log = enable_log
+
+        # 传入transport时httpx忽略AsyncClient的limits, 连接池上限须设置在transport上
+        self.client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=timeout,
+            transport=httpx.AsyncHTTPTransport(
+                retries=max_retries,
+                http2=http2,
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_keepalive_connections,
+                ),
+            ),
+        )
+        self._httpx = httpx
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[Union[Dict[str, Any], str, bytes]] = None,
+        json: Optional[Any] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[int] = None,
+        **kwargs,
+    ):
+        """
+        发送异步HTTP请求
+        :param method: 请求方法
+        :param url: 请求URL
+        :param params: URL参数
+        :param data: 请求体数据
+        :param json: JSON请求体
+        :param headers: 请求头
+        :param timeout: 超时时间
+        :return: httpx响应对象
+        """
+        # 与同步客户端一致: 先判断日志级别, 关闭日志时不产生任何格式化开销
+        log_info = self.enable_log and logger.isEnabledFor(logging.INFO)
+        if log_info:
+            logger.info("发送HTTP请求: %s %s", method, url)
+        if self.enable_log and logger.isEnabledFor(logging.DEBUG):
+            if headers:
+                logger.debug("请求头: %s", headers)
+            if data:
+                logger.debug("请求数据: %s", data)
+
+        if json is not None and data is None and json_codec.HAS_ORJSON:
+            data, headers = _encode_json_body(json, headers)
+            json = None
+
+        # httpx中data只接受表单,原始字节/字符串需通过content传递
+        if isinstance(data, (str, bytes)):
+            kwargs["content"] = data
+            data = None
+
+        try:
+            response = await self.client.request(
+                method,
+                url,
+                params=params,
+                data=data,
+                json=json,
+                headers=headers,
+                timeout=timeout or self.timeout,
+                **kwargs,
+            )
+        except self._httpx.HTTPError as e:
+            raise NetworkError(f"HTTP请求失败: {e}")
+
+        if log_info:
+            logger.info("HTTP响应: status=%s", response.status_code)
+
+        return response
+
+    async def get(self, url: str, params: Optional[Dict[str, Any]] = None, **kwargs):
+        """GET请求"""
+        return await self.request("GET", url, params=params, **kwargs)
+
+    async def post(
+        self,
+        url: str,
+        data: Optional[Union[Dict[str, Any], str, bytes]] = None,
+        json: Optional[Any] = None,
+        **kwargs,
+    ):
+        """POST请求"""
+        return await self.request("POST", url, data=data, json=json, **kwargs)
+
+    async def put(self, url: str, data: Optional[Union[Dict[str, Any], str, bytes]] = None, **kwargs):
+        """PUT请求"""
+        return await self.request("PUT", url, data=data, **kwargs)
+
+    async def delete(self, url: str, **kwargs):
+        """DELETE请求"""
+        return await self.request("DELETE", url, **kwargs)
+
+    async def patch(
+        self,
+        url: str,
+        data: Optional[Union[Dict[str, Any], str, bytes]] = None,
+        json: Optional[Any] = None,
+        **kwargs,
+    ):
+        """PATCH请求"""
+        return await self.request("PATCH", url, data=data, json=json, **kwargs)
+
+    async def request_many(
+        self,
+        requests_args: Sequence[Tuple[str, str, Dict[str, Any]]],
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """
+        并发发送多个请求, 共用同一个连接池, 总耗时约为一次往返
+        :param requests_args: (请求方法, URL, request关键字参数)列表
+        :param return_exceptions: 为True时单个请求失败以异常对象返回, 不影响其他请求
+        :return: 与请求顺序一致的响应列表
+        """
+        return list(await asyncio.gather(
+            *(self.request(method, url, **kwargs) for method, url, kwargs in requests_args),
+            return_exceptions=return_exceptions,
+        ))
+
+    async def close(self):
+        """关闭连接池"""
+        await self.client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
@@ -4,11 +4,16 @@
 遵循开闭原则 - 通过工厂模式支持多种支付渠道
 """
 
+import hmac
 import logging
-from typing import Dict, Any, Optional, Union, Callable
+import queue
+import threading
+from typing import Dict, Any, ClassVar, Optional, Tuple, Union, Callable
 from abc import ABC, abstractmethod
-import json
+from collections import OrderedDict
+from concurrent.futures import Future
 from functools import wraps
+from urllib.parse import parse_qsl
 
 from gopay.utils.datastructure import XmlMap
 from gopay.utils.signer import SignerFactory
@@ -17,6 +22,52 @@ from gopay.exceptions import NotifyError
 
 logger = logging.getLogger(__name__)
 
+# 微信/QQ钱包通知的固定响应, 与XmlMap.to_xml()的输出格式一致
+_SUCCESS_XML = "<xml><return_code>SUCCESS</return_code><return_msg>OK</return_msg></xml>"
+_FAIL_XML_TEMPLATE = "<xml><return_code>FAIL</return_code><return_msg>%s</return_msg></xml>"
+_FAIL_XML_CDATA_TEMPLATE = "<xml><return_code>FAIL</return_code><return_msg><![CDATA[%s]]></return_msg></xml>"
+
+
+def _build_canonical(data: Dict[str, Any]) -> str:
+    """
+    构建待签名字符串
+    过滤空值和sign字段, 按key排序后以k=v&k=v拼接
+    """
+    items = [(k, v) for k, v in data.items() if v is not None and v != "" and k != "sign"]
+    # list.sort(Timsort)对已有序的输入只做一次线性扫描, 无需额外判断是否已排序
+    items.sort()
+    return "&".join(["%s=%s" % kv for kv in items])
+
+
+class _VerifyCache:
+    """
+    验签结果缓存(LRU)
+    支付平台会重复推送同一条通知, 以(签名, 待签名字符串)为键缓存验签结果, 重复通知不再重新计算签名
+    """
+
+    def __init__(self, maxsize: int = 2048):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Tuple[str, str], bool]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, str]) -> Optional[bool]:
+        with self._lock:
+            result = self._data.get(key)
+            if result is not None:
+                self._data.move_to_end(key)
+            return result
+
+    def put(self, key: Tuple[str, str], result: bool) -> None:
+        with self._lock:
+            self._data[key] = result
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
 
 class NotifyHandler(ABC):
     """
@@ -44,52 +95,83 @@ class NotifyHandler(ABC):
         """返回失败响应"""
         pass
 
+    def _parse_text(self, raw_data: Union[str, bytes]) -> Dict[str, Any]:
+        """解析文本格式的通知数据, 由子类实现"""
+        raise NotImplementedError
+
+    def _dispatch_parse(self, raw_data: Union[str, bytes, Dict[str, Any]], notify_type: str) -> Dict[str, Any]:
+        """
+        按数据类型分发解析
+        先按确切类型判断常见的dict/str/bytes, 其子类再回退到isinstance
+        """
+        kind = type(raw_data)
+        if kind is dict:
+            return raw_data  # type: ignore[return-value]
+        if kind is str or kind is bytes:
+            return self._parse_text(raw_data)  # type: ignore[arg-type]
+        if isinstance(raw_data, dict):
+            return raw_data
+        if isinstance(raw_data, (str, bytes)):
+            return self._parse_text(raw_data)
+        raise NotifyError("不支持的数据格式", notify_type)
+
+    def clear_verify_cache(self) -> None:
+        """清空验签结果缓存"""
+        cache = getattr(self, "_verify_cache", None)
+        if cache is not None:
+            cache.clear()
+
 
 class AlipayNotifyHandler(NotifyHandler):
     """
     支付宝通知处理器
     """
 
-    def __init__(self, public_key: str, sign_type: str = "RSA2"):
+    def __init__(self, public_key: str, sign_type: str = "RSA2", verify_cache_size: int = 2048):
         """
         初始化支付宝通知处理器
         :param public_key: 支付宝公钥
         :param sign_type: 签名类型
+        :param verify_cache_size: 验签结果缓存条数, 0表示不缓存
         """
         self.public_key = public_key
         self.signer = SignerFactory.get_signer(sign_type)
+        self._verify_cache = _VerifyCache(verify_cache_size) if verify_cache_size > 0 else None
 
     def parse(self, raw_data: Union[str, bytes, Dict[str, Any]]) -> Dict[str, Any]:
         """解析支付宝通知数据"""
-        if isinstance(raw_data, dict):
-            return raw_data
-        elif isinstance(raw_data, (str, bytes)):
-            # 支付宝通知通常是POST表单数据
-            try:
-                if isinstance(raw_data, bytes):
-                    raw_data = raw_data.decode("utf-8")
-                # URL参数格式
-                from urllib.parse import parse_qs
-                parsed = parse_qs(raw_data)
-                return {k: v[0] if v else "" for k, v in parsed.items()}
-            except Exception as e:
-                raise NotifyError(f"解析支付宝通知失败: {e}", "ALIPAY")
-        else:
-            raise NotifyError("不支持的数据格式", "ALIPAY")
+        return self._dispatch_parse(raw_data, "ALIPAY")
+
+    def _parse_text(self, raw_data: Union[str, bytes]) -> Dict[str, Any]:
+        """解析支付宝POST表单数据"""
+        try:
+            # 非法UTF-8直接拒绝, 不替换为U+FFFD后参与验签
+            if isinstance(raw_data, bytes):
+                raw_data = raw_data.decode("utf-8")
+            # URL参数格式, 空值参数不保留; 重复参数取第一个值
+            data: Dict[str, Any] = {}
+            for key, value in parse_qsl(raw_data):
+                data.setdefault(key, value)
+            return data
+        except Exception as e:
+            raise NotifyError(f"解析支付宝通知失败: {e}", "ALIPAY")
 
     def verify(self, data: Dict[str, Any], signature: str) -> bool:
         """验证支付宝通知签名"""
         try:
-            # 过滤空值和sign字段
-            filtered_data = {k: v for k, v in data.items() if v not in [None, ""] and k != "sign"}
-            # 按key排序
-            sorted_params = sorted(filtered_data.items())
-            # 拼接参数
-            param_str = "&".join([f"{k}={v}" for k, v in sorted_params])
-
-            return self.signer.verify(param_str, signature, self.public_key)
+            param_str = _build_canonical(data)
+            cache_key = (signature, param_str)
+            if self._verify_cache is not None:
+                cached = self._verify_cache.get(cache_key)
+                if cached is not None:
+                    return cached
+
+            result = bool(self.signer.verify(param_str, signature, self.public_key))
+            if self._verify_cache is not None:
+                self._verify_cache.put(cache_key, result)
+            return result
         except Exception as e:
-            logger.error(f"支付宝通知验签失败: {e}")
+            logger.error("支付宝通知验签失败: %s", e)
             return False
 
     def success_response(self) -> str:
@@ -101,127 +183,87 @@ class AlipayNotifyHandler(NotifyHandler):
         return "failure"
 
 
-class WechatNotifyHandler(NotifyHandler):
+class _XmlNotifyHandler(NotifyHandler):
     """
-    微信通知处理器
+    XML格式通知处理器基类
+    微信和QQ钱包的通知格式、验签方式和响应格式一致, 仅渠道标识不同
     """
 
-    def __init__(self, api_key: str, sign_type: str = "HMAC-SHA256"):
+    NOTIFY_TYPE: ClassVar[str] = ""
+    CHANNEL_NAME: ClassVar[str] = ""
+
+    def __init__(self, api_key: str, sign_type: str = "HMAC-SHA256", verify_cache_size: int = 2048):
         """
-        初始化微信通知处理器
+        初始化通知处理器
         :param api_key: API密钥
         :param sign_type: 签名类型
+        :param verify_cache_size: 验签结果缓存条数, 0表示不缓存
         """
         self.api_key = api_key
         self.signer = SignerFactory.get_signer(sign_type)
+        self._verify_cache = _VerifyCache(verify_cache_size) if verify_cache_size > 0 else None
 
     def parse(self, raw_data: Union[str, bytes, Dict[str, Any]]) -> Dict[str, Any]:
-        """解析微信通知数据"""
-        if isinstance(raw_data, dict):
-            return raw_data
-        elif isinstance(raw_data, (str, bytes)):
-            try:
-                if isinstance(raw_data, bytes):
-                    raw_data = raw_data.decode("utf-8")
-                # 微信通知是XML格式
-                xml_map = XmlMap.from_xml(raw_data)
-                return xml_map.to_dict()
-            except Exception as e:
-                raise NotifyError(f"解析微信通知失败: {e}", "WECHAT")
-        else:
-            raise NotifyError("不支持的数据格式", "WECHAT")
+        """解析XML通知数据"""
+        return self._dispatch_parse(raw_data, self.NOTIFY_TYPE)
+
+    def _parse_text(self, raw_data: Union[str, bytes]) -> Dict[str, Any]:
+        """解析XML文本"""
+        try:
+            # from_xml直接接受bytes, 已安装lxml时优先使用lxml
+            return XmlMap.from_xml(raw_data).to_dict()
+        except Exception as e:
+            raise NotifyError(f"解析{self.CHANNEL_NAME}通知失败: {e}", self.NOTIFY_TYPE)
 
     def verify(self, data: Dict[str, Any], signature: str) -> bool:
-        """验证微信通知签名"""
+        """验证通知签名"""
         try:
-            # 过滤空值和sign字段
-            filtered_data = {k: v for k, v in data.items() if v not in [None, ""] and k != "sign"}
-            # 按key排序
-            sorted_params = sorted(filtered_data.items())
-            # 拼接参数
-            param_str = "&".join([f"{k}={v}" for k, v in sorted_params])
+            param_str = _build_canonical(data)
+            cache_key = (signature, param_str)
+            if self._verify_cache is not None:
+                cached = self._verify_cache.get(cache_key)
+                if cached is not None:
+                    return cached
 
             calculated_sign = self.signer.sign(param_str, self.api_key)
-            return calculated_sign == signature
+            # 签名为十六进制串, 忽略大小写并使用常量时间比较, 防止时序攻击
+            result = hmac.compare_digest(calculated_sign.upper(), signature.upper())
+            if self._verify_cache is not None:
+                self._verify_cache.put(cache_key, result)
+            return result
         except Exception as e:
-            logger.error(f"微信通知验签失败: {e}")
+            logger.error("%s通知验签失败: %s", self.CHANNEL_NAME, e)
             return False
 
     def success_response(self) -> str:
         """返回成功响应"""
-        xml_map = XmlMap()
-        xml_map.set("return_code", "SUCCESS")
-        xml_map.set("return_msg", "OK")
-        return xml_map.to_xml()
+        return _SUCCESS_XML
 
     def fail_response(self, message: str = "") -> str:
         """返回失败响应"""
-        xml_map = XmlMap()
-        xml_map.set("return_code", "FAIL")
-        xml_map.set("return_msg", message or "处理失败")
-        return xml_map.to_xml()
+        message = message or "处理失败"
+        # 与XmlMap一致: 含特殊字符时使用CDATA包裹
+        if "<" in message or ">" in message or "&" in message or "'" in message:
+            return _FAIL_XML_CDATA_TEMPLATE % message
+        return _FAIL_XML_TEMPLATE % message
 
 
-class QQNotifyHandler(NotifyHandler):
+class WechatNotifyHandler(_XmlNotifyHandler):
     """
-    QQ钱包通知处理器
+    微信通知处理器
     """
 
-    def __init__(self, api_key: str, sign_type: str = "HMAC-SHA256"):
-        """
-        初始化QQ钱包通知处理器
-        :param api_key: API密钥
-        :param sign_type: 签名类型
-        """
-        self.api_key = api_key
-        self.signer = SignerFactory.get_signer(sign_type)
-
-    def parse(self, raw_data: Union[str, bytes, Dict[str, Any]]) -> Dict[str, Any]:
-        """解析QQ钱包通知数据"""
-        # QQ钱包通知格式与微信类似,都是XML
-        if isinstance(raw_data, dict):
-            return raw_data
-        elif isinstance(raw_data, (str, bytes)):
-            try:
-                if isinstance(raw_data, bytes):
-                    raw_data = raw_data.decode("utf-8")
-                # QQ钱包通知是XML格式
-                xml_map = XmlMap.from_xml(raw_data)
-                return xml_map.to_dict()
-            except Exception as e:
-                raise NotifyError(f"解析QQ钱包通知失败: {e}", "QQ")
-        else:
-            raise NotifyError("不支持的数据格式", "QQ")
-
-    def verify(self, data: Dict[str, Any], signature: str) -> bool:
-        """验证QQ钱包通知签名"""
-        try:
-            # 过滤空值和sign字段
-            filtered_data = {k: v for k, v in data.items() if v not in [None, ""] and k != "sign"}
-            # 按key排序
-            sorted_params = sorted(filtered_data.items())
-            # 拼接参数
-            param_str = "&".join([f"{k}={v}" for k, v in sorted_params])
+    NOTIFY_TYPE = "WECHAT"
+    CHANNEL_NAME = "微信"
 
-            calculated_sign = self.signer.sign(param_str, self.api_key)
-            return calculated_sign == signature
-        except Exception as e:
-            logger.error(f"QQ钱包通知验签失败: {e}")
-            return False
 
-    def success_response(self) -> str:
-        """返回成功响应"""
-        xml_map = XmlMap()
-        xml_map.set("return_code", "SUCCESS")
-        xml_map.set("return_msg", "OK")
-        return xml_map.to_xml()
+class QQNotifyHandler(_XmlNotifyHandler):
+    """
+    QQ钱包通知处理器
+    """
 
-    def fail_response(self, message: str = "") -> str:
-        """返回失败响应"""
-        xml_map = XmlMap()
-        xml_map.set("return_code", "FAIL")
-        xml_map.set("return_msg", message or "处理失败")
-        return xml_map.to_xml()
+    NOTIFY_TYPE = "QQ"
+    CHANNEL_NAME = "QQ钱包"
 
 
 class NotifyProcessor:
@@ -248,40 +290,132 @@ class NotifyProcessor:
         :param callback: 业务处理回调函数
         :return: 响应字符串
         """
+        handler = self.handler
+        # 解析和验签阶段的异常统一转换为失败响应
         try:
-            # 解析通知
-            data = self.handler.parse(raw_data)
+            data = handler.parse(raw_data)
 
             # 获取签名
             signature = data.get("sign", "")
             if not signature:
                 logger.warning("通知中没有签名")
-                return self.handler.fail_response("缺少签名")
+                return handler.fail_response("缺少签名")
 
             # 验证签名
-            if not self.handler.verify(data, signature):
-                logger.warning("通知签名验证失败")
-                return self.handler.fail_response("签名验证失败")
-
-            # 执行业务回调
-            if callback:
-                try:
-                    result = callback(data)
-                    if result is False:
-                        return self.handler.fail_response("业务处理失败")
-                except Exception as e:
-                    logger.error(f"业务处理失败: {e}")
-                    return self.handler.fail_response("业务处理异常")
-
-            # 返回成功响应
-            return self.handler.success_response()
-
+            verified = handler.verify(data, signature)
         except NotifyError as e:
-            logger.error(f"通知处理失败: {e}")
-            return self.handler.fail_response(str(e))
+            logger.error("通知处理失败: %s", e)
+            return handler.fail_response(str(e))
         except Exception as e:
-            logger.error(f"通知处理异常: {e}")
-            return self.handler.fail_response("处理异常")
+            logger.error("通知处理异常: %s", e)
+            return handler.fail_response("处理异常")
+
+        if not verified:
+            logger.warning("通知签名验证失败")
+            return handler.fail_response("签名验证失败")
+
+        # 执行业务回调, 业务异常单独处理
+        if callback is not None:
+            try:
+                result = callback(data)
+            except Exception as e:
+                logger.error("业务处理失败: %s", e)
+                return handler.fail_response("业务处理异常")
+            if result is False:
+                return handler.fail_response("业务处理失败")
+
+        # 返回成功响应
+        return handler.success_response()
+
+
+class AsyncNotifyProcessor(NotifyProcessor):
+    """
+    异步通知处理器
+    通知先入队, 由后台工作线程处理, 请求线程只需等待或直接返回
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        handler: NotifyHandler,
+        callback: Optional[Callable[[Dict[str, Any]], Any]] = None,
+        workers: int = 4,
+        max_queue_size: int = 1024,
+    ):
+        """
+        初始化异步通知处理器
+        :param handler: 具体的通知处理器
+        :param callback: 默认业务处理回调函数
+        :param workers: 工作线程数
+        :param max_queue_size: 队列容量, 队列满时submit阻塞
+        """
+        super().__init__(handler)
+        self.callback = callback
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue_size)
+        self._workers = [
+            threading.Thread(target=self._worker, name=f"gopay-notify-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        self._closed = False
+        # submit的关闭检查与入队、close的置位与放入停止标记共用此锁,
+        # 保证通知不会排在停止标记之后(此时已没有工作线程处理, Future永远不会完成)
+        self._lock = threading.Lock()
+        for worker in self._workers:
+            worker.start()
+
+    def submit(
+        self,
+        raw_data: Union[str, bytes, Dict[str, Any]],
+        callback: Optional[Callable[[Dict[str, Any]], Any]] = None,
+    ) -> "Future[str]":
+        """
+        提交通知
+        :param raw_data: 原始通知数据
+        :param callback: 业务处理回调函数, 默认使用初始化时传入的回调
+        :return: Future, 结果为响应字符串
+        """
+        future: "Future[str]" = Future()
+        with self._lock:
+            if self._closed:
+                raise NotifyError("通知处理器已关闭")
+            self._queue.put((raw_data, callback or self.callback, future))
+        return future
+
+    def _worker(self):
+        """工作线程: 逐条取出通知处理, 取到停止标记后退出"""
+        while True:
+            item = self._queue.get()
+            if item is self._STOP:
+                return
+            raw_data, callback, future = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(self.process(raw_data, callback))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def close(self, wait: bool = True):
+        """
+        关闭处理器, 已入队的通知处理完后工作线程退出
+        :param wait: 是否等待工作线程退出
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            for _ in self._workers:
+                self._queue.put(self._STOP)
+        if wait:
+            for worker in self._workers:
+                worker.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
 
 
 def notify_handler_decorator(handler: NotifyHandler):
@@ -3,8 +3,10 @@ PayPal支付模块
 """
 
 from gopay.paypal.client import PayPalClient, PayPalConfig
+from gopay.paypal.pipeline import PayPalPipeline
 
 __all__ = [
     "PayPalClient",
     "PayPalConfig",
+    "PayPalPipeline",
 ]
@@ -3,17 +3,34 @@ PayPal支付客户端
 支持PayPal支付、订单、订阅等完整功能
 """
 
+import asyncio
 import logging
-from typing import Optional, Dict, Any, List
-from urllib.parse import urljoin
+import threading
+import time
+import uuid
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, Tuple
 
 from gopay.config import PaymentConfig
 from gopay.utils.datastructure import BodyMap, ResponseData
-from gopay.http import HttpClient
+from gopay.http import HttpClient, AsyncHttpClient, IDEMPOTENT_METHODS
+from gopay.paypal.pipeline import PayPalPipeline
 
 
 logger = logging.getLogger(__name__)
 
+# 访问令牌提前刷新的秒数, 避免请求途中令牌过期
+TOKEN_REFRESH_MARGIN = 60
+
+
+@lru_cache(maxsize=4096)
+def _format_endpoint(template: str, resource_id: str) -> str:
+    """
+    用资源ID填充端点模板
+    批量操作同一资源(如逐个取消订阅后再查询)时复用已生成的路径
+    """
+    return template.format(id=resource_id)
+
 
 class PayPalConfig(PaymentConfig):
     """PayPal配置"""
@@ -59,6 +76,53 @@ class PayPalConfig(PaymentConfig):
 class PayPalClient:
     """PayPal客户端 - 支持支付、订单、订阅等完整功能"""
 
+    # 获取访问令牌的请求头
+    _TOKEN_HEADERS = {
+        "Content-Type": "application/x-www-form-urlencoded",
+        "Accept": "application/json",
+        "Accept-Language": "en_US"
+    }
+
+    # 携带JSON请求体的HTTP方法, 其余方法使用URL查询参数
+    _BODY_METHODS = frozenset(("POST", "PUT", "PATCH"))
+
+    # API端点模板, 按方法名索引; 含{id}的模板在调用时填充资源ID
+    _ENDPOINTS = {
+        # 支付
+        "create_payment": "/v1/payments/payment",
+        "payment_authorize": "/v1/payments/payment/{id}/authorize",
+        "payment_capture": "/v1/payments/authorization/{id}/capture",
+        "payment_execute": "/v1/payments/payment/{id}/execute",
+        "get_payment": "/v1/payments/payment/{id}",
+        "list_payments": "/v1/payments/payment",
+        # 订单
+        "create_order": "/v2/checkout/orders",
+        "get_order": "/v2/checkout/orders/{id}",
+        "update_order": "/v2/checkout/orders/{id}",
+        "authorize_order": "/v2/checkout/orders/{id}/authorize",
+        "capture_order": "/v2/checkout/orders/{id}/capture",
+        # 订阅
+        "create_subscription": "/v1/billing/subscriptions",
+        "get_subscription": "/v1/billing/subscriptions/{id}",
+        "update_subscription": "/v1/billing/subscriptions/{id}",
+        "cancel_subscription": "/v1/billing/subscriptions/{id}/cancel",
+        "activate_subscription": "/v1/billing/subscriptions/{id}/activate",
+        "suspend_subscription": "/v1/billing/subscriptions/{id}/suspend",
+        "capture_subscription_payment": "/v1/billing/subscriptions/{id}/capture",
+        "revise_subscription": "/v1/billing/subscriptions/{id}/revise",
+        # 计划
+        "create_plan": "/v1/billing/plans",
+        "get_plan": "/v1/billing/plans/{id}",
+        "list_plans": "/v1/billing/plans",
+        "update_plan": "/v1/billing/plans/{id}",
+        "activate_plan": "/v1/billing/plans/{id}/activate",
+        "deactivate_plan": "/v1/billing/plans/{id}/deactivate",
+        # 退款
+        "refund_payment": "/v1/payments/sale/{id}/refund",
+        "get_refund": "/v1/payments/refund/{id}",
+        "list_refunds": "/v1/payments/refund",
+    }
+
     def __init__(self, config: PayPalConfig):
         """
         初始化PayPal客户端
@@ -68,44 +132,152 @@ class PayPalClient:
         """
         self.config = config
         self.config.validate()
+        # 端点均以"/"开头, 直接拼接网关地址, 免去每次请求urljoin解析URL
+        self._base_url = config.gateway_url.rstrip("/")
+        self._token_url = self._base_url + "/v1/oauth2/token"
+        # 长连接复用: 同配置的客户端共享连接池, 后续请求免去TCP+TLS握手
         self.http_client = HttpClient(
             timeout=config.timeout,
             max_retries=3,
-            retry_interval=1
+            retry_interval=0.2,
+            pool_connections=10,
+            pool_maxsize=50,
+            # POST请求携带PayPal-Request-Id幂等键, 服务端对重复请求只处理一次, 可安全重试
+            retry_methods=IDEMPOTENT_METHODS | {"POST"},
         )
-        self._access_token: Optional[str] = None
+        # HTTP方法 -> 同步请求函数
+        self._method_dispatch = {
+            "GET": self.http_client.get,
+            "POST": self.http_client.post,
+            "PUT": self.http_client.put,
+            "PATCH": self.http_client.patch,
+            "DELETE": self.http_client.delete,
+        }
+        # (访问令牌, 过期时间点), 过期时间点基于time.monotonic()
+        self._token_cache: Optional[Tuple[str, float]] = None
+        # (访问令牌, 携带该令牌的请求头), 令牌刷新前各请求共用同一个请求头字典
+        self._auth_headers_cache: Optional[Tuple[str, Dict[str, str]]] = None
+        # 令牌刷新锁, 并发请求时只有一个线程去获取新令牌
+        self._token_lock = threading.Lock()
+        # 异步客户端及其令牌锁按需创建(依赖httpx)
+        self._async_http_client: Optional[AsyncHttpClient] = None
+        self._async_token_lock: Optional[asyncio.Lock] = None
+
+    def _invalidate_access_token(self):
+        """使缓存的访问令牌失效"""
+        self._token_cache = None
+
+    def _cached_access_token(self) -> Optional[str]:
+        """返回仍在有效期内的缓存令牌, 没有则返回None"""
+        token_cache = self._token_cache
+        if token_cache is not None and time.monotonic() < token_cache[1] - TOKEN_REFRESH_MARGIN:
+            return token_cache[0]
+        return None
 
     def _get_access_token(self) -> str:
         """
         获取访问令牌
+        令牌按expires_in缓存, 过期前TOKEN_REFRESH_MARGIN秒重新获取
 
         Returns:
             str: 访问令牌
         """
-        if self._access_token:
-            return self._access_token
+        access_token = self._cached_access_token()
+        if access_token is not None:
+            return access_token
 
-        url = urljoin(self.config.gateway_url, "/v1/oauth2/token")
+        with self._token_lock:
+            # 等锁期间其他线程可能已刷新令牌
+            access_token = self._cached_access_token()
+            if access_token is not None:
+                return access_token
+            return self._fetch_access_token()
 
+    def _fetch_access_token(self) -> str:
+        """
+        从PayPal获取新的访问令牌并写入缓存
+
+        Returns:
+            str: 访问令牌
+        """
         try:
             response = self.http_client.post(
-                url=url,
+                url=self._token_url,
                 data={"grant_type": "client_credentials"},
-                headers={
-                    "Content-Type": "application/x-www-form-urlencoded",
-                    "Accept": "application/json",
-                    "Accept-Language": "en_US"
-                },
+                headers=self._TOKEN_HEADERS,
                 auth=(self.config.client_id, self.config.client_secret)
             )
-
-            self._access_token = response.get("access_token")
-            return self._access_token
+            return self._store_access_token(response.json())
 
         except Exception as e:
-            logger.error(f"获取PayPal访问令牌失败: {str(e)}")
+            logger.error("获取PayPal访问令牌失败: %s", e)
             raise
 
+    def _store_access_token(self, result: Dict[str, Any]) -> str:
+        """
+        缓存令牌接口返回的访问令牌
+
+        Args:
+            result: 令牌接口返回的JSON
+
+        Returns:
+            str: 访问令牌
+        """
+        access_token = result["access_token"]
+        expires_at = time.monotonic() + float(result.get("expires_in", 3600))
+        self._token_cache = (access_token, expires_at)
+        return access_token
+
+    def _auth_headers(self, access_token: str, request_id: Optional[str] = None) -> Dict[str, str]:
+        """
+        获取携带访问令牌的请求头
+        请求头随令牌缓存, 令牌不变时不再重新构建; 带幂等键时复制一份再添加
+
+        Args:
+            access_token: 访问令牌
+            request_id: PayPal-Request-Id幂等键
+
+        Returns:
+            Dict[str, str]: 请求头(共用的字典, 调用方不得修改)
+        """
+        cached = self._auth_headers_cache
+        if cached is not None and cached[0] == access_token:
+            headers = cached[1]
+        else:
+            headers = {
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {access_token}"
+            }
+            self._auth_headers_cache = (access_token, headers)
+        if request_id is not None:
+            return {**headers, "PayPal-Request-Id": request_id}
+        return headers
+
+    def _parse_response(self, response) -> ResponseData:
+        """
+        解析PayPal响应
+
+        Args:
+            response: HTTP响应对象(requests或httpx)
+
+        Returns:
+            ResponseData: 响应数据
+        """
+        # 部分接口(如PATCH)成功时返回204无响应体
+        result = response.json() if response.content else {}
+        success = 200 <= response.status_code < 300
+        error = None
+        if not success:
+            error = result.get("message") or result.get("error_description") or result.get("error")
+
+        return ResponseData(
+            success=success,
+            data=result,
+            error=error,
+            code=str(response.status_code),
+            raw_response=response.text,
+        )
+
     def _do_request(
         self,
         method: str,
@@ -125,41 +297,235 @@ class PayPalClient:
         Returns:
             ResponseData: 响应数据
         """
-        url = urljoin(self.config.gateway_url, endpoint)
-        access_token = self._get_access_token()
-
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {access_token}"
-        }
+        url = self._base_url + endpoint
+        request_id = self._new_request_id(method)
 
         try:
-            if method == "GET":
-                response = self.http_client.get(url=url, params=params, headers=headers)
-            elif method == "POST":
-                response = self.http_client.post(url=url, json=data, headers=headers)
-            elif method == "PUT":
-                response = self.http_client.put(url=url, json=data, headers=headers)
-            elif method == "PATCH":
-                response = self.http_client.patch(url=url, json=data, headers=headers)
-            elif method == "DELETE":
-                response = self.http_client.delete(url=url, headers=headers)
-            else:
-                raise ValueError(f"不支持的HTTP方法: {method}")
-
-            return ResponseData(
-                code=str(response.get("status", "0")),
-                msg=response.get("error", "Success"),
-                data=response
-            )
+            response = self._send(method, url, data, params, request_id)
+            # 令牌被提前吊销或已过期时, 刷新令牌后重试一次
+            if response.status_code == 401:
+                self._invalidate_access_token()
+                response = self._send(method, url, data, params, request_id)
+
+            return self._parse_response(response)
 
         except Exception as e:
-            logger.error(f"PayPal请求失败: {str(e)}")
-            return ResponseData(
-                code="-1",
-                msg=str(e),
-                data={}
+            logger.error("PayPal请求失败: %s", e)
+            return ResponseData.error_response(error=str(e), code="-1")
+
+    @staticmethod
+    def _new_request_id(method: str) -> Optional[str]:
+        """
+        为POST请求生成PayPal-Request-Id幂等键
+        同一次调用的所有重试共用该键, PayPal对重复请求返回首次的处理结果
+        """
+        return uuid.uuid4().hex if method == "POST" else None
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        data: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        request_id: Optional[str] = None
+    ):
+        """
+        携带访问令牌发送HTTP请求
+
+        Args:
+            method: HTTP方法(GET, POST, PUT, PATCH, DELETE)
+            url: 完整URL
+            data: 请求体数据
+            params: URL查询参数
+            request_id: PayPal-Request-Id幂等键
+
+        Returns:
+            HTTP响应对象
+        """
+        headers = self._auth_headers(self._get_access_token(), request_id)
+
+        send = self._method_dispatch.get(method)
+        if send is None:
+            raise ValueError(f"不支持的HTTP方法: {method}")
+        if method in self._BODY_METHODS:
+            return send(url=url, json=data, headers=headers)
+        return send(url=url, params=params, headers=headers)
+
+    # ==================== 异步请求 ====================
+
+    def _get_async_http_client(self) -> AsyncHttpClient:
+        """
+        获取异步HTTP客户端,首次调用时创建
+
+        Returns:
+            AsyncHttpClient: 异步HTTP客户端
+        """
+        if self._async_http_client is None:
+            self._async_http_client = AsyncHttpClient(
+                timeout=self.config.timeout,
+                max_retries=3,
+                max_connections=100,
+                max_keepalive_connections=20,
             )
+        return self._async_http_client
+
+    async def _get_access_token_async(self) -> str:
+        """
+        获取访问令牌(异步版本), 与同步版本共用令牌缓存
+
+        Returns:
+            str: 访问令牌
+        """
+        access_token = self._cached_access_token()
+        if access_token is not None:
+            return access_token
+
+        if self._async_token_lock is None:
+            self._async_token_lock = asyncio.Lock()
+        async with self._async_token_lock:
+            access_token = self._cached_access_token()
+            if access_token is not None:
+                return access_token
+
+            try:
+                response = await self._get_async_http_client().post(
+                    url=self._token_url,
+                    data={"grant_type": "client_credentials"},
+                    headers=self._TOKEN_HEADERS,
+                    auth=(self.config.client_id, self.config.client_secret)
+                )
+                return self._store_access_token(response.json())
+            except Exception as e:
+                logger.error("获取PayPal访问令牌失败: %s", e)
+                raise
+
+    async def _send_async(
+        self,
+        method: str,
+        url: str,
+        data: Optional[Any] = None,
+        params: Optional[Dict[str, Any]] = None,
+        request_id: Optional[str] = None
+    ):
+        """携带访问令牌发送异步HTTP请求, 参数同_send"""
+        headers = self._auth_headers(await self._get_access_token_async(), request_id)
+        if method not in self._method_dispatch:
+            raise ValueError(f"不支持的HTTP方法: {method}")
+        json_body = data if method in self._BODY_METHODS else None
+        return await self._get_async_http_client().request(
+            method, url, params=params, json=json_body, headers=headers
+        )
+
+    async def _do_request_async(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Any] = None,
+        params: Optional[Dict[str, Any]] = None
+    ) -> ResponseData:
+        """执行异步HTTP请求, 参数同_do_request"""
+        url = self._base_url + endpoint
+        request_id = self._new_request_id(method)
+
+        try:
+            response = await self._send_async(method, url, data, params, request_id)
+            if response.status_code == 401:
+                self._invalidate_access_token()
+                response = await self._send_async(method, url, data, params, request_id)
+
+            return self._parse_response(response)
+
+        except Exception as e:
+            logger.error("PayPal请求失败: %s", e)
+            return ResponseData.error_response(error=str(e), code="-1")
+
+    async def aclose(self):
+        """关闭异步HTTP客户端"""
+        if self._async_http_client is not None:
+            await self._async_http_client.close()
+            self._async_http_client = None
+
+    async def get_payment_async(self, payment_id: str) -> ResponseData:
+        """获取支付详情(异步版本,参数同get_payment)"""
+        return await self._do_request_async("GET", _format_endpoint(self._ENDPOINTS["get_payment"], payment_id))
+
+    async def list_payments_async(self, params: Optional[Dict[str, Any]] = None) -> ResponseData:
+        """列出支付(异步版本,参数同list_payments)"""
+        return await self._do_request_async("GET", self._ENDPOINTS["list_payments"], params=params)
+
+    async def get_order_async(self, order_id: str) -> ResponseData:
+        """获取订单详情(异步版本,参数同get_order)"""
+        return await self._do_request_async("GET", _format_endpoint(self._ENDPOINTS["get_order"], order_id))
+
+    async def get_subscription_async(self, subscription_id: str) -> ResponseData:
+        """获取订阅详情(异步版本,参数同get_subscription)"""
+        return await self._do_request_async("GET", _format_endpoint(self._ENDPOINTS["get_subscription"], subscription_id))
+
+    async def get_payments_bulk_async(self, payment_ids: List[str]) -> List[ResponseData]:
+        """
+        并发获取多个支付详情
+
+        所有请求共用同一个异步连接池同时发出,总耗时约为一次往返而非N次
+
+        Args:
+            payment_ids: 支付ID列表
+
+        Returns:
+            List[ResponseData]: 与payment_ids顺序一致的支付详情
+        """
+        return list(await asyncio.gather(*(self.get_payment_async(i) for i in payment_ids)))
+
+    async def get_orders_bulk_async(self, order_ids: List[str]) -> List[ResponseData]:
+        """
+        并发获取多个订单详情
+
+        Args:
+            order_ids: 订单ID列表
+
+        Returns:
+            List[ResponseData]: 与order_ids顺序一致的订单详情
+        """
+        return list(await asyncio.gather(*(self.get_order_async(i) for i in order_ids)))
+
+    def request(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Any] = None,
+        params: Optional[Dict[str, Any]] = None
+    ) -> ResponseData:
+        """
+        调用任意PayPal API, 用于客户端未封装的接口
+
+        Args:
+            method: HTTP方法(GET, POST, PUT, PATCH, DELETE)
+            endpoint: API端点, 以"/"开头, 如"/v2/checkout/orders"
+            data: 请求体数据
+            params: URL查询参数
+
+        Returns:
+            ResponseData: 响应数据
+        """
+        return self._do_request(method, endpoint, data, params)
+
+    async def request_async(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Any] = None,
+        params: Optional[Dict[str, Any]] = None
+    ) -> ResponseData:
+        """调用任意PayPal API(异步版本,参数同request)"""
+        return await self._do_request_async(method, endpoint, data, params)
+
+    def pipeline(self) -> PayPalPipeline:
+        """
+        创建请求流水线, 用于编排存在依赖关系的多个请求
+
+        Returns:
+            PayPalPipeline: 请求流水线
+        """
+        return PayPalPipeline(self)
 
     # ==================== 支付相关 API ====================
 
@@ -173,7 +539,7 @@ class PayPalClient:
         Returns:
             ResponseData: 支付创建结果
         """
-        return self._do_request("POST", "/v1/payments/payment", payment_data)
+        return self._do_request("POST", self._ENDPOINTS["create_payment"], payment_data)
 
     def payment_authorize(self, payment_id: str, data: Dict[str, Any]) -> ResponseData:
         """
@@ -186,7 +552,7 @@ class PayPalClient:
         Returns:
             ResponseData: 授权结果
         """
-        return self._do_request("POST", f"/v1/payments/payment/{payment_id}/authorize", data)
+        return self._do_request("POST", _format_endpoint(self._ENDPOINTS["payment_authorize"], payment_id), data)
 
     def payment_capture(self, authorization_id: str, data: Dict[str, Any]) -> ResponseData:
         """
@@ -199,7 +565,7 @@ class PayPalClient:
         Returns:
             ResponseData: 捕获结果
         """
-        return self._do_request("POST", f"/v1/payments/authorization/{authorization_id}/capture", data)
+        return self._do_request("POST", _format_endpoint(self._ENDPOINTS["payment_capture"], authorization_id), data)
 
     def payment_execute(self, payment_id: str, payer_id: str) -> ResponseData:
         """
@@ -212,7 +578,7 @@ class PayPalClient:
         Returns:
             ResponseData: 执行结果
         """
-        return self._do_request("POST", f"/v1/payments/payment/{payment_id}/execute", {
+        return self._do_request("POST", _format_endpoint(self._ENDPOINTS["payment_execute"], payment_id), {
             "payer_id": payer_id
         })
 
@@ -226,7 +592,7 @@ class PayPalClient:
         Returns:
             ResponseData: 支付详情
         """
-        return self._do_request("GET", f"/v1/payments/payment/{payment_id}")
+        return self._do_request("GET", _format_endpoint(self._ENDPOINTS["get_payment"], payment_id))
 
     def list_payments(self, params: Optional[Dict[str, Any]] = None) -> ResponseData:
         """
@@ -238,7 +604,7 @@ class PayPalClient:
         Returns:
             ResponseData: 支付列表
         """
-        return self._do_request("GET", "/v1/payments/payment", params=params)
+        return self._do_request("GET", self._ENDPOINTS["list_payments"], params=params)
 
     # ==================== 订单相关 API ====================
 
@@ -252,7 +618,7 @@ class PayPalClient:
         Returns:
             ResponseData: 订单创建结果
         """
-        return self._do_request("POST", "/v2/checkout/orders", order_data)
+        return self._do_request("POST", self._ENDPOINTS["create_order"], order_data)
 
     def get_order(self, order_id: str) -> ResponseData:
         """
@@ -264,7 +630,7 @@ class PayPalClient:
         Returns:
             ResponseData: 订单详情
         """
-        return self._do_request("GET", f"/v2/checkout/orders/{order_id}")
+        return self._do_request("GET", _format_endpoint(self._ENDPOINTS["get_order"], order_id))
 
     def update_order(self, order_id: str, data: List[Dict[str, Any]]) -> ResponseData:
         """
@@ -277,7 +643,7 @@ class PayPalClient:
         Returns:
             ResponseData: 更新结果
         """
-        return self._do_request("PATCH", f"/v2/checkout/orders/{order_id}", data)
+        return self._do_request("PATCH", _format_endpoint(self._ENDPOINTS["update_order"], order_id), data)
 
     def authorize_order(self, order_id: str, data: Dict[str, Any]) -> ResponseData:
         """
@@ -290,7 +656,7 @@ class PayPalClient:
         Returns:
             ResponseData: 授权结果
         """
-        return self._do_request("POST", f"/v2/checkout/orders/{order_id}/authorize", data)
+        return self._do_request("POST", _format_endpoint(self._ENDPOINTS["authorize_order"], order_id), data)
 
     def capture_order(self, order_id: str, data: Optional[Dict[str, Any]] = None) -> ResponseData:
         """
@@ -303,7 +669,7 @@ class PayPalClient:
         Returns:
             ResponseData: 捕获结果
         """
-        return self._do_request("POST", f"/v2/checkout/orders/{order_id}/capture", data)
+        return self._do_request("POST", _format_endpoint(self._ENDPOINTS["capture_order"], order_id), data)
 
     # ==================== 订阅相关 API ====================
 
@@ -317,7 +683,7 @@ class PayPalClient:
         Returns:
             ResponseData: 订阅创建结果
         """
-        return self._do_request("POST", "/v1/billing/subscriptions", subscription_data)
+        return self._do_request("POST", self._ENDPOINTS["create_subscription"], subscription_data)
 
     def get_subscription(self, subscription_id: str) -> ResponseData:
         """
@@ -329,7 +695,7 @@ class PayPalClient:
         Returns:
             ResponseData: 订阅详情
         """
-        return self._do_request("GET", f"/v1/billing/subscriptions/{subscription_id}")
+        return self._do_request("GET", _format_endpoint(self._ENDPOINTS["get_subscription"], subscription_id))
 
     def update_subscription(
         self,
@@ -346,7 +712,7 @@ class PayPalClient:
         Returns:
             ResponseData: 更新结果
         """
-        return self._do_request("PATCH", f"/v1/billing/subscriptions/{subscription_id}", data)
+        return self._do_request("PATCH", _format_endpoint(self._ENDPOINTS["update_subscription"], subscription_id), data)
 
     def cancel_subscription(
         self,
@@ -363,7 +729,7 @@ class PayPalClient:
         Returns:
             ResponseData: 取消结果
         """
-        return self._do_request("POST", f"/v1/billing/subscriptions/{subscription_id}/cancel", {
+        return self._do_request("POST", _format_endpoint(self._ENDPOINTS["cancel_subscription"], subscription_id), {
             "reason": reason
         })
 
@@ -380,7 +746,7 @@ class PayPalClient:
         Returns:
             ResponseData: 激活结果
         """
-        return self._do_request("POST", f"/v1/billing/subscriptions/{subscription_id}/activate")
+        return self._do_request("POST", _format_endpoint(self._ENDPOINTS["activate_subscription"], subscription_id))
 
     def suspend_subscription(
         self,
@@ -397,7 +763,7 @@ class PayPalClient:
         Returns:
             ResponseData: 暂停结果
         """
-        return self._do_request("POST", f"/v1/billing/subscriptions/{subscription_id}/suspend", {
+        return self._do_request("POST", _format_endpoint(self._ENDPOINTS["suspend_subscription"], subscription_id), {
             "reason": reason
         })
 
@@ -416,7 +782,7 @@ class PayPalClient:
         Returns:
             ResponseData: 捕获结果
         """
-        return self._do_request("POST", f"/v1/billing/subscriptions/{subscription_id}/capture", data)
+        return self._do_request("POST", _format_endpoint(self._ENDPOINTS["capture_subscription_payment"], subscription_id), data)
 
     def revise_subscription(
         self,
@@ -433,7 +799,7 @@ class PayPalClient:
         Returns:
             ResponseData: 修订结果
         """
-        return self._do_request("POST", f"/v1/billing/subscriptions/{subscription_id}/revise", data)
+        return self._do_request("POST", _format_endpoint(self._ENDPOINTS["revise_subscription"], subscription_id), data)
 
     # ==================== 计划相关 API ====================
 
@@ -447,7 +813,7 @@ class PayPalClient:
         Returns:
             ResponseData: 计划创建结果
         """
-        return self._do_request("POST", "/v1/billing/plans", plan_data)
+        return self._do_request("POST", self._ENDPOINTS["create_plan"], plan_data)
 
     def get_plan(self, plan_id: str) -> ResponseData:
         """
@@ -459,7 +825,7 @@ class PayPalClient:
         Returns:
             ResponseData: 计划详情
         """
-        return self._do_request("GET", f"/v1/billing/plans/{plan_id}")
+        return self._do_request("GET", _format_endpoint(self._ENDPOINTS["get_plan"], plan_id))
 
     def list_plans(self, params: Optional[Dict[str, Any]] = None) -> ResponseData:
         """
@@ -471,7 +837,7 @@ class PayPalClient:
         Returns:
             ResponseData: 计划列表
         """
-        return self._do_request("GET", "/v1/billing/plans", params=params)
+        return self._do_request("GET", self._ENDPOINTS["list_plans"], params=params)
 
     def update_plan(
         self,
@@ -488,7 +854,7 @@ class PayPalClient:
         Returns:
             ResponseData: 更新结果
         """
-        return self._do_request("PATCH", f"/v1/billing/plans/{plan_id}", data)
+        return self._do_request("PATCH", _format_endpoint(self._ENDPOINTS["update_plan"], plan_id), data)
 
     def activate_plan(self, plan_id: str) -> ResponseData:
         """
@@ -500,7 +866,7 @@ class PayPalClient:
         Returns:
             ResponseData: 激活结果
         """
-        return self._do_request("POST", f"/v1/billing/plans/{plan_id}/activate")
+        return self._do_request("POST", _format_endpoint(self._ENDPOINTS["activate_plan"], plan_id))
 
     def deactivate_plan(self, plan_id: str) -> ResponseData:
         """
@@ -512,21 +878,26 @@ class PayPalClient:
         Returns:
             ResponseData: 停用结果
         """
-        return self._do_request("POST", f"/v1/billing/plans/{plan_id}/deactivate")
+        return self._do_request("POST", _format_endpoint(self._ENDPOINTS["deactivate_plan"], plan_id))
 
     # ==================== 退款相关 API ====================
 
-    def refund_payment(self, data: Dict[str, Any]) -> ResponseData:
+    def refund_payment(
+        self,
+        sale_id: str,
+        data: Optional[Dict[str, Any]] = None
+    ) -> ResponseData:
         """
         退款
 
         Args:
-            data: 退款数据
+            sale_id: 交易(sale)ID
+            data: 退款数据, 不传则全额退款
 
         Returns:
             ResponseData: 退款结果
         """
-        return self._do_request("POST", "/v1/payments/sale/{sale_id}/refund", data)
+        return self._do_request("POST", _format_endpoint(self._ENDPOINTS["refund_payment"], sale_id), data)
 
     def get_refund(self, refund_id: str) -> ResponseData:
         """
@@ -538,7 +909,7 @@ class PayPalClient:
         Returns:
             ResponseData: 退款详情
         """
-        return self._do_request("GET", f"/v1/payments/refund/{refund_id}")
+        return self._do_request("GET", _format_endpoint(self._ENDPOINTS["get_refund"], refund_id))
 
     def list_refunds(self, params: Optional[Dict[str, Any]] = None) -> ResponseData:
         """
@@ -550,4 +921,4 @@ class PayPalClient:
         Returns:
             ResponseData: 退款列表
         """
-        return self._do_request("GET", "/v1/payments/refund", params=params)
+        return self._do_request("GET", self._ENDPOINTS["list_refunds"], params=params)
@@ -0,0 +1,185 @@
+"""
+PayPal请求流水线
+将存在依赖关系的多个请求(如 创建订单 -> 授权 -> 捕获)组织为一批执行
+
+遵循单一职责原则 - 只负责请求的依赖编排, 实际请求交给PayPalClient
+"""
+
+import asyncio
+import logging
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union, TYPE_CHECKING
+
+from gopay.utils.datastructure import ResponseData
+
+if TYPE_CHECKING:  # pragma: no cover
+    from gopay.paypal.client import PayPalClient
+
+
+logger = logging.getLogger(__name__)
+
+
+# 请求体可以是固定数据, 也可以是根据前序步骤结果生成数据的函数
+PipelineData = Union[None, Dict[str, Any], List[Any], Callable[[Dict[str, Dict[str, Any]]], Any]]
+
+
+class _PipelineStep:
+    """流水线中的单个请求"""
+
+    __slots__ = ("name", "method", "endpoint", "data", "params", "depends_on")
+
+    def __init__(
+        self,
+        name: str,
+        method: str,
+        endpoint: str,
+        data: PipelineData,
+        params: Optional[Dict[str, Any]],
+        depends_on: Sequence[str],
+    ):
+        self.name = name
+        self.method = method
+        self.endpoint = endpoint
+        self.data = data
+        self.params = params
+        self.depends_on = tuple(depends_on)
+
+    def resolve(self, results: Dict[str, ResponseData]):
+        """
+        用前序步骤的响应数据填充端点模板和请求体
+
+        Returns:
+            tuple: (端点, 请求体)
+        """
+        context = {dep: results[dep].data for dep in self.depends_on}
+        endpoint = self.endpoint.format(**context) if context else self.endpoint
+        data = self.data(context) if callable(self.data) else self.data
+        return endpoint, data
+
+
+class PayPalPipeline:
+    """
+    PayPal请求流水线
+
+    每个步骤可声明依赖的前序步骤, 端点模板中以 {步骤名[字段]} 引用其响应数据, 例如:
+
+        pipeline = client.pipeline()
+        pipeline.add("order", "POST", "/v2/checkout/orders", order_data)
+        pipeline.add("capture", "POST", "/v2/checkout/orders/{order[id]}/capture",
+                     depends_on=["order"])
+        results = await pipeline.execute_async()
+
+    异步执行时, 依赖已满足的步骤在同一连接池上并发发出;
+    依赖的步骤失败时, 后续步骤不再请求, 直接返回错误
+    """
+
+    def __init__(self, client: "PayPalClient"):
+        """
+        初始化流水线
+
+        Args:
+            client: PayPal客户端
+        """
+        self.client = client
+        self._steps: Dict[str, _PipelineStep] = {}
+
+    def add(
+        self,
+        name: str,
+        method: str,
+        endpoint: str,
+        data: PipelineData = None,
+        params: Optional[Dict[str, Any]] = None,
+        depends_on: Sequence[str] = (),
+    ) -> "PayPalPipeline":
+        """
+        添加请求步骤
+
+        Args:
+            name: 步骤名称, 供后续步骤引用
+            method: HTTP方法
+            endpoint: API端点, 可包含 {步骤名[字段]} 模板
+            data: 请求体, 或接收依赖结果字典并返回请求体的函数
+            params: URL查询参数
+            depends_on: 依赖的步骤名称
+
+        Returns:
+            PayPalPipeline: 返回自身以支持链式调用
+        """
+        if name in self._steps:
+            raise ValueError(f"流水线步骤重复: {name}")
+        for dep in depends_on:
+            if dep not in self._steps:
+                raise ValueError(f"流水线步骤{name}依赖的步骤不存在: {dep}")
+        self._steps[name] = _PipelineStep(name, method, endpoint, data, params, depends_on)
+        return self
+
+    def _waves(self) -> List[List[_PipelineStep]]:
+        """按依赖关系分层, 同一层的步骤互不依赖"""
+        level: Dict[str, int] = {}
+        waves: List[List[_PipelineStep]] = []
+        # 依赖只能引用已添加的步骤, 按添加顺序即为拓扑序
+        for step in self._steps.values():
+            step_level = max((level[dep] + 1 for dep in step.depends_on), default=0)
+            level[step.name] = step_level
+            if step_level == len(waves):
+                waves.append([])
+            waves[step_level].append(step)
+        return waves
+
+    @staticmethod
+    def _failed_dependency(step: _PipelineStep, results: Dict[str, ResponseData]) -> Optional[str]:
+        for dep in step.depends_on:
+            if not results[dep].success:
+                return dep
+        return None
+
+    def execute(self) -> Dict[str, ResponseData]:
+        """
+        按依赖顺序同步执行
+
+        Returns:
+            Dict[str, ResponseData]: 步骤名 -> 响应
+        """
+        results: Dict[str, ResponseData] = {}
+        for step in self._steps.values():
+            results[step.name] = self._run_sync(step, results)
+        return results
+
+    async def execute_async(self) -> Dict[str, ResponseData]:
+        """
+        按依赖分层异步执行, 同一层的步骤并发请求
+
+        Returns:
+            Dict[str, ResponseData]: 步骤名 -> 响应
+        """
+        results: Dict[str, ResponseData] = {}
+        for wave in self._waves():
+            responses = await asyncio.gather(*(self._run_async(step, results) for step in wave))
+            for step, response in zip(wave, responses):
+                results[step.name] = response
+        # 按步骤添加顺序返回
+        return {name: results[name] for name in self._steps}
+
+    def _skip(self, step: _PipelineStep, failed: str) -> ResponseData:
+        logger.warning("PayPal流水线步骤%s跳过, 依赖的步骤%s失败", step.name, failed)
+        return ResponseData.error_response(error=f"依赖的步骤失败: {failed}", code="-1")
+
+    def _run_sync(self, step: _PipelineStep, results: Dict[str, ResponseData]) -> ResponseData:
+        failed = self._failed_dependency(step, results)
+        if failed is not None:
+            return self._skip(step, failed)
+        try:
+            endpoint, data = step.resolve(results)
+        except (KeyError, IndexError, TypeError) as e:
+            return ResponseData.error_response(error=f"流水线步骤{step.name}参数解析失败: {e}", code="-1")
+        return self.client.request(step.method, endpoint, data, step.params)
+
+    async def _run_async(self, step: _PipelineStep, results: Dict[str, ResponseData]) -> ResponseData:
+        failed = self._failed_dependency(step, results)
+        if failed is not None:
+            return self._skip(step, failed)
+        try:
+            endpoint, data = step.resolve(results)
+        except (KeyError, IndexError, TypeError) as e:
+            return ResponseData.error_response(error=f"流水线步骤{step.name}参数解析失败: {e}", code="-1")
+        return await self.client.request_async(step.method, endpoint, data, step.params)
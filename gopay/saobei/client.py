@@ -4,6 +4,7 @@
 """
 
 import logging
+from types import MappingProxyType
 from typing import Optional, Dict, Any
 
 from gopay.config import PaymentConfig
@@ -57,6 +58,9 @@ class SaobeiConfig(PaymentConfig):
 class SaobeiClient:
     """扫呗支付客户端"""
 
+    # JSON请求头, 所有请求共用(不可修改)
+    _JSON_HEADERS = {"Content-Type": "application/json"}
+
     def __init__(self, config: SaobeiConfig):
         """
         初始化扫呗客户端
@@ -66,23 +70,31 @@ class SaobeiClient:
         """
         self.config = config
         self.config.validate()
+        # 长连接复用: 同配置的客户端共享连接池, 后续请求免去TCP+TLS握手
         self.http_client = HttpClient(
             timeout=config.timeout,
             max_retries=3,
-            retry_interval=1
+            retry_interval=0.2,
+            pool_connections=10,
+            pool_maxsize=50,
         )
+        # 公共参数在客户端生命周期内不变, 只构建一次
+        self._common_params = MappingProxyType({
+            "merchant_id": config.merchant_id,
+            "terminal_id": config.terminal_id,
+        })
 
-    def _build_common_params(self) -> Dict[str, Any]:
+    def _build_request_params(self, params: BodyMap) -> Dict[str, Any]:
         """
-        构建公共参数
+        合并公共参数与业务参数
+
+        Args:
+            params: 业务参数
 
         Returns:
-            Dict: 公共参数
+            Dict: 请求参数
         """
-        return {
-            "merchant_id": self.config.merchant_id,
-            "terminal_id": self.config.terminal_id,
-        }
+        return {**self._common_params, **params}
 
     def _do_request(
         self,
@@ -102,7 +114,8 @@ class SaobeiClient:
         url = f"{self.config.gateway_url}{endpoint}"
 
         # 添加签名
-        signed_params = sign_params(
+        signed_params = dict(params)
+        signed_params["sign"] = sign_params(
             params=params,
             sign_type="MD5",
             key=self.config.key
@@ -112,17 +125,19 @@ class SaobeiClient:
             response = self.http_client.post(
                 url=url,
                 json=signed_params,
-                headers={"Content-Type": "application/json"}
+                headers=self._JSON_HEADERS
             )
+            result = response.json()
 
             return ResponseData(
-                code=str(response.get("code", "0")),
-                msg=response.get("msg", response.get("message", "Success")),
-                data=response
+                code=str(result.get("code", "0")),
+                msg=result.get("msg", result.get("message", "Success")),
+                data=result,
+                raw_response=response.text,
             )
 
         except Exception as e:
-            logger.error(f"扫呗请求失败: {str(e)}")
+            logger.error("扫呗请求失败: %s", e)
             return ResponseData(
                 code="-1",
                 msg=str(e),
@@ -145,12 +160,7 @@ class SaobeiClient:
         Returns:
             ResponseData: 支付结果
         """
-        params_dict = params.to_dict()
-        request_params = self._build_common_params()
-        request_params.update(params_dict)
-
-        url = "/api/miniPay"
-        return self._do_request(url, request_params)
+        return self._do_request("/api/miniPay", self._build_request_params(params))
 
     def barcode_pay(self, params: BodyMap) -> ResponseData:
         """
@@ -167,12 +177,7 @@ class SaobeiClient:
         Returns:
             ResponseData: 支付结果
         """
-        params_dict = params.to_dict()
-        request_params = self._build_common_params()
-        request_params.update(params_dict)
-
-        url = "/api/barcodePay"
-        return self._do_request(url, request_params)
+        return self._do_request("/api/barcodePay", self._build_request_params(params))
 
     def query(self, params: BodyMap) -> ResponseData:
         """
@@ -185,12 +190,7 @@ class SaobeiClient:
         Returns:
             ResponseData: 查询结果
         """
-        params_dict = params.to_dict()
-        request_params = self._build_common_params()
-        request_params.update(params_dict)
-
-        url = "/api/query"
-        return self._do_request(url, request_params)
+        return self._do_request("/api/query", self._build_request_params(params))
 
     def refund(self, params: BodyMap) -> ResponseData:
         """
@@ -207,12 +207,7 @@ class SaobeiClient:
         Returns:
             ResponseData: 退款结果
         """
-        params_dict = params.to_dict()
-        request_params = self._build_common_params()
-        request_params.update(params_dict)
-
-        url = "/api/refund"
-        return self._do_request(url, request_params)
+        return self._do_request("/api/refund", self._build_request_params(params))
 
     def query_refund(self, params: BodyMap) -> ResponseData:
         """
@@ -225,12 +220,7 @@ class SaobeiClient:
         Returns:
             ResponseData: 查询结果
         """
-        params_dict = params.to_dict()
-        request_params = self._build_common_params()
-        request_params.update(params_dict)
-
-        url = "/api/refundQuery"
-        return self._do_request(url, request_params)
+        return self._do_request("/api/refundQuery", self._build_request_params(params))
 
     def close_order(self, params: BodyMap) -> ResponseData:
         """
@@ -244,12 +234,7 @@ class SaobeiClient:
         Returns:
             ResponseData: 关闭结果
         """
-        params_dict = params.to_dict()
-        request_params = self._build_common_params()
-        request_params.update(params_dict)
-
-        url = "/api/closeOrder"
-        return self._do_request(url, request_params)
+        return self._do_request("/api/closeOrder", self._build_request_params(params))
 
     def cancel_order(self, params: BodyMap) -> ResponseData:
         """
@@ -263,12 +248,7 @@ class SaobeiClient:
         Returns:
             ResponseData: 撤销结果
         """
-        params_dict = params.to_dict()
-        request_params = self._build_common_params()
-        request_params.update(params_dict)
-
-        url = "/api/cancelOrder"
-        return self._do_request(url, request_params)
+        return self._do_request("/api/cancelOrder", self._build_request_params(params))
 
     def get_pay_qrcode(self, params: BodyMap) -> ResponseData:
         """
@@ -285,9 +265,4 @@ class SaobeiClient:
         Returns:
             ResponseData: 二维码数据
         """
-        params_dict = params.to_dict()
-        request_params = self._build_common_params()
-        request_params.update(params_dict)
-
-        url = "/api/getPayQrcode"
-        return self._do_request(url, request_params)
+        return self._do_request("/api/getPayQrcode", self._build_request_params(params))
@@ -9,7 +9,10 @@ from gopay.utils.signer import (
     HMACSHA256Signer,
     RSASigner,
     SignerFactory,
+    build_sign_content,
+    compare_signature,
     sign_params,
+    sign_params_many,
     verify_params,
     generate_sign,
     verify_sign,
@@ -24,7 +27,10 @@ __all__ = [
     "HMACSHA256Signer",
     "RSASigner",
     "SignerFactory",
+    "build_sign_content",
+    "compare_signature",
     "sign_params",
+    "sign_params_many",
     "verify_params",
     "generate_sign",
     "verify_sign",
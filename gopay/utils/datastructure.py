@@ -5,8 +5,41 @@
 
 from typing import Any, Dict, Optional, Union, List
 from urllib.parse import urlencode
-from collections import OrderedDict
 import json
+import re
+import threading
+import xml.etree.ElementTree as ET
+
+try:
+    from lxml import etree as _lxml_etree
+except ImportError:  # pragma: no cover - 可选依赖
+    _lxml_etree = None
+
+from gopay.utils import json_codec
+
+
+# 签名时忽略的空值
+_EMPTY_VALUES = (None, "")
+
+# 未显式指定success时视为成功的响应码
+_SUCCESS_CODES = ("0", "00", "SUCCESS")
+
+# 查找需要用CDATA包裹的字符, 正则在C层扫描, 比逐字符的集合判断快
+_needs_cdata = re.compile(r"[<>&']").search
+
+_lxml_local = threading.local()
+
+
+def _lxml_parser():
+    """
+    获取当前线程的lxml解析器
+    lxml解析器非线程安全, 每个线程复用各自的解析器; 禁用实体解析和网络访问
+    """
+    parser = getattr(_lxml_local, "parser", None)
+    if parser is None:
+        parser = _lxml_etree.XMLParser(resolve_entities=False, no_network=True, huge_tree=False)
+        _lxml_local.parser = parser
+    return parser
 
 
 class BodyMap(dict):
@@ -14,12 +47,13 @@ class BodyMap(dict):
     请求体映射类
     遵循开闭原则 - 提供链式调用和灵活的参数构建
     类似Go版本中的BodyMap
+    参数直接存放在dict中(dict本身保持插入顺序)
+    构造、set()和update()写入参数时均跳过None和空字符串
     """
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        # 使用OrderedDict保持参数顺序
-        self._ordered_data = OrderedDict()
+    def __init__(self, other: Union[Dict[str, Any], "BodyMap"] = (), **kwargs):
+        super().__init__()
+        self.update(other, **kwargs)
 
     def set(self, key: str, value: Any) -> "BodyMap":
         """
@@ -27,98 +61,78 @@ class BodyMap(dict):
         支持链式调用
         """
         if value is not None and value != "":
-            self._ordered_data[key] = value
             self[key] = value
         return self
 
-    def get(self, key: str, default: Any = None) -> Any:
-        """获取参数值"""
-        return self._ordered_data.get(key, default)
-
     def remove(self, key: str) -> "BodyMap":
         """移除参数"""
-        if key in self._ordered_data:
-            del self._ordered_data[key]
-            if key in self:
-                del self[key]
+        self.pop(key, None)
         return self
 
-    def contains(self, key: str) -> bool:
-        """检查是否包含某个参数"""
-        return key in self._ordered_data
+    # 检查是否包含某个参数, 直接复用dict的C实现, 省去一层Python函数调用
+    contains = dict.__contains__
 
     def clear(self) -> "BodyMap":
         """清空所有参数"""
-        self._ordered_data.clear()
         super().clear()
         return self
 
     def to_dict(self) -> Dict[str, Any]:
         """转换为普通字典"""
-        return dict(self._ordered_data)
+        return dict(self)
 
     def to_json(self) -> str:
-        """转换为JSON字符串"""
-        return json.dumps(self._ordered_data, ensure_ascii=False)
+        """转换为JSON字符串, 已安装orjson时优先使用orjson"""
+        if json_codec.HAS_ORJSON:
+            return json_codec.dumps(self).decode("utf-8")
+        return json.dumps(self, ensure_ascii=False)
 
     def to_url_params(self) -> str:
         """转换为URL参数字符串"""
-        return urlencode(self._ordered_data, doseq=True)
+        return urlencode(self, doseq=True)
 
-    def encode_wechat_sign_params(self) -> str:
+    def _encode_sorted_kv(self) -> str:
         """
-        编码微信签名参数
+        编码签名参数
         按照key的字母顺序排序,并拼接成字符串
         格式: key1=value1&key2=value2
         """
-        sorted_params = sorted(self._ordered_data.items())
-        return "&".join([f"{k}={v}" for k, v in sorted_params if v not in [None, ""]])
+        # 只对key排序(字符串比较, 无需构造元组), 再按key取值并过滤空值
+        return "&".join([f"{k}={self[k]}" for k in sorted(self) if self[k] not in _EMPTY_VALUES])
 
-    def encode_alipay_sign_params(self) -> str:
-        """
-        编码支付宝签名参数
-        按照key的字母顺序排序,并拼接成字符串
-        """
-        sorted_params = sorted(self._ordered_data.items())
-        return "&".join([f"{k}={v}" for k, v in sorted_params if v not in [None, ""]])
+    # 微信与支付宝的待签名串规则相同
+    encode_wechat_sign_params = _encode_sorted_kv
+    encode_alipay_sign_params = _encode_sorted_kv
 
     def filter_none(self) -> "BodyMap":
         """过滤值为None的参数"""
-        filtered = {k: v for k, v in self._ordered_data.items() if v is not None and v != ""}
-        self._ordered_data = OrderedDict(filtered)
-        super().clear()
-        super().update(filtered)
+        empty_keys = [k for k, v in self.items() if v in _EMPTY_VALUES]
+        # 构造、set()和update()已过滤空值, 只有直接赋值(body[key] = value)写入的空值需要删除
+        if not empty_keys:
+            return self
+        for key in empty_keys:
+            del self[key]
         return self
 
-    def update(self, other: Union[Dict[str, Any], "BodyMap"]) -> "BodyMap":
-        """更新参数"""
-        if isinstance(other, BodyMap):
-            self._ordered_data.update(other._ordered_data)
-        else:
-            self._ordered_data.update(other)
-        super().update(self._ordered_data)
+    def update(self, other: Union[Dict[str, Any], "BodyMap"] = (), **kwargs) -> "BodyMap":  # type: ignore[override]
+        """
+        更新参数
+        与set()一致, 跳过None和空字符串, 只写入other中的键
+        """
+        items = other.items() if hasattr(other, "items") else other
+        for key, value in items:
+            if value not in _EMPTY_VALUES:
+                self[key] = value
+        for key, value in kwargs.items():
+            if value not in _EMPTY_VALUES:
+                self[key] = value
         return self
 
-    def keys(self):
-        """返回所有键"""
-        return self._ordered_data.keys()
-
-    def values(self):
-        """返回所有值"""
-        return self._ordered_data.values()
-
-    def items(self):
-        """返回所有键值对"""
-        return self._ordered_data.items()
-
-    def __len__(self) -> int:
-        return len(self._ordered_data)
-
     def __repr__(self) -> str:
-        return f"BodyMap({dict(self._ordered_data)})"
+        return f"BodyMap({dict.__repr__(self)})"
 
     def __str__(self) -> str:
-        return json.dumps(self._ordered_data, ensure_ascii=False, indent=2)
+        return json.dumps(self, ensure_ascii=False, indent=2)
 
 
 class XmlMap(dict):
@@ -130,7 +144,8 @@ class XmlMap(dict):
     def __init__(self, root_name: str = "xml", *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.root_name = root_name
-        self._data = OrderedDict()
+        # dict自Python 3.7起保持插入顺序, 无需OrderedDict
+        self._data: Dict[str, Any] = {}
 
     def set(self, key: str, value: Any) -> "XmlMap":
         """设置XML节点值"""
@@ -141,29 +156,37 @@ class XmlMap(dict):
 
     def to_xml(self) -> str:
         """转换为XML字符串"""
-        xml_parts = [f"<{self.root_name}>"]
-        for key, value in self._data.items():
+        body = "".join(
             # CDATA包裹特殊字符
-            if isinstance(value, str) and any(c in value for c in ["<", ">", "&", "'"]):
-                xml_parts.append(f"<{key}><![CDATA[{value}]]></{key}>")
-            else:
-                xml_parts.append(f"<{key}>{value}</{key}>")
-        xml_parts.append(f"</{self.root_name}>")
-        return "".join(xml_parts)
+            f"<{key}><![CDATA[{value}]]></{key}>"
+            if isinstance(value, str) and _needs_cdata(value)
+            else f"<{key}>{value}</{key}>"
+            for key, value in self._data.items()
+        )
+        return f"<{self.root_name}>{body}</{self.root_name}>"
 
     @classmethod
-    def from_xml(cls, xml_str: str, root_name: str = "xml") -> "XmlMap":
-        """从XML字符串解析"""
+    def from_xml(cls, xml_str: Union[str, bytes], root_name: str = "xml") -> "XmlMap":
+        """从XML字符串解析, 已安装lxml时优先使用lxml"""
         try:
-            import xml.etree.ElementTree as ET
-
-            root = ET.fromstring(xml_str)
-            xml_map = cls(root_name=root_name)
-            for child in root:
-                xml_map.set(child.tag, child.text)
-            return xml_map
+            if _lxml_etree is not None:
+                if isinstance(xml_str, str):
+                    xml_str = xml_str.encode("utf-8")
+                root = _lxml_etree.fromstring(xml_str, _lxml_parser())
+            else:
+                root = ET.fromstring(xml_str)
         except Exception as e:
             raise ValueError(f"XML解析失败: {e}")
+        # 与逐个set()一致: 跳过注释等非元素节点和空值
+        fields = {
+            child.tag: child.text
+            for child in root
+            if isinstance(child.tag, str) and child.text not in _EMPTY_VALUES
+        }
+        xml_map = cls(root_name=root_name)
+        xml_map._data.update(fields)
+        dict.update(xml_map, fields)
+        return xml_map
 
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
@@ -174,22 +197,42 @@ class ResponseData:
     """
     响应数据类
     统一封装各种支付渠道的响应
+    每次API调用都会创建, 使用__slots__省去实例__dict__
     """
 
+    __slots__ = ("success", "data", "error", "code", "raw_response")
+
     def __init__(
         self,
-        success: bool,
+        success: Optional[bool] = None,
         data: Optional[Dict[str, Any]] = None,
         error: Optional[str] = None,
         code: Optional[str] = None,
         raw_response: Optional[str] = None,
+        msg: Optional[str] = None,
     ):
+        """
+        Args:
+            success: 是否成功, 不传时根据code推断
+            data: 响应数据
+            error: 错误信息
+            code: 响应码
+            raw_response: 原始响应文本
+            msg: error的别名, 兼容按code/msg构造的写法
+        """
+        if success is None:
+            success = code in _SUCCESS_CODES
         self.success = success
         self.data = data or {}
-        self.error = error
+        self.error = error or msg
         self.code = code
         self.raw_response = raw_response
 
+    @property
+    def msg(self) -> Optional[str]:
+        """响应信息, 即error"""
+        return self.error
+
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
         return {
@@ -200,15 +243,30 @@ class ResponseData:
             "raw_response": self.raw_response,
         }
 
+    # 以下两个工厂方法在每次请求(含参数校验失败)时调用, 状态已知,
+    # 绕过__init__的关键字参数解析和success推断, 直接写入slots
+
     @classmethod
     def success_response(cls, data: Dict[str, Any], raw_response: Optional[str] = None) -> "ResponseData":
         """创建成功响应"""
-        return cls(success=True, data=data, raw_response=raw_response)
+        response = cls.__new__(cls)
+        response.success = True
+        response.data = data or {}
+        response.error = None
+        response.code = None
+        response.raw_response = raw_response
+        return response
 
     @classmethod
     def error_response(cls, error: str, code: Optional[str] = None, raw_response: Optional[str] = None) -> "ResponseData":
         """创建错误响应"""
-        return cls(success=False, error=error, code=code, raw_response=raw_response)
+        response = cls.__new__(cls)
+        response.success = False
+        response.data = {}
+        response.error = error
+        response.code = code
+        response.raw_response = raw_response
+        return response
 
     def __repr__(self) -> str:
         if self.success:
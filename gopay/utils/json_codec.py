@@ -0,0 +1,39 @@
+"""
+JSON编解码模块
+优先使用orjson(可选依赖),未安装时回退到标准库json
+"""
+
+from typing import Any, Union
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - 取决于运行环境
+    orjson = None
+
+
+HAS_ORJSON = orjson is not None
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    序列化为UTF-8编码的JSON字节串
+    :param obj: 待序列化对象
+    :return: JSON字节串
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: Union[str, bytes, bytearray, memoryview]) -> Any:
+    """
+    反序列化JSON
+    :param data: JSON字符串或字节串
+    :return: 反序列化结果
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
@@ -6,7 +6,8 @@
 import logging
 from typing import Optional, Dict, Any
 
-from gopay.utils.datastructure import BodyMap, XmlMap, ResponseData
+from gopay.utils.datastructure import BodyMap, XmlMap
+from gopay.wechat.endpoint import ApiRequest, wechat_api
 
 
 logger = logging.getLogger(__name__)
@@ -18,7 +19,25 @@ class WechatAdvancedMixin:
     包含刷卡支付、转账、分账等高级功能
     """
 
-    def micropay(self, params: BodyMap) -> ResponseData:
+    # 接口路径, WechatClient初始化时与网关地址拼接为完整URL(self._urls)
+    _PATHS = {
+        "micropay": "/pay/micropay",
+        "downloadbill": "/pay/downloadbill",
+        "downloadfundflow": "/pay/downloadfundflow",
+        "transfers": "/mmpaymkttransfers/promotion/transfers",
+        "gettransferinfo": "/mmpaymkttransfers/gettransferinfo",
+        "pay_bank": "/mmpaysptrans/pay_bank",
+        "query_bank": "/mmpaysptrans/query_bank",
+        "profitsharing": "/secapi/pay/profitsharing",
+        "profitsharingquery": "/pay/profitsharingquery",
+        "profitsharingaddreceiver": "/pay/profitsharingaddreceiver",
+        "profitsharingremovereceiver": "/pay/profitsharingremovereceiver",
+        "profitsharingfinish": "/secapi/pay/profitsharingfinish",
+        "batchquerycomment": "/billcommentsp/batchquerycomment",
+    }
+
+    @wechat_api(required=("body", "out_trade_no", "total_fee", "auth_code", "spbill_create_ip"))
+    def micropay(self, params: BodyMap) -> ApiRequest:
         """
         刷卡支付/付款码支付
         文档: https://pay.weixin.qq.com/wiki/doc/api/index.html
@@ -26,25 +45,15 @@ class WechatAdvancedMixin:
         :param params: 参数对象
         :return: 支付结果
         """
-        params_dict = params.to_dict()
-
-        # 必填参数检查
-        required_fields = ["body", "out_trade_no", "total_fee", "auth_code", "spbill_create_ip"]
-        for field in required_fields:
-            if field not in params_dict:
-                return ResponseData.error_response(
-                    error=f"缺少必填参数: {field}",
-                    code="MISSING_PARAMETER",
-                )
-
         # 构建请求参数
         request_params = self._build_common_params()
-        request_params.update(params_dict)
+        request_params.update(params)
 
-        url = f"{self.config.gateway_url}/pay/micropay"
-        return self._do_request(url, request_params)
+        url = self._urls["micropay"]
+        return url, request_params
 
-    def download_bill(self, bill_date: str, bill_type: str = "ALL", **kwargs) -> ResponseData:
+    @wechat_api
+    def download_bill(self, bill_date: str, bill_type: str = "ALL", **kwargs) -> ApiRequest:
         """
         下载交易账单
         文档: https://pay.weixin.qq.com/wiki/doc/api/index.html
@@ -61,10 +70,11 @@ class WechatAdvancedMixin:
         })
         params.update(kwargs)
 
-        url = f"{self.config.gateway_url}/pay/downloadbill"
-        return self._do_request(url, params)
+        url = self._urls["downloadbill"]
+        return url, params
 
-    def download_fund_flow(self, bill_date: str, account_type: str = "Basic", **kwargs) -> ResponseData:
+    @wechat_api
+    def download_fund_flow(self, bill_date: str, account_type: str = "Basic", **kwargs) -> ApiRequest:
         """
         下载资金账单
         文档: https://pay.weixin.qq.com/wiki/doc/api/index.html
@@ -81,10 +91,11 @@ class WechatAdvancedMixin:
         })
         params.update(kwargs)
 
-        url = f"{self.config.gateway_url}/pay/downloadfundflow"
-        return self._do_request(url, params)
+        url = self._urls["downloadfundflow"]
+        return url, params
 
-    def transfer(self, params: BodyMap) -> ResponseData:
+    @wechat_api(required=("partner_trade_no", "openid", "amount", "desc"))
+    def transfer(self, params: BodyMap) -> ApiRequest:
         """
         商家转账
         文档: https://pay.weixin.qq.com/wiki/doc/api/index.html
@@ -92,28 +103,17 @@ class WechatAdvancedMixin:
         :param params: 参数对象
         :return: 转账结果
         """
-        params_dict = params.to_dict()
-
-        # 必填参数检查
-        required_fields = ["partner_trade_no", "openid", "amount", "desc"]
-        for field in required_fields:
-            if field not in params_dict:
-                return ResponseData.error_response(
-                    error=f"缺少必填参数: {field}",
-                    code="MISSING_PARAMETER",
-                )
-
-        params_dict["mchid"] = self.config.mch_id
-        params_dict["mch_appid"] = self.config.app_id
-
         # 构建请求参数
         request_params = self._build_common_params()
-        request_params.update(params_dict)
+        request_params.update(params)
+        request_params["mchid"] = self.config.mch_id
+        request_params["mch_appid"] = self.config.app_id
 
-        url = f"{self.config.gateway_url}/mmpaymkttransfers/promotion/transfers"
-        return self._do_request(url, request_params)
+        url = self._urls["transfers"]
+        return url, request_params
 
-    def get_transfer_info(self, partner_trade_no: str) -> ResponseData:
+    @wechat_api
+    def get_transfer_info(self, partner_trade_no: str) -> ApiRequest:
         """
         查询商家转账
         文档: https://pay.weixin.qq.com/wiki/doc/api/index.html
@@ -126,10 +126,11 @@ class WechatAdvancedMixin:
             "partner_trade_no": partner_trade_no,
         })
 
-        url = f"{self.config.gateway_url}/mmpaymkttransfers/gettransferinfo"
-        return self._do_request(url, params)
+        url = self._urls["gettransferinfo"]
+        return url, params
 
-    def pay_bank(self, params: BodyMap) -> ResponseData:
+    @wechat_api(required=("partner_trade_no", "enc_bank_no", "enc_true_name", "bank_code", "amount"))
+    def pay_bank(self, params: BodyMap) -> ApiRequest:
         """
         企业付款到银行卡
         文档: https://pay.weixin.qq.com/wiki/doc/api/index.html
@@ -137,27 +138,16 @@ class WechatAdvancedMixin:
         :param params: 参数对象
         :return: 付款结果
         """
-        params_dict = params.to_dict()
-
-        # 必填参数检查
-        required_fields = ["partner_trade_no", "enc_bank_no", "enc_true_name", "bank_code", "amount"]
-        for field in required_fields:
-            if field not in params_dict:
-                return ResponseData.error_response(
-                    error=f"缺少必填参数: {field}",
-                    code="MISSING_PARAMETER",
-                )
-
-        params_dict["mch_id"] = self.config.mch_id
-
         # 构建请求参数
         request_params = self._build_common_params()
-        request_params.update(params_dict)
+        request_params.update(params)
+        request_params["mch_id"] = self.config.mch_id
 
-        url = f"{self.config.gateway_url}/mmpaysptrans/pay_bank"
-        return self._do_request(url, request_params)
+        url = self._urls["pay_bank"]
+        return url, request_params
 
-    def query_bank(self, partner_trade_no: str) -> ResponseData:
+    @wechat_api
+    def query_bank(self, partner_trade_no: str) -> ApiRequest:
         """
         查询付款到银行卡
         文档: https://pay.weixin.qq.com/wiki/doc/api/index.html
@@ -170,10 +160,11 @@ class WechatAdvancedMixin:
             "partner_trade_no": partner_trade_no,
         })
 
-        url = f"{self.config.gateway_url}/mmpaysptrans/query_bank"
-        return self._do_request(url, params)
+        url = self._urls["query_bank"]
+        return url, params
 
-    def profit_sharing(self, params: BodyMap) -> ResponseData:
+    @wechat_api(required=("transaction_id", "out_order_no", "receivers"))
+    def profit_sharing(self, params: BodyMap) -> ApiRequest:
         """
         请求分账
         文档: https://pay.weixin.qq.com/wiki/doc/api/index.html
@@ -181,28 +172,17 @@ class WechatAdvancedMixin:
         :param params: 参数对象
         :return: 分账结果
         """
-        params_dict = params.to_dict()
-
-        # 必填参数检查
-        required_fields = ["transaction_id", "out_order_no", "receivers"]
-        for field in required_fields:
-            if field not in params_dict:
-                return ResponseData.error_response(
-                    error=f"缺少必填参数: {field}",
-                    code="MISSING_PARAMETER",
-                )
-
-        params_dict["mch_id"] = self.config.mch_id
-        params_dict["appid"] = self.config.app_id
-
         # 构建请求参数
         request_params = self._build_common_params()
-        request_params.update(params_dict)
+        request_params.update(params)
+        request_params["mch_id"] = self.config.mch_id
+        request_params["appid"] = self.config.app_id
 
-        url = f"{self.config.gateway_url}/secapi/pay/profitsharing"
-        return self._do_request(url, request_params)
+        url = self._urls["profitsharing"]
+        return url, request_params
 
-    def profit_sharing_query(self, transaction_id: str, out_order_no: str) -> ResponseData:
+    @wechat_api
+    def profit_sharing_query(self, transaction_id: str, out_order_no: str) -> ApiRequest:
         """
         查询分账
         文档: https://pay.weixin.qq.com/wiki/doc/api/index.html
@@ -217,10 +197,11 @@ class WechatAdvancedMixin:
             "out_order_no": out_order_no,
         })
 
-        url = f"{self.config.gateway_url}/pay/profitsharingquery"
-        return self._do_request(url, params)
+        url = self._urls["profitsharingquery"]
+        return url, params
 
-    def profit_sharing_add_receiver(self, params: BodyMap) -> ResponseData:
+    @wechat_api(required=("receiver",))
+    def profit_sharing_add_receiver(self, params: BodyMap) -> ApiRequest:
         """
         添加分账接收方
         文档: https://pay.weixin.qq.com/wiki/doc/api/index.html
@@ -228,26 +209,17 @@ class WechatAdvancedMixin:
         :param params: 参数对象
         :return: 添加结果
         """
-        params_dict = params.to_dict()
-
-        # 必填参数检查
-        if "receiver" not in params_dict:
-            return ResponseData.error_response(
-                error="缺少必填参数: receiver",
-                code="MISSING_PARAMETER",
-            )
-
-        params_dict["mch_id"] = self.config.mch_id
-        params_dict["appid"] = self.config.app_id
-
         # 构建请求参数
         request_params = self._build_common_params()
-        request_params.update(params_dict)
+        request_params.update(params)
+        request_params["mch_id"] = self.config.mch_id
+        request_params["appid"] = self.config.app_id
 
-        url = f"{self.config.gateway_url}/pay/profitsharingaddreceiver"
-        return self._do_request(url, request_params)
+        url = self._urls["profitsharingaddreceiver"]
+        return url, request_params
 
-    def profit_sharing_remove_receiver(self, params: BodyMap) -> ResponseData:
+    @wechat_api(required=("receiver",))
+    def profit_sharing_remove_receiver(self, params: BodyMap) -> ApiRequest:
         """
         删除分账接收方
         文档: https://pay.weixin.qq.com/wiki/doc/api/index.html
@@ -255,26 +227,17 @@ class WechatAdvancedMixin:
         :param params: 参数对象
         :return: 删除结果
         """
-        params_dict = params.to_dict()
-
-        # 必填参数检查
-        if "receiver" not in params_dict:
-            return ResponseData.error_response(
-                error="缺少必填参数: receiver",
-                code="MISSING_PARAMETER",
-            )
-
-        params_dict["mch_id"] = self.config.mch_id
-        params_dict["appid"] = self.config.app_id
-
         # 构建请求参数
         request_params = self._build_common_params()
-        request_params.update(params_dict)
+        request_params.update(params)
+        request_params["mch_id"] = self.config.mch_id
+        request_params["appid"] = self.config.app_id
 
-        url = f"{self.config.gateway_url}/pay/profitsharingremovereceiver"
-        return self._do_request(url, request_params)
+        url = self._urls["profitsharingremovereceiver"]
+        return url, request_params
 
-    def profit_sharing_finish(self, params: BodyMap) -> ResponseData:
+    @wechat_api(required=("transaction_id", "out_order_no", "description"))
+    def profit_sharing_finish(self, params: BodyMap) -> ApiRequest:
         """
         完结分账
         文档: https://pay.weixin.qq.com/wiki/doc/api/index.html
@@ -282,28 +245,17 @@ class WechatAdvancedMixin:
         :param params: 参数对象
         :return: 完结结果
         """
-        params_dict = params.to_dict()
-
-        # 必填参数检查
-        required_fields = ["transaction_id", "out_order_no", "description"]
-        for field in required_fields:
-            if field not in params_dict:
-                return ResponseData.error_response(
-                    error=f"缺少必填参数: {field}",
-                    code="MISSING_PARAMETER",
-                )
-
-        params_dict["mch_id"] = self.config.mch_id
-        params_dict["appid"] = self.config.app_id
-
         # 构建请求参数
         request_params = self._build_common_params()
-        request_params.update(params_dict)
+        request_params.update(params)
+        request_params["mch_id"] = self.config.mch_id
+        request_params["appid"] = self.config.app_id
 
-        url = f"{self.config.gateway_url}/secapi/pay/profitsharingfinish"
-        return self._do_request(url, request_params)
+        url = self._urls["profitsharingfinish"]
+        return url, request_params
 
-    def batch_query_comment(self, params: BodyMap) -> ResponseData:
+    @wechat_api(required=("begin_time", "end_time"))
+    def batch_query_comment(self, params: BodyMap) -> ApiRequest:
         """
         批量查询评价
         文档: https://pay.weixin.qq.com/wiki/doc/api/index.html
@@ -311,38 +263,10 @@ class WechatAdvancedMixin:
         :param params: 参数对象
         :return: 评价列表
         """
-        params_dict = params.to_dict()
-
-        # 必填参数检查
-        if "begin_time" not in params_dict or "end_time" not in params_dict:
-            return ResponseData.error_response(
-                error="缺少必填参数: begin_time 或 end_time",
-                code="MISSING_PARAMETER",
-            )
-
-        params_dict["mch_id"] = self.config.mch_id
-
         # 构建请求参数
         request_params = self._build_common_params()
-        request_params.update(params_dict)
-
-        url = f"{self.config.gateway_url}/billcommentsp/batchquerycomment"
-        return self._do_request(url, request_params)
-
-
-# 将 Mixin 的方法添加到 WechatClient 类
-def inject_advanced_methods():
-    """动态注入高级API方法到 WechatClient"""
-    from gopay.wechat.client import WechatClient
-
-    # 遍历 Mixin 的所有方法
-    for method_name in dir(WechatAdvancedMixin):
-        if not method_name.startswith("_"):
-            method = getattr(WechatAdvancedMixin, method_name)
-            if callable(method):
-                # 动态添加到 WechatClient
-                setattr(WechatClient, method_name, method)
-
+        request_params.update(params)
+        request_params["mch_id"] = self.config.mch_id
 
-# 自动注入
-inject_advanced_methods()
+        url = self._urls["batchquerycomment"]
+        return url, request_params
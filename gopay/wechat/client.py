@@ -3,30 +3,75 @@
 遵循单一职责原则 - 专门负责微信支付
 """
 
+import asyncio
 import logging
 import hashlib
 import random
 import string
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime
+from types import MappingProxyType
 
 from gopay.client import PaymentClient
 from gopay.config import WechatConfig
-from gopay.http import HttpClient
-from gopay.utils.datastructure import BodyMap, XmlMap, ResponseData
-from gopay.utils.signer import SignerFactory
+from gopay.wechat.advanced_api import WechatAdvancedMixin
+from gopay.wechat.coupon_api import WechatCouponMixin
+from gopay.wechat.invoice_api import WechatInvoiceMixin
+from gopay.wechat.oauth_api import WechatOAuthMixin
+from gopay.wechat.other_advanced_api import WechatOtherAdvancedMixin
+from gopay.wechat.endpoint import ResponseCache
+from gopay.http import HTTP2_AVAILABLE, HttpClient, AsyncHttpClient
+from gopay.utils.datastructure import BodyMap, XmlMap, ResponseData, _needs_cdata
+from gopay.utils.signer import SignerFactory, build_sign_content, compare_signature
 from gopay.exceptions import PaymentError, SignError
 
 
 logger = logging.getLogger(__name__)
 
+# 随机字符串字符集
+_NONCE_ALPHABET = string.ascii_letters + string.digits
 
-class WechatClient(PaymentClient):
+
+def _dict_to_wechat_xml(params: Dict[str, Any]) -> bytes:
+    """
+    将扁平参数直接拼接为微信XML请求体
+    输出与逐个XmlMap.set()再to_xml()一致: 跳过空值, 含特殊字符的值用CDATA包裹
+    """
+    body = "".join(
+        f"<{k}><![CDATA[{v}]]></{k}>"
+        if isinstance(v, str) and _needs_cdata(v)
+        else f"<{k}>{v}</{k}>"
+        for k, v in params.items()
+        if v is not None and v != ""
+    )
+    return f"<xml>{body}</xml>".encode("utf-8")
+
+
+class WechatClient(
+    WechatAdvancedMixin,
+    WechatCouponMixin,
+    WechatInvoiceMixin,
+    WechatOAuthMixin,
+    WechatOtherAdvancedMixin,
+    PaymentClient,
+):
     """
     微信支付客户端
     支持公众号支付、小程序支付、APP支付、H5支付等多种支付方式
+    扩展API由各Mixin提供: 刷卡支付、转账、分账(WechatAdvancedMixin), 代金券(WechatCouponMixin),
+    发票(WechatInvoiceMixin), 授权(WechatOAuthMixin), 合单支付、撤销等(WechatOtherAdvancedMixin)
+    WechatAdvancedMixin在前, download_fund_flow/batch_query_comment以其版本为准
     """
 
+    # 接口路径, 初始化时与网关地址拼接为完整URL(self._urls)
+    _PATHS = {
+        "unifiedorder": "/pay/unifiedorder",
+        "orderquery": "/pay/orderquery",
+        "closeorder": "/pay/closeorder",
+        "refund": "/secapi/pay/refund",
+        "refundquery": "/pay/refundquery",
+    }
+
     def __init__(self, config: WechatConfig):
         """
         初始化微信支付客户端
@@ -39,19 +84,43 @@ class WechatClient(PaymentClient):
         self.config: WechatConfig = config
 
         # 初始化HTTP客户端
+        # 所有接口(含各Mixin)都经_do_request发往同一网关主机, 连接池只需缓存少量主机,
+        # 但每个主机保留更多保活连接, 多线程并发调用时不必反复握手
         self.http_client = HttpClient(
             timeout=config.timeout,
             max_retries=config.http_max_retries,
             retry_interval=config.http_retry_interval,
             enable_log=config.enable_log,
+            pool_connections=10,
+            pool_maxsize=50,
         )
+        if config.http_prewarm:
+            self.http_client.prewarm(config.gateway_url)
+
+        # 各接口的完整URL只拼接一次, 合并继承链上所有类(含Mixin)声明的_PATHS
+        paths: Dict[str, str] = {}
+        for klass in reversed(type(self).__mro__):
+            paths.update(vars(klass).get("_PATHS", {}))
+        self._urls = {name: f"{config.gateway_url}{path}" for name, path in paths.items()}
+
+        # 公共参数中不随请求变化的部分只构建一次, 只读以免被调用方意外修改
+        self._common_params = MappingProxyType({
+            "appid": config.app_id,
+            "mch_id": config.mch_id,
+        })
+
+        # 只读接口(如查询汇率)的短期响应缓存, 见wechat_api的cache_ttl
+        self._response_cache = ResponseCache()
+
+        # 异步HTTP客户端按需创建(依赖httpx)
+        self._async_http_client: Optional[AsyncHttpClient] = None
 
         # 获取签名器
         self.signer = SignerFactory.get_signer(config.sign_type)
 
     def _generate_nonce_str(self) -> str:
         """生成随机字符串"""
-        return "".join(random.choice(string.ascii_letters + string.digits) for _ in range(32))
+        return "".join(random.choices(_NONCE_ALPHABET, k=32))
 
     def _sign_params(self, params: Dict[str, Any]) -> str:
         """
@@ -62,12 +131,7 @@ class WechatClient(PaymentClient):
         if not self.config.api_key:
             raise SignError("API密钥未配置", "WECHAT")
 
-        # 过滤空值和sign字段
-        filtered_params = {k: v for k, v in params.items() if v not in [None, ""] and k != "sign"}
-        # 按key排序
-        sorted_params = sorted(filtered_params.items())
-        # 拼接参数
-        param_str = "&".join([f"{k}={v}" for k, v in sorted_params])
+        param_str = build_sign_content(params)
 
         # 签名
         return self.signer.sign(param_str, self.config.api_key)
@@ -83,23 +147,75 @@ class WechatClient(PaymentClient):
             logger.warning("API密钥未配置,跳过验签")
             return True
 
-        # 过滤空值和sign字段
-        filtered_params = {k: v for k, v in params.items() if v not in [None, ""] and k != "sign"}
-        # 按key排序
-        sorted_params = sorted(filtered_params.items())
-        # 拼接参数
-        param_str = "&".join([f"{k}={v}" for k, v in sorted_params])
+        # 长度不符的签名无需计算即可判定失败
+        if not self.signer.has_valid_length(sign):
+            return False
+
+        param_str = build_sign_content(params)
 
         calculated_sign = self.signer.sign(param_str, self.config.api_key)
-        return calculated_sign == sign
+        return compare_signature(calculated_sign, sign)
 
     def _build_common_params(self) -> Dict[str, Any]:
         """构建公共参数"""
-        return {
-            "appid": self.config.app_id,
-            "mch_id": self.config.mch_id,
-            "nonce_str": self._generate_nonce_str(),
-        }
+        params = self._common_params.copy()
+        params["nonce_str"] = self._generate_nonce_str()
+        return params
+
+    def _build_request_body(self, params: Dict[str, Any]) -> bytes:
+        """
+        签名并构建XML请求体
+        :param params: 请求参数
+        :return: UTF-8编码的XML
+        """
+        params["sign"] = self._sign_params(params)
+        return _dict_to_wechat_xml(params)
+
+    def _parse_response(self, status_code: int, content: bytes) -> ResponseData:
+        """
+        解析XML响应并检查业务状态
+        :param status_code: HTTP状态码
+        :param content: 响应原始字节
+        :return: 响应数据
+        """
+        # 微信响应固定为UTF-8, 直接解码, 不经过requests按响应头/内容猜测编码;
+        # XML按字节解析, 由解析器处理编码声明
+        text = content.decode("utf-8", errors="replace")
+        if status_code != 200:
+            return ResponseData.error_response(
+                error=f"HTTP请求失败: {status_code}",
+                code=str(status_code),
+                raw_response=text,
+            )
+
+        # 解析XML响应
+        result_xml = XmlMap.from_xml(content)
+        result = result_xml.to_dict()
+
+        # 验签
+        if "sign" in result:
+            if not self._verify_response(result, result["sign"]):
+                logger.warning("响应验签失败")
+
+        # 检查业务状态
+        if result.get("return_code") != "SUCCESS":
+            return ResponseData.error_response(
+                error=result.get("return_msg", "请求失败"),
+                code=result.get("return_code"),
+                raw_response=text,
+            )
+
+        if result.get("result_code") != "SUCCESS":
+            return ResponseData.error_response(
+                error=result.get("err_code_des", "交易失败"),
+                code=result.get("err_code"),
+                raw_response=text,
+            )
+
+        return ResponseData.success_response(
+            data=result,
+            raw_response=text,
+        )
 
     def _do_request(self, url: str, params: Dict[str, Any]) -> ResponseData:
         """
@@ -108,69 +224,68 @@ class WechatClient(PaymentClient):
         :param params: 请求参数
         :return: 响应数据
         """
-        # 签名
-        params["sign"] = self._sign_params(params)
-
-        # 构建XML
-        xml_data = XmlMap()
-        for k, v in params.items():
-            xml_data.set(k, v)
-        xml_str = xml_data.to_xml()
-
-        # 发送请求
         try:
             response = self.http_client.post(
                 url,
-                data=xml_str.encode("utf-8"),
+                data=self._build_request_body(params),
                 headers={"Content-Type": "application/xml"},
             )
+            return self._parse_response(response.status_code, response.content)
 
-            if response.status_code != 200:
-                return ResponseData.error_response(
-                    error=f"HTTP请求失败: {response.status_code}",
-                    code=str(response.status_code),
-                    raw_response=response.text,
-                )
-
-            # 解析XML响应
-            result_xml = XmlMap.from_xml(response.text)
-            result = result_xml.to_dict()
-
-            # 验签
-            if "sign" in result:
-                if not self._verify_response(result, result["sign"]):
-                    logger.warning("响应验签失败")
-
-            # 检查业务状态
-            if result.get("return_code") != "SUCCESS":
-                return ResponseData.error_response(
-                    error=result.get("return_msg", "请求失败"),
-                    code=result.get("return_code"),
-                    raw_response=response.text,
-                )
-
-            if result.get("result_code") != "SUCCESS":
-                return ResponseData.error_response(
-                    error=result.get("err_code_des", "交易失败"),
-                    code=result.get("err_code"),
-                    raw_response=response.text,
-                )
-
-            return ResponseData.success_response(
-                data=result,
-                raw_response=response.text,
+        except Exception as e:
+            logger.error("请求失败: %s", e)
+            return ResponseData.error_response(
+                error=str(e),
+                raw_response=None,
             )
 
+    def close(self):
+        """关闭同步HTTP客户端(共享连接池由进程内客户端复用, 不会被关闭)"""
+        self.http_client.close()
+
+    # ==================== 异步请求 ====================
+
+    def _get_async_http_client(self) -> AsyncHttpClient:
+        """
+        获取异步HTTP客户端,首次调用时创建
+        :return: 异步HTTP客户端
+        """
+        if self._async_http_client is None:
+            # 微信支付网关支持HTTP/2, 已安装h2时并发请求共用一条连接
+            self._async_http_client = AsyncHttpClient(
+                timeout=self.config.timeout,
+                max_retries=self.config.http_max_retries,
+                enable_log=self.config.enable_log,
+                http2=HTTP2_AVAILABLE,
+            )
+        return self._async_http_client
+
+    async def _do_request_async(self, url: str, params: Dict[str, Any]) -> ResponseData:
+        """执行异步API请求, 参数同_do_request"""
+        try:
+            response = await self._get_async_http_client().post(
+                url,
+                data=self._build_request_body(params),
+                headers={"Content-Type": "application/xml"},
+            )
+            return self._parse_response(response.status_code, response.content)
+
         except Exception as e:
-            logger.error(f"请求失败: {e}")
+            logger.error("请求失败: %s", e)
             return ResponseData.error_response(
                 error=str(e),
                 raw_response=None,
             )
 
-    # ==================== 支付接口 ====================
+    async def aclose(self):
+        """关闭异步HTTP客户端"""
+        if self._async_http_client is not None:
+            await self._async_http_client.close()
+            self._async_http_client = None
 
-    def unified_order(
+    # ==================== 请求参数构建 ====================
+
+    def _unified_order_request(
         self,
         body: str,
         out_trade_no: str,
@@ -178,19 +293,8 @@ class WechatClient(PaymentClient):
         spbill_create_ip: str,
         trade_type: str,
         **kwargs
-    ) -> ResponseData:
-        """
-        统一下单接口
-        文档: https://pay.weixin.qq.com/wiki/doc/api/index.html
-
-        :param body: 商品描述
-        :param out_trade_no: 商户订单号
-        :param total_fee: 总金额(分)
-        :param spbill_create_ip: 终端IP
-        :param trade_type: 交易类型(JSAPI,NATIVE,APP等)
-        :param kwargs: 其他参数
-        :return: 下单结果
-        """
+    ) -> Tuple[str, Dict[str, Any]]:
+        """构建统一下单请求, 返回(URL, 参数)"""
         params = self._build_common_params()
         params.update({
             "body": body,
@@ -206,18 +310,14 @@ class WechatClient(PaymentClient):
         # 添加可选参数
         params.update(kwargs)
 
-        url = f"{self.config.gateway_url}/pay/unifiedorder"
-        return self._do_request(url, params)
-
-    def order_query(self, out_trade_no: Optional[str] = None, transaction_id: Optional[str] = None) -> ResponseData:
-        """
-        查询订单接口
-        文档: https://pay.weixin.qq.com/wiki/doc/api/index.html
+        return self._urls["unifiedorder"], params
 
-        :param out_trade_no: 商户订单号
-        :param transaction_id: 微信订单号
-        :return: 查询结果
-        """
+    def _order_query_request(
+        self,
+        out_trade_no: Optional[str] = None,
+        transaction_id: Optional[str] = None
+    ) -> Tuple[str, Dict[str, Any]]:
+        """构建查询订单请求, 返回(URL, 参数)"""
         if not out_trade_no and not transaction_id:
             raise PaymentError("out_trade_no和transaction_id至少需要传一个")
 
@@ -227,44 +327,24 @@ class WechatClient(PaymentClient):
         if transaction_id:
             params["transaction_id"] = transaction_id
 
-        url = f"{self.config.gateway_url}/pay/orderquery"
-        return self._do_request(url, params)
-
-    def close_order(self, out_trade_no: str) -> ResponseData:
-        """
-        关闭订单接口
-        文档: https://pay.weixin.qq.com/wiki/doc/api/index.html
+        return self._urls["orderquery"], params
 
-        :param out_trade_no: 商户订单号
-        :return: 关闭结果
-        """
+    def _close_order_request(self, out_trade_no: str) -> Tuple[str, Dict[str, Any]]:
+        """构建关闭订单请求, 返回(URL, 参数)"""
         params = self._build_common_params()
         params["out_trade_no"] = out_trade_no
 
-        url = f"{self.config.gateway_url}/pay/closeorder"
-        return self._do_request(url, params)
-
-    # ==================== 退款接口 ====================
+        return self._urls["closeorder"], params
 
-    def refund(
+    def _refund_request(
         self,
         out_trade_no: str,
         out_refund_no: str,
         total_fee: int,
         refund_fee: int,
         **kwargs
-    ) -> ResponseData:
-        """
-        申请退款接口
-        文档: https://pay.weixin.qq.com/wiki/doc/api/index.html
-
-        :param out_trade_no: 商户订单号
-        :param out_refund_no: 退款单号
-        :param total_fee: 总金额(分)
-        :param refund_fee: 退款金额(分)
-        :param kwargs: 其他参数
-        :return: 退款结果
-        """
+    ) -> Tuple[str, Dict[str, Any]]:
+        """构建申请退款请求, 返回(URL, 参数)"""
         params = self._build_common_params()
         params.update({
             "out_trade_no": out_trade_no,
@@ -275,8 +355,6 @@ class WechatClient(PaymentClient):
 
         params.update(kwargs)
 
-        url = f"{self.config.gateway_url}/secapi/pay/refund"
-
         # 退款需要证书
         cert_content = self.config.get_cert_content()
         key_content = self.config.get_key_content()
@@ -286,17 +364,14 @@ class WechatClient(PaymentClient):
 
         # TODO: 添加证书支持
         # 目前先使用普通请求
-        return self._do_request(url, params)
+        return self._urls["refund"], params
 
-    def refund_query(self, out_refund_no: Optional[str] = None, transaction_id: Optional[str] = None) -> ResponseData:
-        """
-        查询退款接口
-        文档: https://pay.weixin.qq.com/wiki/doc/api/index.html
-
-        :param out_refund_no: 退款单号
-        :param transaction_id: 微信订单号
-        :return: 查询结果
-        """
+    def _refund_query_request(
+        self,
+        out_refund_no: Optional[str] = None,
+        transaction_id: Optional[str] = None
+    ) -> Tuple[str, Dict[str, Any]]:
+        """构建查询退款请求, 返回(URL, 参数)"""
         if not out_refund_no and not transaction_id:
             raise PaymentError("out_refund_no和transaction_id至少需要传一个")
 
@@ -306,8 +381,78 @@ class WechatClient(PaymentClient):
         if transaction_id:
             params["transaction_id"] = transaction_id
 
-        url = f"{self.config.gateway_url}/pay/refundquery"
-        return self._do_request(url, params)
+        return self._urls["refundquery"], params
+
+    def _interface_refund_request(
+        self,
+        order_no: str,
+        refund_amount: float,
+        refund_no: Optional[str] = None,
+        **kwargs
+    ) -> Tuple[str, Dict[str, Any]]:
+        """按通用接口参数构建申请退款请求, 返回(URL, 参数)"""
+        # 微信金额单位是分,需要转换
+        total_fee = int(refund_amount * 100)
+        refund_fee = total_fee  # 简化处理,假设全额退款
+
+        return self._refund_request(
+            out_trade_no=order_no,
+            out_refund_no=refund_no or self._generate_nonce_str(),
+            total_fee=total_fee,
+            refund_fee=refund_fee,
+            **kwargs
+        )
+
+    # ==================== 支付接口 ====================
+
+    def unified_order(
+        self,
+        body: str,
+        out_trade_no: str,
+        total_fee: int,
+        spbill_create_ip: str,
+        trade_type: str,
+        **kwargs
+    ) -> ResponseData:
+        """
+        统一下单接口
+        文档: https://pay.weixin.qq.com/wiki/doc/api/index.html
+
+        :param body: 商品描述
+        :param out_trade_no: 商户订单号
+        :param total_fee: 总金额(分)
+        :param spbill_create_ip: 终端IP
+        :param trade_type: 交易类型(JSAPI,NATIVE,APP等)
+        :param kwargs: 其他参数
+        :return: 下单结果
+        """
+        return self._do_request(*self._unified_order_request(
+            body, out_trade_no, total_fee, spbill_create_ip, trade_type, **kwargs
+        ))
+
+    def order_query(self, out_trade_no: Optional[str] = None, transaction_id: Optional[str] = None) -> ResponseData:
+        """
+        查询订单接口
+        文档: https://pay.weixin.qq.com/wiki/doc/api/index.html
+
+        :param out_trade_no: 商户订单号
+        :param transaction_id: 微信订单号
+        :return: 查询结果
+        """
+        return self._do_request(*self._order_query_request(out_trade_no, transaction_id))
+
+    # ==================== 退款接口 ====================
+
+    def refund_query(self, out_refund_no: Optional[str] = None, transaction_id: Optional[str] = None) -> ResponseData:
+        """
+        查询退款接口
+        文档: https://pay.weixin.qq.com/wiki/doc/api/index.html
+
+        :param out_refund_no: 退款单号
+        :param transaction_id: 微信订单号
+        :return: 查询结果
+        """
+        return self._do_request(*self._refund_query_request(out_refund_no, transaction_id))
 
     # ==================== 实现基类接口 ====================
 
@@ -321,8 +466,14 @@ class WechatClient(PaymentClient):
         return self.order_query(out_trade_no=order_no, transaction_id=transaction_id)
 
     def close_order(self, order_no: str) -> ResponseData:
-        """关闭订单"""
-        return self.close_order(out_trade_no=order_no)
+        """
+        关闭订单
+        文档: https://pay.weixin.qq.com/wiki/doc/api/index.html
+
+        :param order_no: 商户订单号
+        :return: 关闭结果
+        """
+        return self._do_request(*self._close_order_request(order_no))
 
     def refund(
         self,
@@ -331,23 +482,90 @@ class WechatClient(PaymentClient):
         refund_no: Optional[str] = None,
         **kwargs
     ) -> ResponseData:
-        """申请退款"""
-        # 微信金额单位是分,需要转换
-        total_fee = int(refund_amount * 100)
-        refund_fee = total_fee  # 简化处理,假设全额退款
+        """
+        申请退款
+        文档: https://pay.weixin.qq.com/wiki/doc/api/index.html
 
-        return self.refund(
-            out_trade_no=order_no,
-            out_refund_no=refund_no or self._generate_nonce_str(),
-            total_fee=total_fee,
-            refund_fee=refund_fee,
-            **kwargs
-        )
+        :param order_no: 商户订单号
+        :param refund_amount: 退款金额(元), 按全额退款处理
+        :param refund_no: 退款单号, 不传时随机生成
+        :param kwargs: 其他参数
+        :return: 退款结果
+        """
+        return self._do_request(*self._interface_refund_request(order_no, refund_amount, refund_no, **kwargs))
 
     def query_refund(self, refund_no: str, transaction_id: Optional[str] = None) -> ResponseData:
         """查询退款"""
         return self.refund_query(out_refund_no=refund_no, transaction_id=transaction_id)
 
+    # ==================== 异步接口 ====================
+
+    async def unified_order_async(
+        self,
+        body: str,
+        out_trade_no: str,
+        total_fee: int,
+        spbill_create_ip: str,
+        trade_type: str,
+        **kwargs
+    ) -> ResponseData:
+        """统一下单(异步版本,参数同unified_order)"""
+        return await self._do_request_async(*self._unified_order_request(
+            body, out_trade_no, total_fee, spbill_create_ip, trade_type, **kwargs
+        ))
+
+    async def order_query_async(
+        self,
+        out_trade_no: Optional[str] = None,
+        transaction_id: Optional[str] = None
+    ) -> ResponseData:
+        """查询订单(异步版本,参数同order_query)"""
+        return await self._do_request_async(*self._order_query_request(out_trade_no, transaction_id))
+
+    async def close_order_async(self, order_no: str) -> ResponseData:
+        """关闭订单(异步版本,参数同close_order)"""
+        return await self._do_request_async(*self._close_order_request(order_no))
+
+    async def refund_async(
+        self,
+        order_no: str,
+        refund_amount: float,
+        refund_no: Optional[str] = None,
+        **kwargs
+    ) -> ResponseData:
+        """申请退款(异步版本,参数同refund)"""
+        return await self._do_request_async(
+            *self._interface_refund_request(order_no, refund_amount, refund_no, **kwargs)
+        )
+
+    async def refund_query_async(
+        self,
+        out_refund_no: Optional[str] = None,
+        transaction_id: Optional[str] = None
+    ) -> ResponseData:
+        """查询退款(异步版本,参数同refund_query)"""
+        return await self._do_request_async(*self._refund_query_request(out_refund_no, transaction_id))
+
+    async def order_query_many_async(self, out_trade_nos: List[str]) -> List[ResponseData]:
+        """
+        并发查询多个订单
+
+        所有请求共用同一个异步连接池同时发出,总耗时约为一次往返而非N次
+
+        :param out_trade_nos: 商户订单号列表
+        :return: 与out_trade_nos顺序一致的查询结果
+        """
+        return list(await asyncio.gather(*(self.order_query_async(out_trade_no=n) for n in out_trade_nos)))
+
+    async def refund_query_many_async(self, out_refund_nos: List[str]) -> List[ResponseData]:
+        """
+        并发查询多个退款
+
+        :param out_refund_nos: 退款单号列表
+        :return: 与out_refund_nos顺序一致的查询结果
+        """
+        return list(await asyncio.gather(*(self.refund_query_async(out_refund_no=n) for n in out_refund_nos)))
+
     def verify_notify(self, data: Dict[str, Any], signature: str) -> bool:
         """验证异步通知"""
         if not self.config.api_key:
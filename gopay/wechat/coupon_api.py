@@ -4,8 +4,9 @@
 """
 
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List
 from gopay.utils.datastructure import BodyMap, ResponseData
+from gopay.wechat.endpoint import READ_CACHE_TTL, ApiRequest, gather_bounded, wechat_api
 
 
 logger = logging.getLogger(__name__)
@@ -17,7 +18,23 @@ class WechatCouponMixin:
     包含代金券、商家券等相关功能
     """
 
-    def send_coupon(self, params: BodyMap) -> ResponseData:
+    # 接口路径, WechatClient初始化时与网关地址拼接为完整URL(self._urls), 含{}的路径在调用时填充
+    _PATHS = {
+        "send_coupon": "/mmpaymkttransfers/send_coupon",
+        "query_coupon_stock": "/mmpaymkttransfers/query_coupon_stock",
+        "query_coupon": "/mmpaymkttransfers/query_coupon",
+        "busifavor_stocks": "/v3/marketing/busifavor/stocks",
+        "busifavor_stock": "/v3/marketing/busifavor/stocks/{stock_id}",
+        "busifavor_budget": "/v3/marketing/busifavor/stocks/{stock_id}/budget",
+        "busifavor_use": "/v3/marketing/busifavor/coupons/use",
+        "busifavor_return": "/v3/marketing/busifavor/coupons/return",
+        "busifavor_deactivate": "/v3/marketing/busifavor/coupons/deactivate",
+        "busifavor_send": "/v3/marketing/busifavor/coupons/{stock_id}/send",
+        "busifavor_users": "/v3/marketing/busifavor/stocks/{stock_id}/users",
+    }
+
+    @wechat_api(required=("coupon_stock_id", "openid_count", "partner_trade_no"))
+    def send_coupon(self, params: BodyMap) -> ApiRequest:
         """
         发放代金券
         文档: https://pay.weixin.qq.com/wiki/doc/api/index.html
@@ -25,79 +42,48 @@ class WechatCouponMixin:
         :param params: 参数对象
         :return: 发放结果
         """
-        params_dict = params.to_dict()
-
-        # 必填参数检查
-        required_fields = ["coupon_stock_id", "openid_count", "partner_trade_no"]
-        for field in required_fields:
-            if field not in params_dict:
-                return ResponseData.error_response(
-                    error=f"缺少必填参数: {field}",
-                    code="MISSING_PARAMETER",
-                )
-
-        params_dict["mch_id"] = self.config.mch_id
-
         # 构建请求参数
         request_params = self._build_common_params()
-        request_params.update(params_dict)
+        request_params.update(params)
+        request_params["mch_id"] = self.config.mch_id
 
-        url = f"{self.config.gateway_url}/mmpaymkttransfers/send_coupon"
-        return self._do_request(url, request_params)
+        url = self._urls["send_coupon"]
+        return url, request_params
 
-    def query_coupon_stock(self, params: BodyMap) -> ResponseData:
+    @wechat_api(required=("coupon_stock_id",))
+    def query_coupon_stock(self, params: BodyMap) -> ApiRequest:
         """
         查询代金券批次
         :param params: 参数对象
         :return: 查询结果
         """
-        params_dict = params.to_dict()
-
-        # 必填参数检查
-        if "coupon_stock_id" not in params_dict:
-            return ResponseData.error_response(
-                error="缺少必填参数: coupon_stock_id",
-                code="MISSING_PARAMETER",
-            )
-
-        params_dict["mch_id"] = self.config.mch_id
-
         # 构建请求参数
         request_params = self._build_common_params()
-        request_params.update(params_dict)
+        request_params.update(params)
+        request_params["mch_id"] = self.config.mch_id
 
-        url = f"{self.config.gateway_url}/mmpaymkttransfers/query_coupon_stock"
-        return self._do_request(url, request_params)
+        url = self._urls["query_coupon_stock"]
+        return url, request_params
 
-    def query_coupon(self, params: BodyMap) -> ResponseData:
+    @wechat_api(required=("coupon_id", "openid", "stock_id"))
+    def query_coupon(self, params: BodyMap) -> ApiRequest:
         """
         查询代金券信息
         :param params: 参数对象
         :return: 查询结果
         """
-        params_dict = params.to_dict()
-
-        # 必填参数检查
-        required_fields = ["coupon_id", "openid", "stock_id"]
-        for field in required_fields:
-            if field not in params_dict:
-                return ResponseData.error_response(
-                    error=f"缺少必填参数: {field}",
-                    code="MISSING_PARAMETER",
-                )
-
-        params_dict["mch_id"] = self.config.mch_id
-
         # 构建请求参数
         request_params = self._build_common_params()
-        request_params.update(params_dict)
+        request_params.update(params)
+        request_params["mch_id"] = self.config.mch_id
 
-        url = f"{self.config.gateway_url}/mmpaymkttransfers/query_coupon"
-        return self._do_request(url, request_params)
+        url = self._urls["query_coupon"]
+        return url, request_params
 
     # ==================== 商家券相关API ====================
 
-    def create_busifavor(self, params: BodyMap) -> ResponseData:
+    @wechat_api(required=("stock_type", "coupon_name", "belong_merchant", "available_merchants", "max_coupons", "no_cash", "description"))
+    def create_busifavor(self, params: BodyMap) -> ApiRequest:
         """
         创建商家券
         文档: https://pay.weixin.qq.com/wiki/doc/api/index.html
@@ -105,143 +91,115 @@ class WechatCouponMixin:
         :param params: 参数对象
         :return: 创建结果
         """
-        params_dict = params.to_dict()
-
-        # 必填参数检查
-        required_fields = ["stock_type", "coupon_name", "belong_merchant", "available_merchants", "max_coupons", "no_cash", "description"]
-        for field in required_fields:
-            if field not in params_dict:
-                return ResponseData.error_response(
-                    error=f"缺少必填参数: {field}",
-                    code="MISSING_PARAMETER",
-                )
-
-        params_dict["mchid"] = self.config.mch_id
-
         # 构建请求参数
         request_params = self._build_common_params()
-        request_params.update(params_dict)
+        request_params.update(params)
+        request_params["mchid"] = self.config.mch_id
 
-        url = f"{self.config.gateway_url}/v3/marketing/busifavor/stocks"
-        return self._do_request(url, request_params)
+        url = self._urls["busifavor_stocks"]
+        return url, request_params
 
-    def query_busifavor(self, stock_id: str) -> ResponseData:
+    @wechat_api(cache_ttl=READ_CACHE_TTL)
+    def query_busifavor(self, stock_id: str) -> ApiRequest:
         """
         查询商家券详情
         :param stock_id: 批次ID
         :return: 查询结果
         """
-        url = f"{self.config.gateway_url}/v3/marketing/busifavor/stocks/{stock_id}"
-        return self._do_request(url, {})
+        url = self._urls["busifavor_stock"].format(stock_id=stock_id)
+        return url, {}
 
-    def modify_busifavor_budget(self, stock_id: str, params: BodyMap) -> ResponseData:
+    @wechat_api
+    def modify_busifavor_budget(self, stock_id: str, params: BodyMap) -> ApiRequest:
         """
         修改商家券预算
         :param stock_id: 批次ID
         :param params: 参数对象
         :return: 修改结果
         """
-        params_dict = params.to_dict()
+        params_dict = dict(params)
 
-        url = f"{self.config.gateway_url}/v3/marketing/busifavor/stocks/{stock_id}/budget"
-        return self._do_request(url, params_dict)
+        url = self._urls["busifavor_budget"].format(stock_id=stock_id)
+        return url, params_dict
 
-    def use_busifavor(self, params: BodyMap) -> ResponseData:
+    @wechat_api(required=("coupon_code", "stock_id", "appid"))
+    def use_busifavor(self, params: BodyMap) -> ApiRequest:
         """
         核销商家券
         :param params: 参数对象
         :return: 核销结果
         """
-        params_dict = params.to_dict()
-
-        # 必填参数检查
-        required_fields = ["coupon_code", "stock_id", "appid"]
-        for field in required_fields:
-            if field not in params_dict:
-                return ResponseData.error_response(
-                    error=f"缺少必填参数: {field}",
-                    code="MISSING_PARAMETER",
-                )
+        params_dict = dict(params)
 
-        url = f"{self.config.gateway_url}/v3/marketing/busifavor/coupons/use"
-        return self._do_request(url, params_dict)
+        url = self._urls["busifavor_use"]
+        return url, params_dict
 
-    def return_busifavor(self, params: BodyMap) -> ResponseData:
+    @wechat_api(required=("coupon_code", "stock_id", "return_request_no"))
+    def return_busifavor(self, params: BodyMap) -> ApiRequest:
         """
         退还商家券
         :param params: 参数对象
         :return: 退还结果
         """
-        params_dict = params.to_dict()
-
-        # 必填参数检查
-        required_fields = ["coupon_code", "stock_id", "return_request_no"]
-        for field in required_fields:
-            if field not in params_dict:
-                return ResponseData.error_response(
-                    error=f"缺少必填参数: {field}",
-                    code="MISSING_PARAMETER",
-                )
+        params_dict = dict(params)
 
-        url = f"{self.config.gateway_url}/v3/marketing/busifavor/coupons/return"
-        return self._do_request(url, params_dict)
+        url = self._urls["busifavor_return"]
+        return url, params_dict
 
-    def deactivate_busifavor(self, stock_id: str, params: BodyMap) -> ResponseData:
+    @wechat_api
+    def deactivate_busifavor(self, stock_id: str, params: BodyMap) -> ApiRequest:
         """
         使优惠券失效
         :param stock_id: 批次ID
         :param params: 参数对象
         :return: 失效结果
         """
-        params_dict = params.to_dict()
+        params_dict = dict(params)
 
-        url = f"{self.config.gateway_url}/v3/marketing/busifavor/coupons/deactivate"
-        return self._do_request(url, params_dict)
+        url = self._urls["busifavor_deactivate"]
+        return url, params_dict
 
-    def send_busifavor(self, params: BodyMap) -> ResponseData:
+    @wechat_api(required=("stock_id", "coupon_count"))
+    def send_busifavor(self, params: BodyMap) -> ApiRequest:
         """
         发放商家券
         :param params: 参数对象
         :return: 发放结果
         """
-        params_dict = params.to_dict()
+        params_dict = dict(params)
 
-        # 必填参数检查
-        required_fields = ["stock_id", "coupon_count"]
-        for field in required_fields:
-            if field not in params_dict:
-                return ResponseData.error_response(
-                    error=f"缺少必填参数: {field}",
-                    code="MISSING_PARAMETER",
-                )
+        url = self._urls["busifavor_send"].format(stock_id=params_dict["stock_id"])
+        return url, params_dict
 
-        url = f"{self.config.gateway_url}/v3/marketing/busifavor/coupons/{params_dict['stock_id']}/send"
-        return self._do_request(url, params_dict)
-
-    def query_busifavor_users(self, stock_id: str, params: BodyMap) -> ResponseData:
+    @wechat_api
+    def query_busifavor_users(self, stock_id: str, params: BodyMap) -> ApiRequest:
         """
         查询商家券用户
         :param stock_id: 批次ID
         :param params: 参数对象
         :return: 查询结果
         """
-        params_dict = params.to_dict()
-
-        url = f"{self.config.gateway_url}/v3/marketing/busifavor/stocks/{stock_id}/users"
-        return self._do_request(url, params_dict)
+        params_dict = dict(params)
 
+        url = self._urls["busifavor_users"].format(stock_id=stock_id)
+        return url, params_dict
 
-# 将 Mixin 的方法添加到 WechatClient 类
-def inject_coupon_methods():
-    """动态注入代金券API方法到 WechatClient"""
-    from gopay.wechat.client import WechatClient
-
-    for method_name in dir(WechatCouponMixin):
-        if not method_name.startswith("_"):
-            method = getattr(WechatCouponMixin, method_name)
-            if callable(method):
-                setattr(WechatClient, method_name, method)
+    # ==================== 批量接口 ====================
 
+    async def send_coupon_many_async(self, params_list: List[BodyMap], concurrency: int = 32) -> List[ResponseData]:
+        """
+        批量发放代金券
+        :param params_list: 每次发放的参数对象
+        :param concurrency: 最大并发数
+        :return: 与params_list顺序一致的发放结果
+        """
+        return await gather_bounded(self.send_coupon_async, ((p,) for p in params_list), concurrency)
 
-# 自动注入
-inject_coupon_methods()
+    async def query_coupon_many_async(self, params_list: List[BodyMap], concurrency: int = 32) -> List[ResponseData]:
+        """
+        批量查询代金券信息
+        :param params_list: 每次查询的参数对象
+        :param concurrency: 最大并发数
+        :return: 与params_list顺序一致的查询结果
+        """
+        return await gather_bounded(self.query_coupon_async, ((p,) for p in params_list), concurrency)
@@ -0,0 +1,239 @@
+"""
+微信支付接口方法装饰器
+Mixin中的接口只负责构建请求(URL与参数), 同步/异步发送由装饰器统一生成
+接口的params参数可以是BodyMap或普通字典, 构建请求时复制到新字典, 不修改调用方传入的参数
+"""
+
+import asyncio
+import functools
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, Tuple, Union
+
+from gopay.utils.datastructure import ResponseData
+
+
+# 请求构建结果: (URL, 请求参数), 参数校验失败时直接返回错误响应
+ApiRequest = Union[ResponseData, Tuple[str, Dict[str, Any]]]
+
+# 只读接口(汇率、公钥、服务器IP等)的默认响应缓存时间(秒)
+READ_CACHE_TTL = 5
+
+
+def _compile_validator(name: str, fields: Tuple[str, ...]) -> Callable[[Any], Optional[str]]:
+    """
+    为固定的必填字段生成校验函数
+    字段检查展开为直线代码, 调用时不再遍历字段列表或构造集合, 返回第一个缺失的字段
+
+    :param name: 接口名称, 用于生成的函数名
+    :param fields: 必填字段, 按声明顺序检查
+    :return: 校验函数, 参数齐全时返回None
+    """
+    lines = [f"def _validate_{name}(params):"]
+    for field in fields:
+        lines.append(f"    if {field!r} not in params:")
+        lines.append(f"        return {field!r}")
+    lines.append("    return None")
+    namespace: Dict[str, Any] = {}
+    exec(compile("\n".join(lines), f"<wechat_api validator {name}>", "exec"), namespace)
+    return namespace[f"_validate_{name}"]
+
+
+def _copy_response(response: ResponseData) -> ResponseData:
+    """浅拷贝响应, data复制为新字典, 嵌套的值仍与原响应共享"""
+    copied = ResponseData.__new__(ResponseData)
+    copied.success = response.success
+    copied.data = dict(response.data)
+    copied.error = response.error
+    copied.code = response.code
+    copied.raw_response = response.raw_response
+    return copied
+
+
+class ResponseCache:
+    """
+    线程安全的短期响应缓存
+    只读接口在流量突发时重复查询相同内容, 短时间内直接返回上次的成功响应
+    写入和读取时均浅拷贝响应, 调用方修改返回响应的data不影响缓存和其他调用方
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        """
+        :param maxsize: 最大缓存条目数, 写满时先清理过期条目, 仍满则淘汰最早写入的条目
+        """
+        self.maxsize = maxsize
+        self._entries: Dict[Hashable, Tuple[float, ResponseData]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[ResponseData]:
+        """获取未过期的缓存响应"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            self._entries.pop(key, None)
+            return None
+        return _copy_response(entry[1])
+
+    def set(self, key: Hashable, response: ResponseData, ttl: float):
+        """缓存响应ttl秒"""
+        with self._lock:
+            if key not in self._entries and len(self._entries) >= self.maxsize:
+                now = time.monotonic()
+                for expired in [k for k, (expires_at, _) in self._entries.items() if expires_at <= now]:
+                    del self._entries[expired]
+                if len(self._entries) >= self.maxsize:
+                    del self._entries[next(iter(self._entries))]
+            self._entries[key] = (time.monotonic() + ttl, _copy_response(response))
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+
+
+def _cache_key(url: str, params: Dict[str, Any]) -> Optional[Hashable]:
+    """由URL和请求参数生成缓存键, 随机串不参与; 参数值不可哈希时返回None(不缓存)"""
+    try:
+        return url, frozenset((k, v) for k, v in params.items() if k != "nonce_str")
+    except TypeError:
+        return None
+
+
+class wechat_api:
+    """
+    接口方法装饰器
+
+    被装饰的方法返回 (url, params) 或错误响应, 类创建时替换为同名的同步接口,
+    并生成 ``<方法名>_async`` 异步接口, 二者共用同一套参数构建与校验逻辑:
+
+        class WechatCouponMixin:
+            @wechat_api
+            def send_coupon(self, params):
+                ...
+                return url, request_params
+
+        client.send_coupon(params)               # 经_do_request同步发送
+        await client.send_coupon_async(params)   # 经_do_request_async异步发送
+
+    带 ``required`` 参数使用时, 在调用构建方法前检查 ``params`` 参数是否包含全部必填字段:
+
+        @wechat_api(required=("coupon_stock_id", "openid_count", "partner_trade_no"))
+        def send_coupon(self, params):
+            ...
+
+    只读接口可指定 ``cache_ttl`` (秒), 相同URL与参数的成功响应在有效期内直接从
+    client._response_cache 返回, 不再发起请求; 每次返回响应的浅拷贝, data中嵌套的
+    字典和列表仍与缓存共享, 不应原地修改
+    """
+
+    def __init__(
+        self,
+        build: Optional[Callable[..., ApiRequest]] = None,
+        *,
+        required: Iterable[str] = (),
+        cache_ttl: float = 0,
+    ):
+        self.build = build
+        self.required = tuple(required)
+        self.cache_ttl = cache_ttl
+
+    def __call__(self, build: Callable[..., ApiRequest]) -> "wechat_api":
+        self.build = build
+        return self
+
+    def __set_name__(self, owner: type, name: str):
+        build = self.build
+        required = self.required
+        cache_ttl = self.cache_ttl
+
+        if required:
+            validate = _compile_validator(name, required)
+
+            def prepare(client, *args, **kwargs) -> ApiRequest:
+                params = args[0] if args else kwargs["params"]
+                field = validate(params)
+                if field is not None:
+                    return ResponseData.error_response(
+                        error=f"缺少必填参数: {field}",
+                        code="MISSING_PARAMETER",
+                    )
+                return build(client, *args, **kwargs)
+        else:
+            prepare = build
+
+        if cache_ttl > 0:
+            @functools.wraps(build)
+            def method(client, *args, **kwargs) -> ResponseData:
+                request = prepare(client, *args, **kwargs)
+                if isinstance(request, ResponseData):
+                    return request
+                key = _cache_key(*request)
+                cached = client._response_cache.get(key) if key is not None else None
+                if cached is not None:
+                    return cached
+                response = client._do_request(*request)
+                if key is not None and response.success:
+                    client._response_cache.set(key, response, cache_ttl)
+                return response
+
+            @functools.wraps(build)
+            async def method_async(client, *args, **kwargs) -> ResponseData:
+                request = prepare(client, *args, **kwargs)
+                if isinstance(request, ResponseData):
+                    return request
+                key = _cache_key(*request)
+                cached = client._response_cache.get(key) if key is not None else None
+                if cached is not None:
+                    return cached
+                response = await client._do_request_async(*request)
+                if key is not None and response.success:
+                    client._response_cache.set(key, response, cache_ttl)
+                return response
+        else:
+            @functools.wraps(build)
+            def method(client, *args, **kwargs) -> ResponseData:
+                request = prepare(client, *args, **kwargs)
+                if isinstance(request, ResponseData):
+                    return request
+                return client._do_request(*request)
+
+            @functools.wraps(build)
+            async def method_async(client, *args, **kwargs) -> ResponseData:
+                request = prepare(client, *args, **kwargs)
+                if isinstance(request, ResponseData):
+                    return request
+                return await client._do_request_async(*request)
+
+        annotations = {**build.__annotations__, "return": ResponseData}
+        method.__annotations__ = annotations
+        method_async.__annotations__ = annotations
+        method_async.__name__ = f"{name}_async"
+        method_async.__qualname__ = f"{owner.__qualname__}.{name}_async"
+        method_async.__doc__ = f"{name}的异步版本, 参数同{name}"
+
+        setattr(owner, name, method)
+        setattr(owner, f"{name}_async", method_async)
+
+
+async def gather_bounded(
+    func: Callable[..., Awaitable[ResponseData]],
+    args_list: Iterable[Tuple[Any, ...]],
+    concurrency: int = 32,
+) -> List[ResponseData]:
+    """
+    以有限并发批量调用异步接口
+    所有请求共用同一个异步连接池, 同时进行的请求数不超过concurrency, 避免触发网关限流
+
+    :param func: 异步接口方法, 如 client.send_coupon_async
+    :param args_list: 每次调用的位置参数
+    :param concurrency: 最大并发数
+    :return: 与args_list顺序一致的结果
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def call(args: Tuple[Any, ...]) -> ResponseData:
+        async with semaphore:
+            return await func(*args)
+
+    return list(await asyncio.gather(*(call(args) for args in args_list)))
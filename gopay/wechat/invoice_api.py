@@ -4,8 +4,9 @@
 """
 
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 from gopay.utils.datastructure import BodyMap, ResponseData
+from gopay.wechat.endpoint import ApiRequest, gather_bounded, wechat_api
 
 
 logger = logging.getLogger(__name__)
@@ -17,7 +18,22 @@ class WechatInvoiceMixin:
     包含电子发票相关功能
     """
 
-    def create_invoice(self, params: BodyMap) -> ResponseData:
+    # 接口路径, WechatClient初始化时与网关地址拼接为完整URL(self._urls), 含{}的路径在调用时填充
+    _PATHS = {
+        "fapiao_create": "/v3/new-tax-control-invoice/fapiao/create",
+        "fapiao_query": "/v3/new-tax-control-invoice/fapiao/query",
+        "fapiao_update": "/v3/new-tax-control-invoice/fapiao/update",
+        "fapiao_clear": "/v3/new-tax-control-invoice/fapiao/clear",
+        "invoice_user_title": "/v3/new-tax-control-invoice/user/title",
+        "fapiao_buyer_query": "/v3/new-tax-control-invoice/fapiao/buyer/query",
+        "fapiao_reject": "/v3/new-tax-control-invoice/fapiao/reject",
+        "fapiao_preview": "/v3/new-tax-control-invoice/fapiao/preview",
+        "invoice_mch_query": "/v3/new-tax-control-invoice/mch/query",
+        "invoice_mch_get": "/v3/new-tax-control-invoice/mch/get",
+    }
+
+    @wechat_api(required=("s_pappid", "order_id", "openid", "type", "payee", "detail", "amount"))
+    def create_invoice(self, params: BodyMap) -> ApiRequest:
         """
         开具电子发票
         文档: https://pay.weixin.qq.com/wiki/doc/api/index.html
@@ -25,49 +41,41 @@ class WechatInvoiceMixin:
         :param params: 参数对象
         :return: 开票结果
         """
-        params_dict = params.to_dict()
-
-        # 必填参数检查
-        required_fields = ["s_pappid", "order_id", "openid", "type", "payee", "detail", "amount"]
-        for field in required_fields:
-            if field not in params_dict:
-                return ResponseData.error_response(
-                    error=f"缺少必填参数: {field}",
-                    code="MISSING_PARAMETER",
-                )
-
         # 构建请求参数
         request_params = self._build_common_params()
-        request_params.update(params_dict)
+        request_params.update(params)
 
-        url = f"{self.config.gateway_url}/v3/new-tax-control-invoice/fapiao/create"
-        return self._do_request(url, request_params)
+        url = self._urls["fapiao_create"]
+        return url, request_params
 
-    def query_invoice(self, fapiao_id: str, params: BodyMap) -> ResponseData:
+    @wechat_api
+    def query_invoice(self, fapiao_id: str, params: BodyMap) -> ApiRequest:
         """
         查询电子发票
         :param fapiao_id: 发票ID
         :param params: 参数对象
         :return: 查询结果
         """
-        params_dict = params.to_dict()
+        params_dict = dict(params)
 
-        url = f"{self.config.gateway_url}/v3/new-tax-control-invoice/fapiao/query"
-        return self._do_request(url, params_dict)
+        url = self._urls["fapiao_query"]
+        return url, params_dict
 
-    def update_invoice(self, fapiao_id: str, params: BodyMap) -> ResponseData:
+    @wechat_api
+    def update_invoice(self, fapiao_id: str, params: BodyMap) -> ApiRequest:
         """
         更新电子发票信息
         :param fapiao_id: 发票ID
         :param params: 参数对象
         :return: 更新结果
         """
-        params_dict = params.to_dict()
+        params_dict = dict(params)
 
-        url = f"{self.config.gateway_url}/v3/new-tax-control-invoice/fapiao/update"
-        return self._do_request(url, params_dict)
+        url = self._urls["fapiao_update"]
+        return url, params_dict
 
-    def clear_invoice(self, fapiao_id: str) -> ResponseData:
+    @wechat_api
+    def clear_invoice(self, fapiao_id: str) -> ApiRequest:
         """
         冲红电子发票
         :param fapiao_id: 发票ID
@@ -75,108 +83,105 @@ class WechatInvoiceMixin:
         """
         params = {"fapiao_id": fapiao_id}
 
-        url = f"{self.config.gateway_url}/v3/new-tax-control-invoice/fapiao/clear"
-        return self._do_request(url, params)
+        url = self._urls["fapiao_clear"]
+        return url, params
 
-    def get_invoice_config(self, params: BodyMap) -> ResponseData:
+    @wechat_api(required=("s_pappid", "openid", "title", "phone"))
+    def get_invoice_config(self, params: BodyMap) -> ApiRequest:
         """
         查询发票配置
         :param params: 参数对象
         :return: 查询结果
         """
-        params_dict = params.to_dict()
+        params_dict = dict(params)
 
-        url = f"{self.config.gateway_url}/v3/new-tax-control-invoice/user/title"
-        return self._do_request(url, params_dict)
+        url = self._urls["invoice_user_title"]
+        return url, params_dict
 
-    def set_invoice_config(self, params: BodyMap) -> ResponseData:
+    @wechat_api
+    def set_invoice_config(self, params: BodyMap) -> ApiRequest:
         """
         设置发票配置
         :param params: 参数对象
         :return: 设置结果
         """
-        params_dict = params.to_dict()
+        params_dict = dict(params)
 
-        # 必填参数检查
-        required_fields = ["s_pappid", "openid", "title", "phone"]
-        for field in required_fields:
-            if field not in params_dict:
-                return ResponseData.error_response(
-                    error=f"缺少必填参数: {field}",
-                    code="MISSING_PARAMETER",
-                )
+        url = self._urls["invoice_user_title"]
+        return url, params_dict
 
-        url = f"{self.config.gateway_url}/v3/new-tax-control-invoice/user/title"
-        return self._do_request(url, params_dict)
-
-    def get_invoice_info(self, params: BodyMap) -> ResponseData:
+    @wechat_api
+    def get_invoice_info(self, params: BodyMap) -> ApiRequest:
         """
         查询个人发票信息
         :param params: 参数对象
         :return: 查询结果
         """
-        params_dict = params.to_dict()
+        params_dict = dict(params)
 
-        url = f"{self.config.gateway_url}/v3/new-tax-control-invoice/fapiao/buyer/query"
-        return self._do_request(url, params_dict)
+        url = self._urls["fapiao_buyer_query"]
+        return url, params_dict
 
-    def reject_invoice(self, fapiao_id: str, params: BodyMap) -> ResponseData:
+    @wechat_api
+    def reject_invoice(self, fapiao_id: str, params: BodyMap) -> ApiRequest:
         """
         拒绝开具发票
         :param fapiao_id: 发票ID
         :param params: 参数对象
         :return: 拒绝结果
         """
-        params_dict = params.to_dict()
+        params_dict = dict(params)
 
-        url = f"{self.config.gateway_url}/v3/new-tax-control-invoice/fapiao/reject"
-        return self._do_request(url, params_dict)
+        url = self._urls["fapiao_reject"]
+        return url, params_dict
 
-    def make_out_invoice(self, params: BodyMap) -> ResponseData:
+    @wechat_api
+    def make_out_invoice(self, params: BodyMap) -> ApiRequest:
         """
         制作电子发票(预览)
         :param params: 参数对象
         :return: 制作结果
         """
-        params_dict = params.to_dict()
+        params_dict = dict(params)
 
-        url = f"{self.config.gateway_url}/v3/new-tax-control-invoice/fapiao/preview"
-        return self._do_request(url, params_dict)
+        url = self._urls["fapiao_preview"]
+        return url, params_dict
 
-    def query_mch_tax(self, params: BodyMap) -> ResponseData:
+    @wechat_api
+    def query_mch_tax(self, params: BodyMap) -> ApiRequest:
         """
         查询商户税号
         :param params: 参数对象
         :return: 查询结果
         """
-        params_dict = params.to_dict()
+        params_dict = dict(params)
 
-        url = f"{self.config.gateway_url}/v3/new-tax-control-invoice/mch/query"
-        return self._do_request(url, params_dict)
+        url = self._urls["invoice_mch_query"]
+        return url, params_dict
 
-    def get_mch_tax(self, params: BodyMap) -> ResponseData:
+    @wechat_api
+    def get_mch_tax(self, params: BodyMap) -> ApiRequest:
         """
         获取商户税号信息
         :param params: 参数对象
         :return: 获取结果
         """
-        params_dict = params.to_dict()
-
-        url = f"{self.config.gateway_url}/v3/new-tax-control-invoice/mch/get"
-        return self._do_request(url, params_dict)
+        params_dict = dict(params)
 
+        url = self._urls["invoice_mch_get"]
+        return url, params_dict
 
-# 将 Mixin 的方法添加到 WechatClient 类
-def inject_invoice_methods():
-    """动态注入发票API方法到 WechatClient"""
-    from gopay.wechat.client import WechatClient
+    # ==================== 批量接口 ====================
 
-    for method_name in dir(WechatInvoiceMixin):
-        if not method_name.startswith("_"):
-            method = getattr(WechatInvoiceMixin, method_name)
-            if callable(method):
-                setattr(WechatClient, method_name, method)
-
-
-# 自动注入
-inject_invoice_methods()
+    async def query_invoice_many_async(
+        self,
+        queries: List[Tuple[str, BodyMap]],
+        concurrency: int = 32,
+    ) -> List[ResponseData]:
+        """
+        批量查询电子发票
+        :param queries: (发票ID, 参数对象)列表
+        :param concurrency: 最大并发数
+        :return: 与queries顺序一致的查询结果
+        """
+        return await gather_bounded(self.query_invoice_async, queries, concurrency)
@@ -4,7 +4,8 @@
 """
 
 import logging
-from gopay.utils.datastructure import BodyMap, ResponseData
+from gopay.utils.datastructure import BodyMap
+from gopay.wechat.endpoint import READ_CACHE_TTL, ApiRequest, wechat_api
 
 
 logger = logging.getLogger(__name__)
@@ -13,71 +14,76 @@ logger = logging.getLogger(__name__)
 class WechatOAuthMixin:
     """微信OAuth API Mixin类"""
 
-    def get_oauth2_access_token(self, params: BodyMap) -> ResponseData:
+    # 接口路径, WechatClient初始化时与网关地址拼接为完整URL(self._urls), 含{}的路径在调用时填充
+    _PATHS = {
+        "cgi_token": "/cgi-bin/token",
+        "check_token": "/cgi-bin/auth/draft/api/check_token",
+        "user_info": "/cgi-bin/user/info",
+        "checksession": "/wxa/checksession",
+        "get_api_domain_ip": "/cgi-bin/get_api_domain_ip",
+        "clear_quota": "/cgi-bin/clear_quota",
+    }
+
+    @wechat_api
+    def get_oauth2_access_token(self, params: BodyMap) -> ApiRequest:
         """
         获取access_token
         文档: https://developers.weixin.qq.com/doc/oplatform/Getting_S_started/Getting_Access_Token.html
         """
-        params_dict = params.to_dict()
-        url = f"{self.config.gateway_url}/cgi-bin/token"
-        return self._do_request(url, params_dict)
+        params_dict = dict(params)
+        url = self._urls["cgi_token"]
+        return url, params_dict
 
-    def refresh_oauth2_access_token(self, params: BodyMap) -> ResponseData:
+    @wechat_api
+    def refresh_oauth2_access_token(self, params: BodyMap) -> ApiRequest:
         """
         刷新access_token
         """
-        params_dict = params.to_dict()
-        url = f"{self.config.gateway_url}/cgi-bin/token"
-        return self._do_request(url, params_dict)
+        params_dict = dict(params)
+        url = self._urls["cgi_token"]
+        return url, params_dict
 
-    def check_oauth2_access_token(self, params: BodyMap) -> ResponseData:
+    @wechat_api
+    def check_oauth2_access_token(self, params: BodyMap) -> ApiRequest:
         """
         检验access_token是否有效
         """
-        params_dict = params.to_dict()
-        url = f"{self.config.gateway_url}/cgi-bin/auth/draft/api/check_token"
-        return self._do_request(url, params_dict)
+        params_dict = dict(params)
+        url = self._urls["check_token"]
+        return url, params_dict
 
-    def get_oauth2_userinfo(self, params: BodyMap) -> ResponseData:
+    @wechat_api
+    def get_oauth2_userinfo(self, params: BodyMap) -> ApiRequest:
         """
         获取用户信息
         """
-        params_dict = params.to_dict()
-        url = f"{self.config.gateway_url}/cgi-bin/user/info"
-        return self._do_request(url, params_dict)
+        params_dict = dict(params)
+        url = self._urls["user_info"]
+        return url, params_dict
 
-    def jscode2session(self, params: BodyMap) -> ResponseData:
+    @wechat_api
+    def jscode2session(self, params: BodyMap) -> ApiRequest:
         """
         登录凭证校验
         """
-        params_dict = params.to_dict()
-        url = f"{self.config.gateway_url}/wxa/checksession"
-        return self._do_request(url, params_dict)
+        params_dict = dict(params)
+        url = self._urls["checksession"]
+        return url, params_dict
 
-    def get_api_domain_ip(self, params: BodyMap) -> ResponseData:
+    @wechat_api(cache_ttl=READ_CACHE_TTL)
+    def get_api_domain_ip(self, params: BodyMap) -> ApiRequest:
         """
         获取微信服务器IP地址
         """
-        params_dict = params.to_dict()
-        url = f"{self.config.gateway_url}/cgi-bin/get_api_domain_ip"
-        return self._do_request(url, params_dict)
+        params_dict = dict(params)
+        url = self._urls["get_api_domain_ip"]
+        return url, params_dict
 
-    def clear_quota(self, params: BodyMap) -> ResponseData:
+    @wechat_api
+    def clear_quota(self, params: BodyMap) -> ApiRequest:
         """
         清除接口调用次数
         """
-        params_dict = params.to_dict()
-        url = f"{self.config.gateway_url}/cgi-bin/clear_quota"
-        return self._do_request(url, params_dict)
-
-
-def inject_oauth_methods():
-    from gopay.wechat.client import WechatClient
-    for method_name in dir(WechatOAuthMixin):
-        if not method_name.startswith("_"):
-            method = getattr(WechatOAuthMixin, method_name)
-            if callable(method):
-                setattr(WechatClient, method_name, method)
-
-
-inject_oauth_methods()
+        params_dict = dict(params)
+        url = self._urls["clear_quota"]
+        return url, params_dict
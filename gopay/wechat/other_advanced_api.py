@@ -4,7 +4,8 @@
 """
 
 import logging
-from gopay.utils.datastructure import BodyMap, ResponseData
+from gopay.utils.datastructure import BodyMap
+from gopay.wechat.endpoint import READ_CACHE_TTL, ApiRequest, wechat_api
 
 
 logger = logging.getLogger(__name__)
@@ -13,144 +14,155 @@ logger = logging.getLogger(__name__)
 class WechatOtherAdvancedMixin:
     """微信高级功能 API Mixin类"""
 
-    def reverse(self, params: BodyMap) -> ResponseData:
+    # 接口路径, WechatClient初始化时与网关地址拼接为完整URL(self._urls), 含{}的路径在调用时填充
+    _PATHS = {
+        "reverse": "/secapi/pay/reverse",
+        "combine": "/v3/combine-transactions/combine",
+        "combine_query": "/v3/combine-transactions/no-transactions/{combine_out_trade_no}",
+        "profitsharing_multi_orders": "/v3/profitsharingorders/multi-orders",
+        "profitsharingorders": "/v3/profitsharingorders",
+        "rssig_get": "/rssig/get",
+        "report": "/pay/report",
+        "downloadfundflow": "/pay/downloadfundflow",
+        "batchquerycomment": "/billcommentsp/batchquerycomment",
+        "queryexchagerate": "/pay/queryexchagerate",
+        "getsignkey": "/rms/getsignkey",
+        "getpublickey": "/risk/getpublickey",
+        "getpost": "/risk/getpost",
+    }
+
+    @wechat_api
+    def reverse(self, params: BodyMap) -> ApiRequest:
         """
         撤销订单
         文档: https://pay.weixin.qq.com/wiki/doc/api/index.html
         """
-        params_dict = params.to_dict()
         request_params = self._build_common_params()
-        request_params.update(params_dict)
-        url = f"{self.config.gateway_url}/secapi/pay/reverse"
-        return self._do_request(url, request_params)
+        request_params.update(params)
+        url = self._urls["reverse"]
+        return url, request_params
 
-    def combine(self, params: BodyMap) -> ResponseData:
+    @wechat_api
+    def combine(self, params: BodyMap) -> ApiRequest:
         """
         合单支付
         文档: https://pay.weixin.qq.com/wiki/doc/api/index.html
         """
-        params_dict = params.to_dict()
         request_params = self._build_common_params()
-        request_params.update(params_dict)
-        url = f"{self.config.gateway_url}/v3/combine-transactions/combine"
-        return self._do_request(url, request_params)
+        request_params.update(params)
+        url = self._urls["combine"]
+        return url, request_params
 
-    def combine_query(self, combine_out_trade_no: str) -> ResponseData:
+    @wechat_api
+    def combine_query(self, combine_out_trade_no: str) -> ApiRequest:
         """
         查询合单订单
         """
-        url = f"{self.config.gateway_url}/v3/combine-transactions/no-transactions/{combine_out_trade_no}"
-        return self._do_request(url, {})
+        url = self._urls["combine_query"].format(combine_out_trade_no=combine_out_trade_no)
+        return url, {}
 
-    def multi_profit_sharing(self, params: BodyMap) -> ResponseData:
+    @wechat_api
+    def multi_profit_sharing(self, params: BodyMap) -> ApiRequest:
         """
         请求多次分账
         """
-        params_dict = params.to_dict()
         request_params = self._build_common_params()
-        request_params.update(params_dict)
-        url = f"{self.config.gateway_url}/v3/profitsharingorders/multi-orders"
-        return self._do_request(url, request_params)
+        request_params.update(params)
+        url = self._urls["profitsharing_multi_orders"]
+        return url, request_params
 
-    def profit_sharing_split_by_buyer(self, params: BodyMap) -> ResponseData:
+    @wechat_api
+    def profit_sharing_split_by_buyer(self, params: BodyMap) -> ApiRequest:
         """
         买家分账
         """
-        params_dict = params.to_dict()
         request_params = self._build_common_params()
-        request_params.update(params_dict)
-        url = f"{self.config.gateway_url}/v3/profitsharingorders"
-        return self._do_request(url, request_params)
+        request_params.update(params)
+        url = self._urls["profitsharingorders"]
+        return url, request_params
 
-    def profit_sharing_split_by_merchant(self, params: BodyMap) -> ResponseData:
+    @wechat_api
+    def profit_sharing_split_by_merchant(self, params: BodyMap) -> ApiRequest:
         """
         商户分账
         """
-        params_dict = params.to_dict()
         request_params = self._build_common_params()
-        request_params.update(params_dict)
-        url = f"{self.config.gateway_url}/v3/profitsharingorders"
-        return self._do_request(url, request_params)
+        request_params.update(params)
+        url = self._urls["profitsharingorders"]
+        return url, request_params
 
-    def get_rsa_public_key(self, params: BodyMap) -> ResponseData:
+    @wechat_api(cache_ttl=READ_CACHE_TTL)
+    def get_rsa_public_key(self, params: BodyMap) -> ApiRequest:
         """
         获取RSA加密公钥
         """
-        params_dict = params.to_dict()
-        url = f"{self.config.gateway_url}/rssig/get"
-        return self._do_request(url, params_dict)
+        params_dict = dict(params)
+        url = self._urls["rssig_get"]
+        return url, params_dict
 
-    def report(self, params: BodyMap) -> ResponseData:
+    @wechat_api
+    def report(self, params: BodyMap) -> ApiRequest:
         """
         交易保障
         """
-        params_dict = params.to_dict()
         request_params = self._build_common_params()
-        request_params.update(params_dict)
-        url = f"{self.config.gateway_url}/pay/report"
-        return self._do_request(url, request_params)
+        request_params.update(params)
+        url = self._urls["report"]
+        return url, request_params
 
-    def download_fund_flow(self, params: BodyMap) -> ResponseData:
+    @wechat_api
+    def download_fund_flow(self, params: BodyMap) -> ApiRequest:
         """
         下载资金对账单
         补充之前的方法
         """
-        params_dict = params.to_dict()
         request_params = self._build_common_params()
-        request_params.update(params_dict)
-        url = f"{self.config.gateway_url}/pay/downloadfundflow"
-        return self._do_request(url, request_params)
+        request_params.update(params)
+        url = self._urls["downloadfundflow"]
+        return url, request_params
 
-    def batch_query_comment(self, params: BodyMap) -> ResponseData:
+    @wechat_api
+    def batch_query_comment(self, params: BodyMap) -> ApiRequest:
         """
         批量查询评价
         """
-        params_dict = params.to_dict()
         request_params = self._build_common_params()
-        request_params.update(params_dict)
-        url = f"{self.config.gateway_url}/billcommentsp/batchquerycomment"
-        return self._do_request(url, request_params)
+        request_params.update(params)
+        url = self._urls["batchquerycomment"]
+        return url, request_params
 
-    def query_exchange_rate(self, params: BodyMap) -> ResponseData:
+    @wechat_api(cache_ttl=READ_CACHE_TTL)
+    def query_exchange_rate(self, params: BodyMap) -> ApiRequest:
         """
         查询汇率
         """
-        params_dict = params.to_dict()
-        url = f"{self.config.gateway_url}/pay/queryexchagerate"
-        return self._do_request(url, params_dict)
+        params_dict = dict(params)
+        url = self._urls["queryexchagerate"]
+        return url, params_dict
 
-    def get_sign_key(self, params: BodyMap) -> ResponseData:
+    @wechat_api
+    def get_sign_key(self, params: BodyMap) -> ApiRequest:
         """
         获取签名密钥
         """
-        params_dict = params.to_dict()
-        url = f"{self.config.gateway_url}/rms/getsignkey"
-        return self._do_request(url, params_dict)
+        params_dict = dict(params)
+        url = self._urls["getsignkey"]
+        return url, params_dict
 
-    def risk_get_signkey(self, params: BodyMap) -> ResponseData:
+    @wechat_api
+    def risk_get_signkey(self, params: BodyMap) -> ApiRequest:
         """
         获取商户RSA公钥
         """
-        params_dict = params.to_dict()
-        url = f"{self.config.gateway_url}/risk/getpublickey"
-        return self._do_request(url, params_dict)
+        params_dict = dict(params)
+        url = self._urls["getpublickey"]
+        return url, params_dict
 
-    def risk_manage(self, params: BodyMap) -> ResponseData:
+    @wechat_api
+    def risk_manage(self, params: BodyMap) -> ApiRequest:
         """
         风控管理
         """
-        params_dict = params.to_dict()
-        url = f"{self.config.gateway_url}/risk/getpost"
-        return self._do_request(url, params_dict)
-
-
-def inject_advanced_methods():
-    from gopay.wechat.client import WechatClient
-    for method_name in dir(WechatOtherAdvancedMixin):
-        if not method_name.startswith("_"):
-            method = getattr(WechatOtherAdvancedMixin, method_name)
-            if callable(method):
-                setattr(WechatClient, method_name, method)
-
-
-inject_advanced_methods()
+        params_dict = dict(params)
+        url = self._urls["getpost"]
+        return url, params_dict
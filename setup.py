@@ -4,11 +4,19 @@ Pay-Stack Python SDK 安装配置
 
 from setuptools import setup, find_packages
 from pathlib import Path
+import os
 
 # 读取README文件
 readme_file = Path(__file__).parent / "README.md"
 long_description = readme_file.read_text(encoding="utf-8") if readme_file.exists() else ""
 
+# 可选: 设置PAY_STACK_MYPYC=1时用mypyc将签名模块编译为C扩展(需已安装mypy)
+ext_modules = []
+if os.environ.get("PAY_STACK_MYPYC") == "1":
+    from mypyc.build import mypycify
+
+    ext_modules = mypycify(["--follow-imports=silent", "gopay/utils/signer.py"])
+
 setup(
     name="pay-stack",
     version="1.0.0",
@@ -19,6 +27,7 @@ setup(
     long_description_content_type="text/markdown",
     url="https://github.com/hezuogongying/pay-stack",
     packages=find_packages(exclude=["tests", "tests.*", "examples", "docs"]),
+    ext_modules=ext_modules,
     classifiers=[
         "Development Status :: 4 - Beta",
         "Intended Audience :: Developers",
@@ -37,6 +46,24 @@ setup(
         "cryptography>=41.0.0",
     ],
     extras_require={
+        "fast": [
+            "orjson>=3.9.0",
+        ],
+        "async": [
+            "httpx>=0.24.0",
+        ],
+        "http2": [
+            "httpx[http2]>=0.24.0",
+        ],
+        "msgpack": [
+            "msgpack>=1.0.0",
+        ],
+        "msgspec": [
+            "msgspec>=0.18.0",
+        ],
+        "xml": [
+            "lxml>=4.9.0",
+        ],
         "dev": [
             "pytest>=7.4.0",
             "pytest-cov>=4.1.0",
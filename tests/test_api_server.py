@@ -0,0 +1,85 @@
+"""
+API服务器测试
+"""
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+from gopay.api import server as server_module
+from gopay.api.server import PayApiServer, _parse_pay_request
+
+
+# (请求体, 期望的解析结果), None表示拒绝
+PAY_REQUEST_CASES = [
+    (b"", {}),
+    (b'{"channel": "wechat", "params": {"a": 1}}', {"channel": "wechat", "params": {"a": 1}}),
+    (b'{"channel": "wechat"}', {"channel": "wechat", "params": {}}),
+    (b'{"channel": null, "params": {}, "extra": 1}', {"channel": None, "params": {}}),
+    (b'{"channel": "wechat", "params": null}', None),
+    (b'{"channel": "wechat", "params": [1]}', None),
+    (b'{"channel": "wechat", "params": "a=1"}', None),
+    (b'{"channel": 1, "params": {}}', None),
+    (b'[1, 2]', None),
+    (b"not json", None),
+]
+
+
+class TestPayApiServer:
+    """支付API服务器测试"""
+
+    def test_start_keeps_host_logging(self, monkeypatch):
+        """测试默认启动时不替换宿主进程的日志处理器"""
+        calls = []
+        monkeypatch.setattr(server_module, "install_queue_logging", lambda: calls.append(True))
+
+        api_server = PayApiServer()
+        monkeypatch.setattr(api_server, "_start_fastapi", lambda host, port, **kwargs: None)
+        api_server.start()
+        assert calls == []
+
+        api_server = PayApiServer()
+        monkeypatch.setattr(api_server, "_start_fastapi", lambda host, port, **kwargs: None)
+        api_server.start(queue_logging=True)
+        assert calls == [True]
+
+
+class TestParsePayRequest:
+    """支付请求体解析测试, msgspec与json_codec两条路径结果一致"""
+
+    @pytest.mark.parametrize("body,expected", PAY_REQUEST_CASES)
+    def test_json_codec_path(self, monkeypatch, body, expected):
+        """测试未安装msgspec时的解析"""
+        monkeypatch.setattr(server_module, "_payment_request_decoder", None)
+        assert _parse_pay_request(body) == expected
+
+    @pytest.mark.parametrize("body,expected", PAY_REQUEST_CASES)
+    def test_msgspec_path(self, body, expected):
+        """测试使用msgspec的解析"""
+        if server_module._payment_request_decoder is None:
+            pytest.skip("msgspec未安装")
+        assert _parse_pay_request(body) == expected
+
+
+class TestContentNegotiation:
+    """响应编码协商测试"""
+
+    @pytest.mark.parametrize("framework", ["fastapi", "flask"])
+    def test_vary_accept(self, framework):
+        """测试按Accept协商的支付接口响应带Vary: Accept"""
+        if framework == "flask":
+            pytest.importorskip("flask")
+            client = PayApiServer(framework="flask").get_app().test_client()
+            body_arg = "data"
+        else:
+            from fastapi.testclient import TestClient
+            client = TestClient(PayApiServer().get_app())
+            body_arg = "content"
+
+        for path, body in (("/api/v1/pay/unknown", b"{}"), ("/api/v1/pay/create_order", b"[]")):
+            response = client.post(path, headers={"Accept": "application/json"}, **{body_arg: body})
+            assert "Accept" in response.headers.get("Vary", "")
+
+        # 渠道列表不按Accept协商
+        response = client.get("/api/v1/channels")
+        assert "Accept" not in [v.strip() for v in response.headers.get("Vary", "").split(",")]
@@ -6,6 +6,7 @@ import pytest
 from pathlib import Path
 import tempfile
 import json
+import os
 
 from gopay.config import PaymentConfig, AlipayConfig, WechatConfig, QQConfig, ConfigManager
 from gopay.exceptions import ConfigError
@@ -72,6 +73,25 @@ class TestPaymentConfig:
         finally:
             Path(temp_file).unlink()
 
+    def test_get_key_content_reloads_modified_file(self):
+        """测试密钥文件修改后重新读取"""
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".pem", delete=False) as f:
+            f.write("key-v1")
+            temp_file = f.name
+
+        try:
+            config = PaymentConfig(app_id="test_app_id", key_path=temp_file)
+            assert config.get_key_content() == "key-v1"
+
+            Path(temp_file).write_text("key-v2", encoding="utf-8")
+            stat = Path(temp_file).stat()
+            os.utime(temp_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            assert config.get_key_content() == "key-v2"
+        finally:
+            Path(temp_file).unlink()
+
+        assert config.get_key_content() is None
+
 
 class TestAlipayConfig:
     """支付宝配置测试"""
@@ -175,3 +195,16 @@ class TestConfigManager:
         assert "config1" in configs
         assert "config2" in configs
         assert len(configs) == 2
+
+    def test_seal_makes_configs_read_only(self):
+        """测试封存后配置只读"""
+        manager = ConfigManager()
+        manager.register("test", PaymentConfig(app_id="test_app_id"))
+        manager.seal()
+
+        assert manager.sealed
+        assert manager.get("test").app_id == "test_app_id"
+        with pytest.raises(ConfigError):
+            manager.register("other", PaymentConfig(app_id="other"))
+        with pytest.raises(ConfigError):
+            manager.remove("test")
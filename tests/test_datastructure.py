@@ -128,6 +128,24 @@ class TestBodyMap:
         assert len(body) == 3
         assert body.get("key2") == "value2"
 
+    def test_update_skips_empty_values(self):
+        """测试更新参数时跳过None和空字符串"""
+        body = BodyMap()
+        body.set("key1", "value1")
+
+        body.update({"key1": None, "key2": "", "key3": 0}, key4=None, key5="value5")
+        # 已有参数不会被空值覆盖, 0不是空值
+        assert body == {"key1": "value1", "key3": 0, "key5": "value5"}
+        body.update([("key6", "value6"), ("key7", "")])
+        assert body.contains("key6") is True
+        assert body.contains("key7") is False
+
+    def test_construct_skips_empty_values(self):
+        """测试构造时与update()一致"""
+        params = {"key1": "value1", "key2": None, "key3": ""}
+        body = BodyMap(params, key4="")
+        assert body == BodyMap().update(params) == {"key1": "value1"}
+
     def test_contains(self):
         """测试检查参数是否存在"""
         body = BodyMap()
@@ -206,6 +224,21 @@ class TestResponseData:
         assert response.error == "error message"
         assert response.code == "ERR001"
 
+    def test_code_msg_keywords(self):
+        """测试按code/msg构造"""
+        response = ResponseData(code="0", msg="Success", data={"key": "value"})
+        assert response.success is True
+        assert response.msg == "Success"
+        assert response.data == {"key": "value"}
+
+        response = ResponseData(code="-1", msg="error message")
+        assert response.success is False
+        assert response.error == "error message"
+
+        response = ResponseData(success=False, error="error message", code="0")
+        assert response.success is False
+        assert response.msg == "error message"
+
     def test_to_dict(self):
         """测试转换为字典"""
         data = {"key1": "value1"}
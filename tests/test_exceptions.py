@@ -0,0 +1,44 @@
+"""
+异常测试
+"""
+
+import pickle
+
+from gopay.exceptions import GoPayError, NetworkError, PaymentError
+
+
+class TestGoPayError:
+    """基础异常测试"""
+
+    def test_extra_is_mutable_dict(self):
+        """测试extra始终为可修改的字典"""
+        for error in (GoPayError("失败"), GoPayError("失败", extra={"a": 1}), NetworkError("超时")):
+            assert type(error.extra) is dict
+            error.extra["trace_id"] = "t1"
+            assert error.extra["trace_id"] == "t1"
+
+    def test_default_extra_not_shared(self):
+        """测试未传extra的异常互不影响"""
+        first, second = GoPayError("a"), GoPayError("b")
+        first.extra["x"] = 1
+        assert second.extra == {}
+
+    def test_to_dict(self):
+        """测试转换为字典"""
+        error = PaymentError("余额不足", error_code="NOTENOUGH", extra={"order": "1"})
+        assert error.to_dict() == {
+            "error": "PaymentError",
+            "message": "余额不足",
+            "code": "NOTENOUGH",
+            "extra": {"order": "1"},
+        }
+        assert str(error) == "[NOTENOUGH] 余额不足"
+
+    def test_pickle(self):
+        """测试pickle往返"""
+        error = NetworkError("超时", status_code=504)
+        error.extra["retry"] = 3
+        restored = pickle.loads(pickle.dumps(error))
+        assert restored.status_code == 504
+        assert restored.extra == {"retry": 3}
+        assert str(restored) == str(error)
@@ -0,0 +1,131 @@
+"""
+HTTP客户端测试
+"""
+
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from gopay.exceptions import NetworkError
+from gopay.http import AsyncHttpClient, HttpClient
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """
+    /unavailable: 延迟0.1秒后返回503并计数
+    其他路径: 返回请求中的Cookie和X-Test请求头
+    """
+
+    def do_GET(self):
+        if self.path == "/unavailable":
+            self.server.hits += 1
+            time.sleep(0.1)
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = f"{self.headers.get('Cookie', '')}|{self.headers.get('X-Test', '')}".encode("utf-8")
+        self.send_response(200)
+        if self.path == "/set-cookie":
+            self.send_header("Set-Cookie", "sid=abc; Path=/")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.hits = 0
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestHttpClient:
+    """HTTP客户端测试"""
+
+    def test_shared_pool_isolated_sessions(self, server):
+        """测试共享连接池时各客户端的session相互独立"""
+        client_a = HttpClient(enable_log=False)
+        client_b = HttpClient(enable_log=False)
+        assert client_a.session is not client_b.session
+        pool_a = client_a.session.get_adapter(server.url).poolmanager
+        pool_b = client_b.session.get_adapter(server.url).poolmanager
+        assert pool_a is pool_b
+
+        client_a.session.headers["X-Test"] = "a"
+        client_a.get(f"{server.url}/set-cookie")
+        assert client_a.get(server.url).text == "sid=abc|a"
+        # 另一个客户端既没有收到cookie, 也没有带上请求头
+        assert client_b.get(server.url).text == "|"
+
+    def test_unshared_pool(self, server):
+        """测试不共享连接池"""
+        client_a = HttpClient(enable_log=False, shared_session=False)
+        client_b = HttpClient(enable_log=False)
+        pool_a = client_a.session.get_adapter(server.url).poolmanager
+        pool_b = client_b.session.get_adapter(server.url).poolmanager
+        assert pool_a is not pool_b
+        assert client_a.get(server.url).status_code == 200
+        client_a.close()
+
+    def test_retry_without_deadline(self, server):
+        """测试未指定截止时间时按重试策略重试"""
+        client = HttpClient(enable_log=False, max_retries=2, retry_interval=0.01)
+        response = client.get(f"{server.url}/unavailable")
+        assert response.status_code == 503
+        assert server.hits == 3
+
+    def test_deadline_bounds_total_time(self, server):
+        """测试截止时间限制包括重试在内的总耗时"""
+        client = HttpClient(enable_log=False, max_retries=3, retry_interval=0.5)
+        start = time.monotonic()
+        response = client.get(f"{server.url}/unavailable", deadline=start + 0.5)
+        assert time.monotonic() - start < 0.5
+        assert response.status_code == 503
+        assert server.hits == 1
+
+        # 截止时间只作用于当次请求
+        server.hits = 0
+        client = HttpClient(enable_log=False, max_retries=1, retry_interval=0.01)
+        client.get(f"{server.url}/unavailable")
+        assert server.hits == 2
+
+    def test_deadline_exceeded(self, server):
+        """测试已超过截止时间"""
+        client = HttpClient(enable_log=False)
+        with pytest.raises(NetworkError):
+            client.get(server.url, deadline=time.monotonic() - 1)
+
+    def test_connection_error_message(self):
+        """测试连接失败的错误信息不声称已重试"""
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            url = f"http://127.0.0.1:{sock.getsockname()[1]}"
+        client = HttpClient(enable_log=False, max_retries=0)
+        with pytest.raises(NetworkError) as exc_info:
+            client.post(url, json={"a": 1})
+        assert "已重试" not in exc_info.value.message
+        assert exc_info.value.status_code is None
+
+
+class TestAsyncHttpClient:
+    """异步HTTP客户端测试"""
+
+    def test_pool_limits(self):
+        """测试连接池上限作用于实际使用的transport"""
+        pytest.importorskip("httpx")
+        client = AsyncHttpClient(enable_log=False, max_connections=3, max_keepalive_connections=1)
+        pool = client.client._transport._pool
+        assert pool._max_connections == 3
+        assert pool._max_keepalive_connections == 1
@@ -0,0 +1,172 @@
+"""
+API中间件测试
+"""
+
+import asyncio
+import json
+import logging
+
+import pytest
+
+from gopay.api.middleware import (
+    ASGIMiddleware,
+    AuthMiddleware,
+    ErrorHandler,
+    LoggingMiddleware,
+    MiddlewareChain,
+    RateLimiter,
+)
+
+
+API_KEY = "test_api_key"
+
+
+async def _app(scope, receive, send):
+    """下游ASGI应用: /api/v1/pay/boom 抛出异常, /api/v1/pay/partial 发送响应头后抛出异常, 其余返回201"""
+    path = scope["path"]
+    if path == "/api/v1/pay/boom":
+        raise RuntimeError("boom")
+    await send({"type": "http.response.start", "status": 201, "headers": []})
+    if path == "/api/v1/pay/partial":
+        raise RuntimeError("partial")
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+class _Recorder:
+    """记录after_request调用的中间件"""
+
+    def __init__(self):
+        self.calls = []
+
+    def after_request(self, operation, status_code, duration):
+        self.calls.append((operation, status_code, duration))
+
+
+def _call(middleware, path="/api/v1/pay/create_order", api_key=None):
+    """
+    执行一次HTTP请求
+
+    Returns:
+        tuple: (HTTP状态码, 响应体)
+    """
+    headers = [(b"x-api-key", api_key.encode("latin-1"))] if api_key else []
+    scope = {"type": "http", "path": path, "headers": headers}
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(middleware(scope, receive, send))
+    status = next(m["status"] for m in messages if m["type"] == "http.response.start")
+    body = b"".join(m.get("body", b"") for m in messages if m["type"] == "http.response.body")
+    return status, body
+
+
+def _middleware(*middlewares) -> ASGIMiddleware:
+    chain = MiddlewareChain()
+    for middleware in middlewares:
+        chain.add(middleware)
+    return ASGIMiddleware(_app, chain=chain)
+
+
+class TestASGIMiddleware:
+    """ASGI中间件测试"""
+
+    def test_auth(self):
+        """测试缺少或无效的API密钥被拒绝"""
+        middleware = _middleware(AuthMiddleware([API_KEY]))
+
+        for api_key, msg in ((None, "缺少API密钥"), ("wrong_key", "无效的API密钥")):
+            status, body = _call(middleware, api_key=api_key)
+            assert status == 200
+            assert json.loads(body)["code"] == "401"
+            assert json.loads(body)["msg"] == msg
+
+        assert _call(middleware, api_key=API_KEY) == (201, b"ok")
+
+    def test_path_prefix(self):
+        """测试前缀以外的路径不经过中间件"""
+        middleware = _middleware(AuthMiddleware([API_KEY]))
+        assert _call(middleware, path="/health") == (201, b"ok")
+
+    def test_rate_limit(self):
+        """测试超出限制的请求被拒绝, 按API密钥分别计数"""
+        middleware = _middleware(RateLimiter(max_requests=2, window=60))
+        assert _call(middleware, api_key="a") == (201, b"ok")
+        assert _call(middleware, api_key="a") == (201, b"ok")
+        status, body = _call(middleware, api_key="a")
+        assert json.loads(body)["code"] == "429"
+        assert _call(middleware, api_key="b") == (201, b"ok")
+
+    def test_after_request(self, caplog):
+        """测试请求完成后记录路径、状态码和耗时"""
+        recorder = _Recorder()
+        middleware = _middleware(LoggingMiddleware(), recorder)
+        with caplog.at_level(logging.INFO, logger="gopay.api.middleware"):
+            _call(middleware)
+
+        [(operation, status_code, duration)] = recorder.calls
+        assert operation == "/api/v1/pay/create_order"
+        assert status_code == 201
+        assert duration >= 0
+        assert "/api/v1/pay/create_order" in caplog.text
+        assert "201" in caplog.text
+
+    def test_rejected_request_after_request(self):
+        """测试请求前被拒绝时同样调用after_request"""
+        recorder = _Recorder()
+        middleware = _middleware(AuthMiddleware([API_KEY]), RateLimiter(max_requests=1), recorder)
+        _call(middleware)
+        _call(middleware, api_key=API_KEY)
+        _call(middleware, api_key=API_KEY)
+        assert [(operation, status_code) for operation, status_code, _ in recorder.calls] == [
+            ("/api/v1/pay/create_order", 200),
+            ("/api/v1/pay/create_order", 201),
+            ("/api/v1/pay/create_order", 200),
+        ]
+        assert all(duration >= 0 for _, _, duration in recorder.calls)
+
+    def test_error_handler(self):
+        """测试下游异常转换为统一错误响应"""
+        recorder = _Recorder()
+        middleware = _middleware(ErrorHandler(), recorder)
+        status, body = _call(middleware, path="/api/v1/pay/boom")
+        assert status == 200
+        assert json.loads(body)["code"] == "500"
+        assert json.loads(body)["msg"] == "boom"
+        assert recorder.calls[0][1] == 200
+
+    def test_error_without_handler(self):
+        """测试未添加ErrorHandler时异常向上抛出, 仍记录500状态"""
+        recorder = _Recorder()
+        middleware = _middleware(recorder)
+        with pytest.raises(RuntimeError):
+            _call(middleware, path="/api/v1/pay/boom")
+        assert recorder.calls[0][1] == 500
+
+    def test_error_after_response_started(self):
+        """测试响应已开始发送后的异常不再转换"""
+        recorder = _Recorder()
+        middleware = _middleware(ErrorHandler(), recorder)
+        with pytest.raises(RuntimeError):
+            _call(middleware, path="/api/v1/pay/partial")
+        assert recorder.calls[0][1] == 201
+
+    def test_pay_api_server(self):
+        """测试通过PayApiServer.add_middleware添加的中间件作用于支付接口"""
+        pytest.importorskip("fastapi")
+        from fastapi.testclient import TestClient
+        from gopay.api.server import PayApiServer
+
+        api_server = PayApiServer()
+        client = TestClient(api_server.get_app())
+        api_server.add_middleware(AuthMiddleware([API_KEY]))
+
+        response = client.post("/api/v1/pay/create_order", content=b"{}")
+        assert response.json()["code"] == "401"
+        response = client.post("/api/v1/pay/create_order", content=b"{}", headers={"X-API-Key": API_KEY})
+        assert response.json()["code"] != "401"
+        assert client.get("/api/v1/channels").status_code == 200
@@ -0,0 +1,127 @@
+"""
+通知处理测试
+"""
+
+import threading
+
+import pytest
+
+from gopay.notify import AlipayNotifyHandler, AsyncNotifyProcessor, WechatNotifyHandler
+from gopay.exceptions import NotifyError
+from gopay.utils.signer import sign_params
+
+
+API_KEY = "test_api_key"
+
+
+def _notify_xml(out_trade_no: str) -> str:
+    """构造已签名的微信通知XML"""
+    params = {"return_code": "SUCCESS", "out_trade_no": out_trade_no}
+    params["sign"] = sign_params(params, API_KEY, "MD5")
+    body = "".join(f"<{k}>{v}</{k}>" for k, v in params.items())
+    return f"<xml>{body}</xml>"
+
+
+class TestAlipayNotifyHandler:
+    """支付宝通知处理器测试"""
+
+    def test_parse_form(self):
+        """测试解析表单数据: 空值参数不保留, 重复参数取第一个值"""
+        handler = AlipayNotifyHandler(public_key="test_public_key")
+        data = handler.parse("out_trade_no=order_1&subject=%E5%95%86%E5%93%81&memo=&a=1&a=2")
+        assert data == {"out_trade_no": "order_1", "subject": "商品", "a": "1"}
+        assert handler.parse(b"out_trade_no=order_1&memo=") == {"out_trade_no": "order_1"}
+
+    def test_parse_invalid_utf8(self):
+        """测试非法UTF-8数据被拒绝"""
+        handler = AlipayNotifyHandler(public_key="test_public_key")
+        with pytest.raises(NotifyError):
+            handler.parse(b"out_trade_no=order_1&subject=\xff\xfe")
+
+
+class TestWechatNotifyHandler:
+    """微信通知处理器测试"""
+
+    def test_parse_str_and_bytes(self):
+        """测试解析str和bytes格式的XML"""
+        handler = WechatNotifyHandler(api_key=API_KEY, sign_type="MD5")
+        xml = _notify_xml("order_1")
+        data = handler.parse(xml)
+        assert data["out_trade_no"] == "order_1"
+        assert handler.parse(xml.encode("utf-8")) == data
+
+    def test_parse_skips_empty(self):
+        """测试解析时跳过空值节点"""
+        handler = WechatNotifyHandler(api_key=API_KEY, sign_type="MD5")
+        data = handler.parse("<xml><a>1</a><b></b><!-- c --></xml>")
+        assert data == {"a": "1"}
+
+    def test_parse_invalid_xml(self):
+        """测试解析非法XML"""
+        handler = WechatNotifyHandler(api_key=API_KEY, sign_type="MD5")
+        with pytest.raises(NotifyError):
+            handler.parse(b"<xml><a>1</xml>")
+
+
+class TestAsyncNotifyProcessor:
+    """异步通知处理器测试"""
+
+    def _processor(self, **kwargs) -> AsyncNotifyProcessor:
+        handler = WechatNotifyHandler(api_key=API_KEY, sign_type="MD5")
+        return AsyncNotifyProcessor(handler, **kwargs)
+
+    def test_submit(self):
+        """测试提交通知"""
+        received = []
+        with self._processor(callback=received.append, workers=2) as processor:
+            future = processor.submit(_notify_xml("order_1"))
+            assert "SUCCESS" in future.result(timeout=5)
+        assert received[0]["out_trade_no"] == "order_1"
+
+    def test_submit_invalid_sign(self):
+        """测试签名错误的通知"""
+        with self._processor() as processor:
+            xml = _notify_xml("order_1").replace("order_1", "order_2")
+            assert "FAIL" in processor.submit(xml).result(timeout=5)
+
+    def test_submit_after_close(self):
+        """测试关闭后提交"""
+        processor = self._processor()
+        processor.close()
+        with pytest.raises(NotifyError):
+            processor.submit(_notify_xml("order_1"))
+
+    def test_close_drains_queue(self):
+        """测试关闭前已入队的通知全部处理完成"""
+        processor = self._processor(workers=2)
+        futures = [processor.submit(_notify_xml(f"order_{i}")) for i in range(50)]
+        processor.close(wait=True)
+        assert all(future.done() for future in futures)
+        assert all("SUCCESS" in future.result() for future in futures)
+
+    def test_submit_close_race(self):
+        """测试并发提交与关闭: 提交成功的通知都能完成"""
+        processor = self._processor(workers=2)
+        futures = []
+        futures_lock = threading.Lock()
+        start = threading.Event()
+
+        def submitter():
+            start.wait()
+            for i in range(200):
+                try:
+                    future = processor.submit(_notify_xml(f"order_{i}"))
+                except NotifyError:
+                    return
+                with futures_lock:
+                    futures.append(future)
+
+        threads = [threading.Thread(target=submitter) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        start.set()
+        processor.close(wait=True)
+        for thread in threads:
+            thread.join()
+        for future in futures:
+            assert "SUCCESS" in future.result(timeout=5)
@@ -0,0 +1,46 @@
+"""
+PayPal客户端测试
+"""
+
+import string
+
+from gopay.paypal.client import PayPalClient, PayPalConfig
+
+
+def _client(monkeypatch, calls):
+    """构造PayPal客户端, 记录请求而不实际发送"""
+    client = PayPalClient(PayPalConfig(client_id="test_id", client_secret="test_secret", app_id="test_id"))
+    monkeypatch.setattr(
+        client, "_do_request",
+        lambda method, endpoint, data=None, params=None: calls.append((method, endpoint, data))
+    )
+    return client
+
+
+class TestPayPalClient:
+    """PayPal客户端测试"""
+
+    def test_endpoint_placeholders(self):
+        """测试端点模板只使用{id}占位符"""
+        for name, template in PayPalClient._ENDPOINTS.items():
+            fields = {field for _, field, _, _ in string.Formatter().parse(template) if field is not None}
+            assert fields <= {"id"}, name
+
+    def test_refund_payment(self, monkeypatch):
+        """测试退款请求填充交易ID"""
+        calls = []
+        client = _client(monkeypatch, calls)
+        data = {"amount": {"value": "1.00", "currency_code": "USD"}}
+        client.refund_payment("SALE-1", data)
+        client.refund_payment("SALE-2")
+        assert calls == [
+            ("POST", "/v1/payments/sale/SALE-1/refund", data),
+            ("POST", "/v1/payments/sale/SALE-2/refund", None),
+        ]
+
+    def test_request(self, monkeypatch):
+        """测试通用请求方法"""
+        calls = []
+        client = _client(monkeypatch, calls)
+        client.request("POST", "/v2/checkout/orders", {"intent": "CAPTURE"})
+        assert calls == [("POST", "/v2/checkout/orders", {"intent": "CAPTURE"})]
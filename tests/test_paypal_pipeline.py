@@ -0,0 +1,116 @@
+"""
+PayPal请求流水线测试
+"""
+
+import asyncio
+
+import pytest
+
+from gopay.paypal.pipeline import PayPalPipeline
+from gopay.utils.datastructure import ResponseData
+
+
+class _FakeClient:
+    """记录请求的PayPal客户端, 按端点返回预设响应, 默认返回带id的成功响应"""
+
+    def __init__(self, responses=None):
+        self.responses = responses or {}
+        self.calls = []
+        self.events = []
+
+    def _response(self, endpoint):
+        if endpoint in self.responses:
+            return self.responses[endpoint]
+        return ResponseData.success_response({"id": endpoint.strip("/").replace("/", "-")})
+
+    def request(self, method, endpoint, data=None, params=None):
+        self.calls.append((method, endpoint, data, params))
+        return self._response(endpoint)
+
+    async def request_async(self, method, endpoint, data=None, params=None):
+        self.calls.append((method, endpoint, data, params))
+        self.events.append(("start", endpoint))
+        await asyncio.sleep(0)
+        self.events.append(("end", endpoint))
+        return self._response(endpoint)
+
+
+def _checkout_pipeline(client):
+    """订单与客户信息互不依赖, 捕获依赖两者, 通知依赖捕获"""
+    return (
+        PayPalPipeline(client)
+        .add("order", "POST", "/orders", {"intent": "CAPTURE"})
+        .add("customer", "GET", "/customers", params={"page": 1})
+        .add("capture", "POST", "/orders/{order[id]}/capture",
+             data=lambda ctx: {"customer": ctx["customer"]["id"]},
+             depends_on=["order", "customer"])
+        .add("notify", "POST", "/notify/{capture[id]}", depends_on=["capture"])
+    )
+
+
+class TestPayPalPipeline:
+    """PayPal请求流水线测试"""
+
+    def test_execute(self):
+        """测试同步执行按添加顺序请求并填充依赖结果"""
+        client = _FakeClient()
+        results = _checkout_pipeline(client).execute()
+        assert list(results) == ["order", "customer", "capture", "notify"]
+        assert all(response.success for response in results.values())
+        assert client.calls == [
+            ("POST", "/orders", {"intent": "CAPTURE"}, None),
+            ("GET", "/customers", None, {"page": 1}),
+            ("POST", "/orders/orders/capture", {"customer": "customers"}, None),
+            ("POST", "/notify/orders-orders-capture", None, None),
+        ]
+
+    def test_execute_async_waves(self):
+        """测试异步执行时同一层的步骤并发请求, 下一层在上一层全部完成后开始"""
+        client = _FakeClient()
+        results = asyncio.run(_checkout_pipeline(client).execute_async())
+        assert list(results) == ["order", "customer", "capture", "notify"]
+        assert client.events == [
+            ("start", "/orders"),
+            ("start", "/customers"),
+            ("end", "/orders"),
+            ("end", "/customers"),
+            ("start", "/orders/orders/capture"),
+            ("end", "/orders/orders/capture"),
+            ("start", "/notify/orders-orders-capture"),
+            ("end", "/notify/orders-orders-capture"),
+        ]
+        assert results["notify"].success
+
+    @pytest.mark.parametrize("run_async", [False, True])
+    def test_skip_on_failure(self, run_async):
+        """测试依赖的步骤失败时跳过后续步骤, 互不依赖的步骤照常执行"""
+        client = _FakeClient({"/orders": ResponseData.error_response("订单创建失败", code="400")})
+        pipeline = _checkout_pipeline(client)
+        results = asyncio.run(pipeline.execute_async()) if run_async else pipeline.execute()
+
+        assert not results["order"].success
+        assert results["customer"].success
+        assert results["capture"].error == "依赖的步骤失败: order"
+        assert results["notify"].error == "依赖的步骤失败: capture"
+        assert [call[1] for call in client.calls] == ["/orders", "/customers"]
+
+    def test_resolve_error(self):
+        """测试端点模板引用的字段不存在时返回错误且不发出请求"""
+        client = _FakeClient()
+        results = (
+            PayPalPipeline(client)
+            .add("order", "POST", "/orders")
+            .add("capture", "POST", "/orders/{order[missing]}/capture", depends_on=["order"])
+            .execute()
+        )
+        assert not results["capture"].success
+        assert "参数解析失败" in results["capture"].error
+        assert len(client.calls) == 1
+
+    def test_add_invalid(self):
+        """测试重复步骤和未添加的依赖"""
+        pipeline = PayPalPipeline(_FakeClient()).add("order", "POST", "/orders")
+        with pytest.raises(ValueError):
+            pipeline.add("order", "POST", "/orders")
+        with pytest.raises(ValueError):
+            pipeline.add("capture", "POST", "/capture", depends_on=["missing"])
@@ -4,11 +4,13 @@
 
 import pytest
 from gopay.utils.signer import (
+    Signer,
     MD5Signer,
     HMACSHA256Signer,
     RSASigner,
     SignerFactory,
     sign_params,
+    sign_params_many,
     verify_params,
 )
 from gopay.exceptions import SignError
@@ -34,6 +36,8 @@ class TestMD5Signer:
         signature = signer.sign(data, key)
         assert signer.verify(data, signature, key) is True
         assert signer.verify(data, "wrong_sign", key) is False
+        # 长度相同但含非ASCII字符的签名
+        assert signer.verify(data, "签" * 32, key) is False
 
 
 class TestHMACSHA256Signer:
@@ -57,6 +61,13 @@ class TestHMACSHA256Signer:
         assert signer.verify(data, signature, key) is True
         assert signer.verify(data, "wrong_sign", key) is False
 
+    def test_sign_many(self):
+        """测试批量签名"""
+        signer = HMACSHA256Signer()
+        messages = ["key1=value1", "key1=value1&key2=value2", ""]
+        key = "test_key"
+        assert signer.sign_many(messages, key) == [signer.sign(m, key) for m in messages]
+
 
 class TestRSASigner:
     """RSA签名器测试"""
@@ -145,6 +156,29 @@ class TestSignerFactory:
         with pytest.raises(SignError):
             SignerFactory.get_signer("INVALID")
 
+    def test_register_custom_signer(self):
+        """测试注册自定义签名器(含继承内置签名器)"""
+
+        class ReverseSigner(Signer):
+            def sign(self, data, key):
+                return (data + key)[::-1]
+
+            def verify(self, data, signature, key):
+                return self.sign(data, key) == signature
+
+        class LowerMD5Signer(MD5Signer):
+            def sign(self, data, key):
+                return super().sign(data, key).lower()
+
+        try:
+            SignerFactory.register_signer("reverse", ReverseSigner())
+            SignerFactory.register_signer("md5-lower", LowerMD5Signer())
+            assert sign_params({"a": "1"}, "k", "REVERSE") == "k1=a"
+            assert sign_params({"a": "1"}, "k", "MD5-LOWER") == sign_params({"a": "1"}, "k", "MD5").lower()
+        finally:
+            SignerFactory._signers.pop("REVERSE", None)
+            SignerFactory._signers.pop("MD5-LOWER", None)
+
 
 class TestSignParams:
     """参数签名测试"""
@@ -170,6 +204,17 @@ class TestSignParams:
         signature = sign_params(params, key, "HMAC-SHA256")
         assert signature is not None
 
+    def test_sign_params_many(self):
+        """测试批量签名参数"""
+        params_list = [
+            {"key1": "value1", "key2": "value2"},
+            {"key1": "value1", "key2": None, "sign": "old_sign"},
+        ]
+        key = "test_key"
+        for sign_type in ("MD5", "HMAC-SHA256"):
+            expected = [sign_params(params, key, sign_type) for params in params_list]
+            assert sign_params_many(params_list, key, sign_type) == expected
+
     def test_verify_params(self):
         """测试验证参数签名"""
         params = {
@@ -0,0 +1,197 @@
+"""
+微信支付接口装饰器测试
+"""
+
+import asyncio
+import types
+
+import pytest
+
+from gopay.config import WechatConfig
+from gopay.utils.datastructure import ResponseData, XmlMap
+from gopay.wechat import endpoint as endpoint_module
+from gopay.wechat.client import WechatClient, _dict_to_wechat_xml
+from gopay.wechat.endpoint import ApiRequest, ResponseCache, gather_bounded, wechat_api
+
+
+URL = "https://api.mch.weixin.qq.com/test"
+
+
+class _FakeClient:
+    """记录请求的客户端, 按URL返回预设响应, 默认返回带请求次数的成功响应"""
+
+    def __init__(self, responses=None, maxsize=1024):
+        self.responses = responses or {}
+        self.calls = []
+        self._response_cache = ResponseCache(maxsize=maxsize)
+
+    def _response(self, url):
+        if url in self.responses:
+            return self.responses[url]
+        return ResponseData.success_response({"count": len(self.calls)})
+
+    def _do_request(self, url, params):
+        self.calls.append((url, params))
+        return self._response(url)
+
+    async def _do_request_async(self, url, params):
+        self.calls.append((url, params))
+        return self._response(url)
+
+    @wechat_api(required=("stock_id", "openid"))
+    def send(self, params) -> ApiRequest:
+        return URL, dict(params)
+
+    @wechat_api(cache_ttl=5)
+    def query(self, params, url=URL) -> ApiRequest:
+        return url, dict(params)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """替换缓存使用的单调时钟, 通过clock.now控制时间"""
+    fake = types.SimpleNamespace(now=100.0)
+    fake.monotonic = lambda: fake.now
+    monkeypatch.setattr(endpoint_module, "time", fake)
+    return fake
+
+
+class TestWechatApi:
+    """接口方法装饰器测试"""
+
+    def test_required(self):
+        """测试缺少必填参数时返回MISSING_PARAMETER且不发出请求"""
+        client = _FakeClient()
+        response = client.send({"stock_id": "1"})
+        assert not response.success
+        assert response.code == "MISSING_PARAMETER"
+        assert response.error == "缺少必填参数: openid"
+        assert asyncio.run(client.send_async(params={})).code == "MISSING_PARAMETER"
+        assert client.calls == []
+
+        assert client.send({"stock_id": "1", "openid": "o"}).success
+        assert client.calls == [(URL, {"stock_id": "1", "openid": "o"})]
+
+    def test_async_twin(self):
+        """测试生成同名异步接口"""
+        client = _FakeClient()
+        assert _FakeClient.send_async.__name__ == "send_async"
+        assert asyncio.run(client.send_async({"stock_id": "1", "openid": "o"})).success
+        assert len(client.calls) == 1
+
+    def test_cache_hit_and_expiry(self, clock):
+        """测试有效期内命中缓存, 过期后重新请求, 随机串不参与缓存键"""
+        client = _FakeClient()
+        first = client.query({"a": "1", "nonce_str": "x"})
+        assert client.query({"a": "1", "nonce_str": "y"}).data == first.data
+        assert asyncio.run(client.query_async({"a": "1"})).data == first.data
+        assert len(client.calls) == 1
+
+        client.query({"a": "2"})
+        assert len(client.calls) == 2
+
+        clock.now += 5
+        assert client.query({"a": "1"}).data == {"count": 3}
+        assert len(client.calls) == 3
+
+    def test_cached_response_is_copied(self, clock):
+        """测试修改返回响应的data不影响缓存"""
+        client = _FakeClient()
+        first = client.query({"a": "1"})
+        first.data["count"] = -1
+        second = client.query({"a": "1"})
+        assert second.data == {"count": 1}
+        second.data["extra"] = True
+        assert client.query({"a": "1"}).data == {"count": 1}
+        assert len(client.calls) == 1
+
+    def test_error_not_cached(self, clock):
+        """测试失败响应不缓存"""
+        client = _FakeClient({URL: ResponseData.error_response("系统繁忙", code="SYSTEMERROR")})
+        assert not client.query({"a": "1"}).success
+        assert not client.query({"a": "1"}).success
+        assert len(client.calls) == 2
+
+    def test_unhashable_params_bypass_cache(self, clock):
+        """测试参数值不可哈希时不缓存"""
+        client = _FakeClient()
+        client.query({"a": ["1"]})
+        client.query({"a": ["1"]})
+        assert len(client.calls) == 2
+
+    def test_cache_eviction(self, clock):
+        """测试缓存写满时先清理过期条目, 仍满则淘汰最早写入的条目"""
+        client = _FakeClient(maxsize=2)
+        client.query({"a": "1"})
+        client.query({"a": "2"})
+        client.query({"a": "3"})
+        assert len(client._response_cache._entries) == 2
+        # a=1被淘汰, a=3仍在缓存中
+        client.query({"a": "3"})
+        assert len(client.calls) == 3
+        client.query({"a": "1"})
+        assert len(client.calls) == 4
+
+        # 过期条目优先清理
+        clock.now += 5
+        cache = ResponseCache(maxsize=2)
+        cache.set("old", ResponseData.success_response({}), ttl=1)
+        clock.now += 2
+        cache.set("b", ResponseData.success_response({}), ttl=5)
+        cache.set("c", ResponseData.success_response({}), ttl=5)
+        assert set(cache._entries) == {"b", "c"}
+
+    def test_gather_bounded(self):
+        """测试有限并发批量调用, 结果顺序与参数一致"""
+        running = []
+        peak = []
+
+        async def call(i):
+            running.append(i)
+            peak.append(len(running))
+            await asyncio.sleep(0)
+            running.remove(i)
+            return ResponseData.success_response({"i": i})
+
+        results = asyncio.run(gather_bounded(call, [(i,) for i in range(10)], concurrency=3))
+        assert [r.data["i"] for r in results] == list(range(10))
+        assert max(peak) == 3
+
+
+class TestWechatClient:
+    """微信支付客户端测试"""
+
+    def _client(self) -> WechatClient:
+        return WechatClient(WechatConfig(app_id="test_app_id", mch_id="test_mch_id", api_key="test_api_key"))
+
+    def test_mixin_urls(self):
+        """测试各Mixin声明的接口URL在创建客户端时拼接"""
+        client = self._client()
+        assert client._urls["busifavor_stock"].startswith(client.config.gateway_url + "/")
+        assert hasattr(client, "send_coupon_async")
+
+    def test_cached_endpoint(self, monkeypatch):
+        """测试只读接口经客户端缓存"""
+        client = self._client()
+        calls = []
+        monkeypatch.setattr(
+            client, "_do_request",
+            lambda url, params: calls.append(url) or ResponseData.success_response({"stock_id": "1"})
+        )
+        assert client.query_busifavor("1").data == {"stock_id": "1"}
+        assert client.query_busifavor("1").data == {"stock_id": "1"}
+        assert len(calls) == 1
+
+    def test_send_coupon_required(self, monkeypatch):
+        """测试客户端接口的必填字段校验"""
+        client = self._client()
+        monkeypatch.setattr(client, "_do_request", lambda url, params: pytest.fail("不应发出请求"))
+        assert client.send_coupon({"coupon_stock_id": "1"}).code == "MISSING_PARAMETER"
+
+    def test_dict_to_wechat_xml(self):
+        """测试直接拼接的请求XML与XmlMap一致"""
+        params = {"appid": "wx1", "body": "a<b>&c", "empty": "", "none": None, "total_fee": 1}
+        xml_map = XmlMap()
+        for key, value in params.items():
+            xml_map.set(key, value)
+        assert _dict_to_wechat_xml(params) == xml_map.to_xml().encode("utf-8")